@@ -10,13 +10,16 @@ Unified interface for Cloudflare's AI models:
 - Image Generation (Stable Diffusion)
 
 Usage:
-    from cf_ai import CloudflareAI
+    from cf_ai import CloudflareAI, RoutingPolicy
 
     ai = CloudflareAI()  # Uses env vars
 
     # Text generation
     response = ai.chat("Hello, who are you?")
 
+    # With failover to another model
+    response = ai.chat("Hello", routing=RoutingPolicy(fallbacks=["mistral"]))
+
     # Speech to text
     text = ai.transcribe("audio.mp3", language="en")
 
@@ -27,22 +30,135 @@ Usage:
     image_bytes = ai.generate_image("A sunset over mountains")
 """
 
+import io
 import os
+import re
 import json
+import time
 import base64
+import hashlib
+import logging
+import threading
 import requests
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+)
 from pathlib import Path
-from typing import List, Optional, Union, Dict, Any
-from dataclasses import dataclass
+from typing import List, Optional, Union, Dict, Any, Tuple
+from dataclasses import dataclass, field
+
+try:
+    from PIL import Image
+except ImportError:  # Optional: pip install "cf-ai[images]"
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:  # Optional: pip install "cf-ai[cache]"
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Input resolution of LLaVA 1.5's vision encoder
+VISION_INPUT_SIZE = 336
+VISION_JPEG_QUALITY = 85
+
+
+_UNDECODED = object()
+
+# Body flags scanned without decoding: a body that says success true and
+# never success false can be decoded lazily; anything else is checked in full
+_SUCCESS_TRUE = re.compile(rb'"success"\s*:\s*true')
+_SUCCESS_FALSE = re.compile(rb'"success"\s*:\s*false')
 
 
-@dataclass
 class AIResponse:
-    """Standardized response from AI models."""
-    success: bool
-    result: Any
-    usage: Optional[Dict[str, int]] = None
-    errors: Optional[List[str]] = None
+    """
+    Standardized response from AI models.
+
+    JSON responses keep the raw body and decode `result` (and `usage`) on
+    first access, so callers that only check `success` or write the body to
+    disk never pay for parsing. Slotted to keep per-instance memory small.
+    """
+
+    __slots__ = ("success", "errors", "model", "raw", "_result", "_usage")
+
+    def __init__(
+        self,
+        success: bool,
+        result: Any = None,
+        usage: Optional[Dict[str, int]] = None,
+        errors: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        raw: Optional[bytes] = None
+    ):
+        """
+        Args:
+            success: Whether the request succeeded
+            result: Decoded result (omit and pass raw to decode lazily)
+            usage: Token usage (derived from the result when decoding lazily)
+            errors: Error messages
+            model: Full name of the model that answered
+            raw: Raw JSON response body
+        """
+        self.success = success
+        self.errors = errors
+        self.model = model
+        self.raw = raw
+        lazy = raw is not None and result is None
+        self._result = _UNDECODED if lazy else result
+        self._usage = _UNDECODED if lazy and usage is None else usage
+
+    @property
+    def result(self) -> Any:
+        if self._result is _UNDECODED:
+            try:
+                self._result = json.loads(self.raw).get("result")
+            except (ValueError, AttributeError) as e:
+                self._result = None
+                self.errors = (self.errors or []) + [f"Invalid response body: {e}"]
+        return self._result
+
+    @result.setter
+    def result(self, value: Any) -> None:
+        self._result = value
+
+    @property
+    def usage(self) -> Optional[Dict[str, int]]:
+        if self._usage is _UNDECODED:
+            result = self.result
+            self._usage = result.get("usage") if isinstance(result, dict) else None
+        return self._usage
+
+    @usage.setter
+    def usage(self, value: Optional[Dict[str, int]]) -> None:
+        self._usage = value
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the raw body (or binary result) to a file without decoding."""
+        output = Path(path)
+        if self.raw is not None:
+            output.write_bytes(self.raw)
+        elif isinstance(self._result, (bytes, bytearray)):
+            output.write_bytes(self._result)
+        else:
+            output.write_text(json.dumps(self.result))
+        return output
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AIResponse):
+            return NotImplemented
+        return (self.success, self.result, self.usage, self.errors, self.model) == \
+            (other.success, other.result, other.usage, other.errors, other.model)
+
+    def __repr__(self):
+        if self._result is _UNDECODED:
+            result = f"<{len(self.raw)} bytes undecoded>"
+        else:
+            result = repr(self._result)
+        return (f"AIResponse(success={self.success!r}, result={result}, "
+                f"errors={self.errors!r}, model={self.model!r})")
 
     def __str__(self):
         if self.success:
@@ -50,6 +166,339 @@ class AIResponse:
         return f"Error: {self.errors}"
 
 
+@dataclass
+class RoutingPolicy:
+    """
+    How to route a request across model aliases.
+
+    Attributes:
+        fallbacks: Aliases to try, in order, after the requested model
+        hedge_after: Seconds to wait before sending a duplicate request to the
+            next model in the chain, or "p95" to use the primary model's
+            observed p95 latency. None disables hedging.
+        timeout: Per-attempt request timeout in seconds
+        max_error_rate: Models whose recent error rate exceeds this are
+            moved to the end of the chain
+    """
+    fallbacks: List[str] = field(default_factory=list)
+    hedge_after: Optional[Union[float, str]] = None
+    timeout: Optional[float] = 30.0
+    max_error_rate: float = 0.5
+
+
+class LatencyTracker:
+    """Rolling per-model latency and error statistics."""
+
+    def __init__(self, window: int = 100, min_samples: int = 5):
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies: Dict[str, deque] = {}
+        self._outcomes: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float, success: bool) -> None:
+        """Record one request outcome for a model."""
+        with self._lock:
+            if success:
+                self._latencies.setdefault(model, deque(maxlen=self.window)).append(seconds)
+            self._outcomes.setdefault(model, deque(maxlen=self.window)).append(success)
+
+    def percentile(self, model: str, pct: float) -> Optional[float]:
+        """Latency percentile in seconds, or None without enough samples."""
+        with self._lock:
+            samples = sorted(self._latencies.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def error_rate(self, model: str) -> float:
+        """Fraction of recent requests to a model that failed."""
+        with self._lock:
+            outcomes = list(self._outcomes.get(model, ()))
+        if len(outcomes) < self.min_samples:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Summary of p50/p95 latency and error rate per model."""
+        with self._lock:
+            models = list(self._outcomes)
+        return {
+            model: {
+                "p50": self.percentile(model, 50),
+                "p95": self.percentile(model, 95),
+                "error_rate": self.error_rate(model),
+            }
+            for model in models
+        }
+
+
+def preprocess_image(
+    image_bytes: bytes,
+    max_size: int = VISION_INPUT_SIZE,
+    quality: int = VISION_JPEG_QUALITY
+) -> bytes:
+    """
+    Downscale an image to the vision model's input size and re-encode as JPEG.
+
+    Returns the original bytes when Pillow is not installed, the image cannot
+    be decoded, or re-encoding would not make it smaller.
+
+    Args:
+        image_bytes: Encoded image (PNG, JPEG, ...)
+        max_size: Longest side in pixels after downscaling
+        quality: JPEG quality (1-95)
+
+    Returns:
+        Encoded image bytes
+    """
+    if Image is None:
+        return image_bytes
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img.draft("RGB", (max_size, max_size))  # Fast JPEG downscale on decode
+            img = img.convert("RGB")
+            img.thumbnail((max_size, max_size), Image.LANCZOS)
+            out = io.BytesIO()
+            img.save(out, format="JPEG", quality=quality, optimize=True)
+    except Exception:
+        return image_bytes
+
+    processed = out.getvalue()
+    return processed if len(processed) < len(image_bytes) else image_bytes
+
+
+def _load_and_preprocess(
+    image: Union[str, Path, bytes],
+    max_size: int,
+    quality: int
+) -> Tuple[bytes, bool]:
+    """
+    Process pool worker: read an image if needed and preprocess it.
+    Returns (image bytes, whether preprocessing changed them).
+    """
+    if isinstance(image, (str, Path)):
+        image = Path(image).read_bytes()
+    processed = preprocess_image(image, max_size, quality)
+    return processed, processed is not image
+
+
+class ImageCache:
+    """
+    LRU cache of preprocessed images keyed by input identity and settings,
+    bounded by the total size of the cached images.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image: Union[str, Path, bytes], max_size: int, quality: int) -> Tuple:
+        """Cache key: content hash for bytes, path + mtime + size for files."""
+        if isinstance(image, (str, Path)):
+            stat = Path(image).stat()
+            identity = (str(Path(image).resolve()), stat.st_mtime_ns, stat.st_size)
+        else:
+            identity = hashlib.sha256(image).hexdigest()
+        return (identity, max_size, quality)
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+class SemanticCache:
+    """
+    Cache of chat responses looked up by prompt embedding similarity.
+
+    Prompts are embedded with an embedding model and compared (cosine
+    similarity) against earlier prompts in the same namespace, model and
+    system prompt. A match at or above threshold returns the cached response
+    without a generation call. Uses numpy for the index when installed.
+
+    Usage:
+        cache = SemanticCache(threshold=0.92)
+        ai = CloudflareAI(semantic_cache=cache)
+        ai.chat("How do I reset my password?", cache_namespace="support")
+        print(cache.stats())
+    """
+
+    HISTOGRAM_BINS = 20
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        ttl: Optional[float] = None,
+        embed_model: str = "embed"
+    ):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a hit (0-1)
+            max_entries: Entries kept per namespace (least recently used evicted)
+            ttl: Seconds before an entry expires (None = never)
+            embed_model: Model alias used to embed prompts
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embed_model = embed_model
+        self._indexes: Dict[Tuple, "_VectorIndex"] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Tuple, vector: List[float]) -> Optional[AIResponse]:
+        """Return the cached response for the nearest prompt above threshold."""
+        with self._lock:
+            index = self._indexes.get(key)
+            match = index.nearest(vector, self.ttl) if index else None
+            similarity = match[1] if match else None
+            hit = similarity is not None and similarity >= self.threshold
+            self._record(key[0], similarity, hit)
+            if hit:
+                index.touch(match[0])
+                return index.responses[match[0]]
+            return None
+
+    def store(self, key: Tuple, vector: List[float], response: AIResponse) -> None:
+        """Add a response to the index for its namespace."""
+        with self._lock:
+            index = self._indexes.setdefault(key, _VectorIndex())
+            index.add(vector, response)
+            while len(index) > self.max_entries:
+                index.evict_lru()
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop cached entries for one namespace, or all of them."""
+        with self._lock:
+            for key in list(self._indexes):
+                if namespace is None or key[0] == namespace:
+                    del self._indexes[key]
+
+    def stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Hit rate and similarity histograms, per namespace.
+
+        Histograms count the best similarity seen on each lookup, in
+        HISTOGRAM_BINS equal-width bins over [0, 1]; "hit_similarity" only
+        counts lookups that were served from the cache.
+        """
+        with self._lock:
+            entries = {}
+            for key, index in self._indexes.items():
+                entries[key[0]] = entries.get(key[0], 0) + len(index)
+            result = {}
+            for name, stat in self._stats.items():
+                if namespace is not None and name != namespace:
+                    continue
+                lookups = stat["hits"] + stat["misses"]
+                result[name] = {
+                    "hits": stat["hits"],
+                    "misses": stat["misses"],
+                    "hit_rate": stat["hits"] / lookups if lookups else 0.0,
+                    "entries": entries.get(name, 0),
+                    "similarity": list(stat["similarity"]),
+                    "hit_similarity": list(stat["hit_similarity"]),
+                }
+            return result
+
+    def _record(self, namespace: str, similarity: Optional[float], hit: bool) -> None:
+        stat = self._stats.setdefault(namespace, {
+            "hits": 0,
+            "misses": 0,
+            "similarity": [0] * self.HISTOGRAM_BINS,
+            "hit_similarity": [0] * self.HISTOGRAM_BINS,
+        })
+        stat["hits" if hit else "misses"] += 1
+        if similarity is None:
+            return
+        bin_index = min(self.HISTOGRAM_BINS - 1, max(0, int(similarity * self.HISTOGRAM_BINS)))
+        stat["similarity"][bin_index] += 1
+        if hit:
+            stat["hit_similarity"][bin_index] += 1
+
+
+class _VectorIndex:
+    """Normalized prompt vectors and their responses for one cache namespace."""
+
+    def __init__(self):
+        self.vectors: List[List[float]] = []
+        self.responses: List[AIResponse] = []
+        self.created: List[float] = []
+        self.used: List[float] = []
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def add(self, vector: List[float], response: AIResponse) -> None:
+        now = time.monotonic()
+        self.vectors.append(_normalize(vector))
+        self.responses.append(response)
+        self.created.append(now)
+        self.used.append(now)
+        self._matrix = None
+
+    def touch(self, index: int) -> None:
+        self.used[index] = time.monotonic()
+
+    def evict_lru(self) -> None:
+        self._remove(self.used.index(min(self.used)))
+
+    def nearest(self, vector: List[float], ttl: Optional[float]) -> Optional[Tuple[int, float]]:
+        """Index and cosine similarity of the closest live entry."""
+        if ttl is not None:
+            cutoff = time.monotonic() - ttl
+            for i in reversed(range(len(self.created))):
+                if self.created[i] < cutoff:
+                    self._remove(i)
+        if not self.vectors:
+            return None
+
+        query = _normalize(vector)
+        if np is not None:
+            if self._matrix is None:
+                self._matrix = np.asarray(self.vectors, dtype=np.float32)
+            scores = self._matrix @ np.asarray(query, dtype=np.float32)
+            best = int(np.argmax(scores))
+            return best, float(scores[best])
+
+        scores = [sum(a * b for a, b in zip(row, query)) for row in self.vectors]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return best, scores[best]
+
+    def _remove(self, index: int) -> None:
+        for column in (self.vectors, self.responses, self.created, self.used):
+            del column[index]
+        self._matrix = None
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = sum(x * x for x in vector) ** 0.5
+    return [x / norm for x in vector] if norm else list(vector)
+
+
 class CloudflareAI:
     """
     Cloudflare Workers AI Client.
@@ -90,7 +539,9 @@ class CloudflareAI:
         self,
         account_id: Optional[str] = None,
         api_token: Optional[str] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        routing: Optional[RoutingPolicy] = None,
+        semantic_cache: Optional[SemanticCache] = None
     ):
         self.account_id = account_id or os.getenv("CLOUDFLARE_ACCOUNT_ID")
         self.api_token = api_token or os.getenv("CLOUDFLARE_API_TOKEN")
@@ -107,34 +558,153 @@ class CloudflareAI:
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json"
         })
+        self.routing = routing
+        self.latency = LatencyTracker()
+        self.image_cache = ImageCache()
+        self.semantic_cache = semantic_cache
 
     def _resolve_model(self, model: str) -> str:
         """Resolve model alias to full model name."""
         return self.MODELS.get(model, model)
 
-    def _request(self, model: str, payload: Dict[str, Any]) -> AIResponse:
-        """Make request to Cloudflare AI API."""
+    def _request(
+        self,
+        model: str,
+        payload: Dict[str, Any],
+        routing: Optional[RoutingPolicy] = None
+    ) -> AIResponse:
+        """
+        Make request to Cloudflare AI API, routed if a policy is given.
+
+        The client policy is not applied here: its fallbacks are text
+        generation models, so only text generation (chat, complete,
+        Conversation) passes it in, via _text_routing().
+        """
+        if routing is None:
+            return self._send(model, payload)
+        return self._route(model, payload, routing)
+
+    def _text_routing(self, routing: Optional[RoutingPolicy]) -> Optional[RoutingPolicy]:
+        """Routing policy for a text generation call: its own, else the client's."""
+        return routing or self.routing
+
+    def _send(
+        self,
+        model: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> AIResponse:
+        """Send a single request to one model and record its latency."""
         model = self._resolve_model(model)
         url = f"{self.base_url}/{model}"
+        started = time.monotonic()
 
         try:
-            response = self.session.post(url, json=payload)
-            data = response.json()
+            response = self.session.post(url, json=payload, timeout=timeout)
 
-            if data.get("success"):
-                return AIResponse(
-                    success=True,
-                    result=data.get("result"),
-                    usage=data.get("result", {}).get("usage")
-                )
+            body = response.content
+            if response.ok and _SUCCESS_TRUE.search(body) and not _SUCCESS_FALSE.search(body):
+                # Success bodies are decoded lazily on first access to .result
+                result = AIResponse(success=True, raw=body, model=model)
             else:
-                return AIResponse(
-                    success=False,
-                    result=None,
-                    errors=[e.get("message", str(e)) for e in data.get("errors", [])]
-                )
+                # Workers AI can also fail with a 200 and {"success": false}
+                data = response.json()
+                if response.ok and data.get("success", False):
+                    result = AIResponse(success=True, result=data.get("result"), model=model,
+                                        raw=body)
+                else:
+                    result = AIResponse(
+                        success=False,
+                        result=None,
+                        errors=[e.get("message", str(e)) if isinstance(e, dict) else str(e)
+                                for e in data.get("errors", [])],
+                        model=model
+                    )
         except Exception as e:
-            return AIResponse(success=False, result=None, errors=[str(e)])
+            result = AIResponse(success=False, result=None, errors=[str(e)], model=model)
+
+        self.latency.record(model, time.monotonic() - started, result.success)
+        return result
+
+    def _route_chain(self, model: str, policy: RoutingPolicy) -> List[str]:
+        """Build the ordered model chain, demoting models that are erroring."""
+        chain: List[str] = []
+        for alias in [model] + list(policy.fallbacks):
+            name = self._resolve_model(alias)
+            if name not in chain:
+                chain.append(name)
+
+        healthy = [m for m in chain if self.latency.error_rate(m) <= policy.max_error_rate]
+        degraded = [m for m in chain if m not in healthy]
+        return healthy + degraded
+
+    def _hedge_delay(self, model: str, policy: RoutingPolicy) -> Optional[float]:
+        """Seconds to wait on a model before hedging to the next one."""
+        if policy.hedge_after == "p95":
+            return self.latency.percentile(model, 95)
+        if policy.hedge_after is None:
+            return None
+        return float(policy.hedge_after)
+
+    def _route(
+        self,
+        model: str,
+        payload: Dict[str, Any],
+        policy: RoutingPolicy
+    ) -> AIResponse:
+        """
+        Try the model chain in order, failing over on errors.
+
+        With hedging enabled, a duplicate request goes to the next model once
+        the current one exceeds the hedge delay; the first success wins.
+        """
+        chain = self._route_chain(model, policy)
+        errors: List[str] = []
+
+        if policy.hedge_after is None:
+            for name in chain:
+                response = self._send(name, payload, policy.timeout)
+                if response.success:
+                    return response
+                errors.extend(f"{name}: {e}" for e in response.errors or [])
+            return AIResponse(success=False, result=None, errors=errors)
+
+        executor = ThreadPoolExecutor(max_workers=len(chain))
+        pending: Dict[Any, str] = {}
+        next_index = 0
+
+        def launch() -> None:
+            nonlocal next_index
+            name = chain[next_index]
+            next_index += 1
+            pending[executor.submit(self._send, name, payload, policy.timeout)] = name
+
+        try:
+            launch()
+            while pending:
+                delay = None
+                if next_index < len(chain):
+                    delay = self._hedge_delay(chain[next_index - 1], policy)
+                done, _ = wait(list(pending), timeout=delay, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    # Hedge: the in-flight request is slower than the delay
+                    launch()
+                    continue
+
+                for future in done:
+                    name = pending.pop(future)
+                    response = future.result()
+                    if response.success:
+                        return response
+                    errors.extend(f"{name}: {e}" for e in response.errors or [])
+
+                if not pending and next_index < len(chain):
+                    launch()
+        finally:
+            executor.shutdown(wait=False)
+
+        return AIResponse(success=False, result=None, errors=errors)
 
     # =========================================================================
     # TEXT GENERATION
@@ -147,7 +717,9 @@ class CloudflareAI:
         system: Optional[str] = None,
         max_tokens: int = 512,
         temperature: float = 0.7,
-        stream: bool = False
+        stream: bool = False,
+        routing: Optional[RoutingPolicy] = None,
+        cache_namespace: str = "default"
     ) -> AIResponse:
         """
         Generate text using LLM.
@@ -159,10 +731,22 @@ class CloudflareAI:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0-2)
             stream: Whether to stream response
+            routing: Fallback/hedging policy (overrides the client policy)
+            cache_namespace: Semantic cache namespace (when a cache is set)
 
         Returns:
             AIResponse with generated text in result.response
         """
+        cache = self.semantic_cache if not stream else None
+        vector = None
+        if cache is not None:
+            key = (cache_namespace, self._resolve_model(model), system or "")
+            vector = self._embed_vector(prompt, cache.embed_model)
+            if vector is not None:
+                cached = cache.lookup(key, vector)
+                if cached is not None:
+                    return cached
+
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
@@ -175,13 +759,17 @@ class CloudflareAI:
             "stream": stream
         }
 
-        return self._request(model, payload)
+        response = self._request(model, payload, self._text_routing(routing))
+        if vector is not None and response.success:
+            cache.store(key, vector, response)
+        return response
 
     def complete(
         self,
         prompt: str,
         model: str = "llama",
-        max_tokens: int = 512
+        max_tokens: int = 512,
+        routing: Optional[RoutingPolicy] = None
     ) -> AIResponse:
         """
         Simple text completion (non-chat format).
@@ -190,6 +778,7 @@ class CloudflareAI:
             prompt: Text prompt
             model: Model alias or full name
             max_tokens: Maximum tokens to generate
+            routing: Fallback/hedging policy (overrides the client policy)
 
         Returns:
             AIResponse with generated text
@@ -198,7 +787,26 @@ class CloudflareAI:
             "prompt": prompt,
             "max_tokens": max_tokens
         }
-        return self._request(model, payload)
+        return self._request(model, payload, self._text_routing(routing))
+
+    def conversation(
+        self,
+        system: Optional[str] = None,
+        model: str = "llama",
+        **kwargs
+    ) -> "Conversation":
+        """
+        Start a multi-turn conversation that keeps history within a token budget.
+
+        Args:
+            system: Optional system prompt
+            model: Model alias or full name
+            **kwargs: Additional args for Conversation
+
+        Returns:
+            Conversation bound to this client
+        """
+        return Conversation(self, system=system, model=model, **kwargs)
 
     # =========================================================================
     # SPEECH TO TEXT
@@ -355,7 +963,7 @@ class CloudflareAI:
             texts = [texts]
 
         payload = {"text": texts}
-        return self._request(model, payload)
+        return self._request(model, payload, routing=None)  # Not text generation: never routed
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """
@@ -372,6 +980,14 @@ class CloudflareAI:
             return response.result.get("data", [])
         raise Exception(f"Embedding failed: {response.errors}")
 
+    def _embed_vector(self, text: str, model: str) -> Optional[List[float]]:
+        """Embed a single text, returning None on failure."""
+        response = self.embed(text, model=model)
+        if not response.success or not isinstance(response.result, dict):
+            return None
+        data = response.result.get("data") or []
+        return data[0] if data else None
+
     # =========================================================================
     # IMAGE GENERATION
     # =========================================================================
@@ -459,7 +1075,9 @@ class CloudflareAI:
         self,
         image: Union[str, Path, bytes],
         prompt: str = "Describe this image in detail.",
-        model: str = "llava"
+        model: str = "llava",
+        preprocess: bool = True,
+        max_size: int = VISION_INPUT_SIZE
     ) -> AIResponse:
         """
         Describe an image using vision model.
@@ -468,18 +1086,119 @@ class CloudflareAI:
             image: Path to image or raw bytes
             prompt: Question about the image
             model: Vision model to use
+            preprocess: Downscale to the model's input size before upload
+                (requires Pillow; no-op otherwise)
+            max_size: Longest side in pixels when preprocessing
 
         Returns:
             AIResponse with description
         """
-        if isinstance(image, (str, Path)):
-            image_path = Path(image)
-            if not image_path.exists():
-                return AIResponse(success=False, result=None, errors=[f"File not found: {image}"])
-            image_bytes = image_path.read_bytes()
+        if isinstance(image, (str, Path)) and not Path(image).exists():
+            return AIResponse(success=False, result=None, errors=[f"File not found: {image}"])
+
+        if preprocess:
+            image_bytes = self._preprocessed_image(image, max_size)
+        elif isinstance(image, (str, Path)):
+            image_bytes = Path(image).read_bytes()
         else:
             image_bytes = image
 
+        return self._describe_bytes(image_bytes, prompt, model)
+
+    def describe_images(
+        self,
+        images: List[Union[str, Path, bytes]],
+        prompt: str = "Describe this image in detail.",
+        model: str = "llava",
+        preprocess: bool = True,
+        max_size: int = VISION_INPUT_SIZE,
+        max_workers: int = 4
+    ) -> List[AIResponse]:
+        """
+        Describe many images, preprocessing in a process pool while earlier
+        images are already uploading.
+
+        Args:
+            images: Paths to images or raw bytes
+            prompt: Question asked of every image
+            model: Vision model to use
+            preprocess: Downscale before upload (requires Pillow)
+            max_size: Longest side in pixels when preprocessing
+            max_workers: Parallel preprocessing processes and upload threads
+
+        Returns:
+            AIResponse per image, in input order
+        """
+        quality = VISION_JPEG_QUALITY
+        results: List[Optional[AIResponse]] = [None] * len(images)
+        uploads: Dict[Any, int] = {}
+        prepared: Dict[Any, Tuple[int, Tuple]] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as io_pool:
+            def upload(index: int, image_bytes: bytes) -> None:
+                future = io_pool.submit(self._describe_bytes, image_bytes, prompt, model)
+                uploads[future] = index
+
+            pool = None
+            try:
+                for index, image in enumerate(images):
+                    if isinstance(image, (str, Path)) and not Path(image).exists():
+                        results[index] = AIResponse(
+                            success=False, result=None, errors=[f"File not found: {image}"]
+                        )
+                        continue
+
+                    if not preprocess or Image is None:
+                        raw = Path(image).read_bytes() if isinstance(image, (str, Path)) else image
+                        upload(index, raw)
+                        continue
+
+                    key = self.image_cache.key(image, max_size, quality)
+                    cached = self.image_cache.get(key)
+                    if cached is not None:
+                        upload(index, cached)
+                        continue
+
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=max_workers)
+                    future = pool.submit(_load_and_preprocess, image, max_size, quality)
+                    prepared[future] = (index, key)
+
+                # Upload each image as soon as its preprocessing finishes
+                for future in as_completed(prepared):
+                    index, key = prepared[future]
+                    try:
+                        image_bytes, changed = future.result()
+                    except Exception as e:
+                        results[index] = AIResponse(success=False, result=None, errors=[str(e)])
+                        continue
+                    if changed:  # Unchanged originals are not worth holding
+                        self.image_cache.put(key, image_bytes)
+                    upload(index, image_bytes)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+
+            for future in as_completed(uploads):
+                results[uploads[future]] = future.result()
+
+        return results
+
+    def _preprocessed_image(self, image: Union[str, Path, bytes], max_size: int) -> bytes:
+        """Preprocess an image, reusing a cached result for repeated inputs."""
+        quality = VISION_JPEG_QUALITY
+        key = self.image_cache.key(image, max_size, quality)
+        cached = self.image_cache.get(key)
+        if cached is not None:
+            return cached
+
+        image_bytes, changed = _load_and_preprocess(image, max_size, quality)
+        if changed:  # Not without Pillow, or when re-encoding did not help
+            self.image_cache.put(key, image_bytes)
+        return image_bytes
+
+    def _describe_bytes(self, image_bytes: bytes, prompt: str, model: str) -> AIResponse:
+        """Send encoded image bytes to the vision model."""
         image_b64 = base64.b64encode(image_bytes).decode("utf-8")
 
         payload = {
@@ -487,7 +1206,7 @@ class CloudflareAI:
             "image": image_b64
         }
 
-        return self._request(model, payload)
+        return self._request(model, payload, routing=None)  # Not text generation: never routed
 
     # =========================================================================
     # UTILITIES
@@ -497,12 +1216,218 @@ class CloudflareAI:
         """Return available model aliases."""
         return self.MODELS.copy()
 
+    def latency_stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Return observed latency and error rate per model."""
+        return self.latency.stats()
+
     def test_connection(self) -> bool:
         """Test API connection."""
         response = self.complete("Hi", max_tokens=5)
         return response.success
 
 
+# =============================================================================
+# CONVERSATIONS
+# =============================================================================
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+class Conversation:
+    """
+    Multi-turn chat history kept inside a token budget.
+
+    Each turn sends the system prompt, a running summary of evicted turns
+    (when summarization is enabled) and as many recent messages as fit in
+    max_context_tokens. Older messages are dropped from memory, so payload
+    size stays flat however long the session runs.
+
+    Usage:
+        convo = ai.conversation(system="You are a support agent.")
+        convo.send("My build is failing")
+        convo.send("It says module not found")
+    """
+
+    # Per-message overhead of chat templates (role markers, separators)
+    MESSAGE_OVERHEAD = 4
+
+    SUMMARY_PROMPT = (
+        "Summarize the conversation so far in a few sentences. Keep facts, "
+        "names, decisions and open questions. Reply with the summary only."
+    )
+
+    # Summary requests per turn; each can push more turns out of the budget
+    SUMMARY_ROUNDS = 3
+
+    def __init__(
+        self,
+        ai: "CloudflareAI",
+        system: Optional[str] = None,
+        model: str = "llama",
+        max_context_tokens: int = 3000,
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        summarize: bool = False,
+        summary_tokens: int = 256,
+        routing: Optional[RoutingPolicy] = None
+    ):
+        """
+        Args:
+            ai: Client used to send requests
+            system: Optional system prompt (always sent)
+            model: Model alias or full name
+            max_context_tokens: Budget for the prompt messages sent each turn
+            max_tokens: Maximum tokens to generate per reply
+            temperature: Sampling temperature (0-2)
+            summarize: Fold evicted turns into a running summary instead of
+                dropping them (costs one extra request when turns are evicted)
+            summary_tokens: Maximum tokens for the running summary
+            routing: Fallback/hedging policy for every turn
+        """
+        self.ai = ai
+        self.system = system
+        self.model = model
+        self.max_context_tokens = max_context_tokens
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.summarize = summarize
+        self.summary_tokens = summary_tokens
+        self.routing = routing
+        self.summary: Optional[str] = None
+        # (role, content, estimated tokens)
+        self._turns: deque = deque()
+        self._turn_tokens = 0
+
+    @property
+    def token_count(self) -> int:
+        """Approximate tokens of the messages sent on the next turn."""
+        return self._fixed_tokens() + self._turn_tokens
+
+    def add(self, role: str, content: str) -> None:
+        """Append a message to the history without sending it."""
+        tokens = estimate_tokens(content) + self.MESSAGE_OVERHEAD
+        self._turns.append((role, content, tokens))
+        self._turn_tokens += tokens
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Messages payload for the next request."""
+        messages = []
+        system = self._system_content()
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.extend({"role": role, "content": content} for role, content, _ in self._turns)
+        return messages
+
+    def send(self, prompt: str, **kwargs) -> AIResponse:
+        """
+        Send a user message and record the reply.
+
+        Args:
+            prompt: User message
+            **kwargs: Per-turn overrides (max_tokens, temperature)
+
+        Returns:
+            AIResponse with generated text in result.response
+        """
+        self.add("user", prompt)
+        self._fit()
+
+        payload = {
+            "messages": self.messages(),
+            "max_tokens": kwargs.get("max_tokens", self.max_tokens),
+            "temperature": kwargs.get("temperature", self.temperature),
+        }
+        response = self.ai._request(self.model, payload, self.ai._text_routing(self.routing))
+
+        if response.success and isinstance(response.result, dict):
+            self.add("assistant", response.result.get("response", ""))
+        else:
+            # Keep history consistent: drop the unanswered user message
+            _, _, tokens = self._turns.pop()
+            self._turn_tokens -= tokens
+
+        return response
+
+    def reset(self) -> None:
+        """Clear history and summary, keeping the system prompt."""
+        self._turns.clear()
+        self._turn_tokens = 0
+        self.summary = None
+
+    def _system_content(self) -> Optional[str]:
+        if self.summary:
+            prefix = f"{self.system}\n\n" if self.system else ""
+            return f"{prefix}Summary of earlier conversation: {self.summary}"
+        return self.system
+
+    def _fixed_tokens(self) -> int:
+        system = self._system_content()
+        return estimate_tokens(system) + self.MESSAGE_OVERHEAD if system else 0
+
+    def _fit(self) -> None:
+        """Evict the oldest turns until the history fits the budget."""
+        evicted = self._trim()
+        if evicted and self.summarize:
+            self._update_summary(evicted)
+
+    def _trim(self) -> List[Tuple[str, str, int]]:
+        """Evict the oldest turns while over budget; returns them."""
+        evicted: List[Tuple[str, str, int]] = []
+        while len(self._turns) > 1 and self.token_count > self.max_context_tokens:
+            evicted.append(self._evict())
+            # Don't start the window on an assistant reply
+            if len(self._turns) > 1 and self._turns[0][0] == "assistant":
+                evicted.append(self._evict())
+        return evicted
+
+    def _evict(self) -> Tuple[str, str, int]:
+        turn = self._turns.popleft()
+        self._turn_tokens -= turn[2]
+        return turn
+
+    def _update_summary(self, evicted: List[Tuple[str, str, int]]) -> None:
+        """
+        Fold evicted turns into the running summary.
+
+        A longer summary raises the fixed cost and can push more turns out;
+        those are folded in by another request, up to SUMMARY_ROUNDS in all.
+        Turns that still could not be summarized are logged as dropped.
+        """
+        for _ in range(self.SUMMARY_ROUNDS):
+            if not self._summarize(evicted):
+                break
+            evicted = self._trim()
+            if not evicted:
+                return
+
+        logger.warning(
+            "Conversation dropped %d turn(s) (~%d tokens) without summarizing them",
+            len(evicted), sum(tokens for _, _, tokens in evicted),
+        )
+
+    def _summarize(self, turns: List[Tuple[str, str, int]]) -> bool:
+        """Replace the summary with one that also covers turns; False on failure."""
+        transcript = "\n".join(f"{role}: {content}" for role, content, _ in turns)
+        if self.summary:
+            transcript = f"Earlier summary: {self.summary}\n\n{transcript}"
+
+        response = self.ai._request(self.model, {
+            "messages": [
+                {"role": "system", "content": self.SUMMARY_PROMPT},
+                {"role": "user", "content": transcript},
+            ],
+            "max_tokens": self.summary_tokens,
+            "temperature": 0.2,
+        }, self.ai._text_routing(self.routing))
+
+        if not (response.success and isinstance(response.result, dict) and response.result.get("response")):
+            return False
+        self.summary = response.result["response"]
+        return True
+
+
 # =============================================================================
 # CLI INTERFACE
 # =============================================================================
@@ -510,6 +1435,18 @@ class CloudflareAI:
 def main():
     """Command-line interface."""
     import argparse
+    import math
+
+    def hedge_after(value: str) -> Union[float, str]:
+        if value == "p95":
+            return value
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = math.nan
+        if not math.isfinite(seconds) or seconds < 0:
+            raise argparse.ArgumentTypeError(f"expected seconds or 'p95', got {value!r}")
+        return seconds
 
     parser = argparse.ArgumentParser(
         description="Cloudflare Workers AI CLI",
@@ -517,6 +1454,7 @@ def main():
         epilog="""
 Examples:
   cf-ai chat "What is Python?"
+  cf-ai chat "What is Python?" --model llama-3.2 --fallback mistral
   cf-ai transcribe audio.mp3 --language es
   cf-ai speak "Hello world" --output hello.mp3
   cf-ai embed "Hello world"
@@ -531,6 +1469,9 @@ Examples:
     chat_p.add_argument("prompt", help="User message")
     chat_p.add_argument("--model", default="llama", help="Model to use")
     chat_p.add_argument("--system", help="System prompt")
+    chat_p.add_argument("--fallback", nargs="+", default=[], help="Models to fail over to")
+    chat_p.add_argument("--hedge-after", type=hedge_after,
+                        help="Seconds (or 'p95') before hedging to the next model; needs --fallback")
 
     # Transcribe
     trans_p = subparsers.add_parser("transcribe", help="Speech to text")
@@ -565,11 +1506,16 @@ Examples:
     if not args.command:
         parser.print_help()
         return
+    if args.command == "chat" and args.hedge_after is not None and not args.fallback:
+        chat_p.error("--hedge-after needs --fallback (there is no other model to hedge to)")
 
     ai = CloudflareAI()
 
     if args.command == "chat":
-        response = ai.chat(args.prompt, model=args.model, system=args.system)
+        routing = None
+        if args.fallback:
+            routing = RoutingPolicy(fallbacks=args.fallback, hedge_after=args.hedge_after)
+        response = ai.chat(args.prompt, model=args.model, system=args.system, routing=routing)
         if response.success:
             print(response.result.get("response", response.result))
         else:
@@ -5,6 +5,10 @@ setup(
     version="1.0.0",
     py_modules=["cf_ai"],
     install_requires=["requests>=2.28.0"],
+    extras_require={
+        "images": ["Pillow>=9.0"],
+        "cache": ["numpy>=1.21"],
+    },
     entry_points={
         "console_scripts": [
             "cf-ai=cf_ai:main",
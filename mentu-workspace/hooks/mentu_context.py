@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Session Context - Token-budgeted, cached SessionStart context.
+
+SessionStart hooks listed every claimed and in-review commitment in full,
+so the injected context grew without limit, and it was rendered from
+scratch at every startup, resume and compaction. This module:
+
+- ranks commitments: the session's active one first, then the most
+  recently updated (commit, lifecycle change or annotation),
+- truncates bodies to MENTU_CONTEXT_BODY_CHARS characters,
+- keeps commitments while the context fits MENTU_CONTEXT_TOKENS
+  (estimated at 4 characters per token) and counts the rest in one line,
+- caches the rendered context in `.mentu/context.cache.json`, keyed on the
+  ledger's last byte offset, the actor and the other render inputs, so a
+  session that resumes with no new ledger writes skips the ledger.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from mentu_ledger import find_workspace, ledger_path
+
+TOKEN_BUDGET = int(os.environ.get("MENTU_CONTEXT_TOKENS", "1500"))
+BODY_CHARS = int(os.environ.get("MENTU_CONTEXT_BODY_CHARS", "280"))
+CHARS_PER_TOKEN = 4
+
+CACHE_FILE = "context.cache.json"
+
+
+# ─── Budget ──────────────────────────────────────────────────────────────────
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate(body, limit: int = BODY_CHARS) -> str:
+    """Body on one line, cut to limit characters."""
+    text = " ".join(str(body or "").split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rstrip() + "…"
+
+
+def rank(commitments: list, first: str | None = None) -> list:
+    """Commitments by relevance: first (the active one), then most recently updated."""
+    by_recency = sorted(commitments, key=lambda c: c.get("updated") or c.get("ts") or "",
+                        reverse=True)
+    return sorted(by_recency, key=lambda c: c.get("id") != first)
+
+
+def fit(blocks: list, budget: int) -> int:
+    """
+    How many leading blocks (lists of lines) fit in budget tokens.
+
+    The first block is always kept, so the most relevant commitment shows
+    even when the budget is smaller than one entry.
+    """
+    used = 0
+    for count, block in enumerate(blocks):
+        used += estimate_tokens("\n".join(block)) + 1
+        if used > budget and count:
+            return count
+    return len(blocks)
+
+
+def more_line(hidden: int) -> str:
+    return (f"*{hidden} more commitment{'s' if hidden != 1 else ''} not shown "
+            "— run `mentu list commitments` for all.*")
+
+
+# ─── Cache ───────────────────────────────────────────────────────────────────
+
+def cache_key(actor: str, *inputs, workspace: Path | None = None) -> list | None:
+    """
+    Key for a rendered context: ledger offset, actor, the caller's other
+    render inputs and the budget settings. None without a ledger.
+    """
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        return None
+    try:
+        offset = os.path.getsize(ledger_path(workspace))
+    except OSError:
+        return None
+    return [offset, actor, *inputs, TOKEN_BUDGET, BODY_CHARS]
+
+
+def _cache_path(workspace: Path | None) -> Path | None:
+    workspace = workspace or find_workspace()
+    return None if workspace is None else workspace / ".mentu" / CACHE_FILE
+
+
+def cached(key: list | None, workspace: Path | None = None) -> str | None:
+    """The context rendered for key, if it is the one cached."""
+    path = _cache_path(workspace)
+    if key is None or path is None:
+        return None
+    try:
+        entry = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if isinstance(entry, dict) and entry.get("key") == key:
+        return entry.get("context")
+    return None
+
+
+def store(key: list | None, context: str, workspace: Path | None = None) -> None:
+    """Cache the context rendered for key (atomically; last writer wins)."""
+    path = _cache_path(workspace)
+    if key is None or path is None:
+        return
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({"key": key, "context": context}))
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
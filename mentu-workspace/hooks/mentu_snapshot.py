@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Session Snapshot - Everything SessionStart needs from the ledger.
+
+SessionStart used to ask the CLI several questions in turn (claimed
+commitments, in-review commitments, lifecycle counts), cold-starting Node
+for each one, and Node replays the whole ledger every time. `query()`
+answers all of them at once:
+
+    {"claimed": [...], "in_review": [...], "counts": {"open": 2, ...},
+     "complete": True}
+
+Commitment state is folded from `.mentu/ledger.jsonl` in Python, the same
+way src/core/state.ts does, and materialized in `.mentu/snapshot.json`
+together with the byte offset it covers. Each query replays only the
+operations appended since, so it stays cheap however long the ledger gets.
+The CLI (`mentu list commitments --json`) is the fallback.
+
+`run_with_deadline()` runs independent startup steps concurrently and
+stops waiting at one overall deadline, so a slow ledger degrades the
+injected context instead of stalling the session. Steps that write state
+(commitment setup) are marked required and always run to completion; only
+read-only steps are abandoned. Each step is timed as a phase of the hook
+run (see mentu_metrics).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as StepTimeout
+from pathlib import Path
+from typing import Optional
+
+import mentu_metrics
+from mentu_ledger import find_workspace, ledger_path
+
+SESSION_DEADLINE = float(os.environ.get("MENTU_SESSION_DEADLINE", "5"))
+
+LIFECYCLE_STATES = ("open", "claimed", "in_review", "reopened", "closed")
+
+SNAPSHOT_FILE = "snapshot.json"
+SNAPSHOT_VERSION = 2
+
+# Bytes before the snapshot offset that must still match for the snapshot to
+# apply (detects a ledger that was replaced or rewritten)
+CHECK_BYTES = 256
+
+
+def empty() -> dict:
+    """Snapshot returned when the ledger could not be read (in time)."""
+    return {"claimed": [], "in_review": [], "counts": {}, "complete": False}
+
+
+def summarize(commitments: list, actor: str) -> dict:
+    """Claimed (by actor), in-review and per-state counts from one commitment list."""
+    counts: dict = {}
+    claimed = []
+    in_review = []
+    for cmt in commitments:
+        state = cmt.get("state")
+        counts[state] = counts.get(state, 0) + 1
+        if state == "claimed" and cmt.get("owner") == actor:
+            claimed.append(cmt)
+        elif state == "in_review":
+            in_review.append(cmt)
+    return {"claimed": claimed, "in_review": in_review, "counts": counts, "complete": True}
+
+
+# ─── Materialized state ──────────────────────────────────────────────────────
+
+def snapshot_path(workspace: Path) -> Path:
+    return workspace / ".mentu" / SNAPSHOT_FILE
+
+
+def apply(commitments: dict, op: dict) -> None:
+    """Fold one ledger operation into commitment state (mirrors src/core/state.ts)."""
+    kind = op.get("op")
+    payload = op.get("payload") or {}
+
+    if kind == "commit":
+        cmt = commitments.setdefault(op.get("id"), {"state": "open", "owner": None})
+        cmt.update({
+            "id": op.get("id"),
+            "body": payload.get("body"),
+            "source": payload.get("source"),
+            "actor": op.get("actor"),
+            "ts": op.get("ts"),
+            "tags": payload.get("tags"),
+            "updated": op.get("ts"),
+        })
+        return
+
+    if kind == "annotate":
+        # Annotations (evidence, notes) count as activity on a commitment
+        if payload.get("target") in commitments:
+            commitments[payload["target"]]["updated"] = op.get("ts")
+        return
+
+    target = payload.get("commitment")
+    if kind not in ("claim", "release", "submit", "approve", "reopen", "close") or not target:
+        return
+    cmt = commitments.setdefault(target, {"state": "open", "owner": None})
+    cmt["updated"] = op.get("ts")
+
+    if kind == "claim":
+        cmt["state"] = "claimed"
+        cmt["owner"] = op.get("actor")
+    elif kind == "release":
+        cmt["state"] = "open"
+        cmt["owner"] = None
+    elif kind == "submit":
+        cmt["state"] = "in_review"
+        cmt["evidence"] = (payload.get("evidence") or [None])[0]
+    elif kind == "approve":
+        cmt["state"] = "closed"
+        cmt["closed_by"] = op.get("actor")
+        cmt["owner"] = None
+    elif kind == "reopen":
+        cmt["state"] = "reopened"
+    elif kind == "close":
+        # Duplicates list as closed, as in `mentu list`
+        cmt["state"] = "closed"
+        if payload.get("duplicate_of"):
+            cmt["duplicate_of"] = payload["duplicate_of"]
+        else:
+            cmt["evidence"] = payload.get("evidence")
+        cmt["owner"] = None
+        cmt["closed_by"] = op.get("actor")
+
+
+def _check(f, offset: int) -> str:
+    """Digest of the bytes just before offset."""
+    start = max(offset - CHECK_BYTES, 0)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def load_snapshot(workspace: Path) -> dict:
+    try:
+        state = json.loads(snapshot_path(workspace).read_text())
+        if state.get("version") == SNAPSHOT_VERSION:
+            return state
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"version": SNAPSHOT_VERSION, "offset": 0, "check": "", "commitments": {}}
+
+
+def save_snapshot(workspace: Path, state: dict) -> None:
+    """Write the snapshot atomically (concurrent hooks may race; last one wins)."""
+    path = snapshot_path(workspace)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(state, separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def materialize(workspace: Optional[Path] = None, save: bool = True) -> Optional[dict]:
+    """
+    Commitment state for the workspace, replaying only new ledger operations.
+
+    Returns the snapshot ({"offset", "commitments": {id: {...}}, ...}), or
+    None if there is no workspace or ledger. The snapshot is rebuilt from
+    the start if the ledger no longer matches it.
+    """
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        return None
+    state = load_snapshot(workspace)
+
+    try:
+        with open(ledger_path(workspace), "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            offset = state["offset"]
+            if offset > size or (offset and _check(f, offset) != state["check"]):
+                state = {"version": SNAPSHOT_VERSION, "offset": 0, "check": "", "commitments": {}}
+                offset = 0
+            if offset == size:
+                return state
+            f.seek(offset)
+            data = f.read(size - offset)
+            end = data.rfind(b"\n") + 1  # Leave a line still being written
+            for line in data[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    apply(state["commitments"], json.loads(line))
+                except (ValueError, AttributeError):
+                    continue
+            if end:
+                state["offset"] = offset + end
+                state["check"] = _check(f, state["offset"])
+    except OSError:
+        return None
+
+    if save and end:
+        save_snapshot(workspace, state)
+    return state
+
+
+def list_commitments(state: dict) -> list:
+    """Committed commitments from a snapshot, in ledger order."""
+    return [c for c in state["commitments"].values() if "ts" in c]
+
+
+# ─── Session query ───────────────────────────────────────────────────────────
+
+def query(actor: str, timeout: float = SESSION_DEADLINE) -> dict:
+    """Snapshot of the workspace commitments (ledger fold, else one CLI call)."""
+    state = materialize()
+    if state is not None:
+        return summarize(list_commitments(state), actor)
+
+    try:
+        result = subprocess.run(
+            ["mentu", "list", "commitments", "--json"],
+            capture_output=True, text=True, timeout=max(timeout, 0.1)
+        )
+        if result.returncode != 0:
+            return empty()
+        commitments = json.loads(result.stdout)
+    except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError):
+        return empty()
+    if not isinstance(commitments, list):
+        return empty()
+    return summarize(commitments, actor)
+
+
+def remaining(deadline: float) -> float:
+    """Seconds left before a time.monotonic() deadline (never negative)."""
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def run_with_deadline(steps: dict, deadline: float, defaults: Optional[dict] = None,
+                      required: tuple = ()) -> tuple:
+    """
+    Run independent steps concurrently until a monotonic deadline.
+
+    Args:
+        steps: Name -> zero-argument callable
+        deadline: time.monotonic() value to stop waiting at
+        defaults: Name -> value used for steps that fail or miss the deadline
+        required: Names of steps waited for however long they take (steps
+            that write state, which finish() must not cut off halfway)
+
+    Returns:
+        (results, late) where late lists the steps that missed the deadline.
+        Late steps keep running in the background; call finish() before
+        exiting so the interpreter does not wait for them.
+    """
+    defaults = defaults or {}
+    pool = ThreadPoolExecutor(max_workers=len(steps) or 1)
+    futures = {name: pool.submit(_timed, name, step) for name, step in steps.items()}
+    pool.shutdown(wait=False)
+
+    results = {}
+    late = []
+    for name, future in futures.items():
+        try:
+            timeout = None if name in required else remaining(deadline)
+            results[name] = future.result(timeout=timeout)
+        except StepTimeout:
+            late.append(name)
+            results[name] = defaults.get(name)
+        except Exception:
+            results[name] = defaults.get(name)
+    return results, late
+
+
+def _timed(name: str, step):
+    with mentu_metrics.phase(name):
+        return step()
+
+
+def finish(late: list, code: int = 0) -> None:
+    """Exit now, without joining steps that are still running."""
+    if not late:
+        sys.exit(code)
+    mentu_metrics.flush()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
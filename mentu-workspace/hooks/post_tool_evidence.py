@@ -14,14 +14,34 @@ INPUT: {"tool_name": "...", "tool_input": {...}, "tool_output": "..."}
 OUTPUT: {} (non-blocking)
 
 Evidence is captured silently. Errors are logged but don't block.
+Repeated edits to the same file are coalesced into one record (see
+mentu_coalesce); at SessionEnd the hook emits what is still pending.
+File evidence ends in the file's line delta and hashes before and after
+(see mentu_fingerprint).
 """
+from __future__ import annotations
 
 import json
 import os
-import subprocess
 import sys
-from datetime import datetime
-from typing import Optional
+import time
+
+try:
+    import mentu_hookd
+    import mentu_ledger
+except ImportError:  # Hook installed without the shared modules
+    mentu_hookd = mentu_ledger = None
+
+try:
+    import mentu_coalesce
+    import mentu_fingerprint
+except ImportError:  # Hook installed without the shared modules
+    mentu_coalesce = mentu_fingerprint = None
+
+try:
+    from mentu_metrics import phase, run
+except ImportError:  # Hook installed without the shared modules
+    from contextlib import nullcontext as phase, nullcontext as run
 
 
 # Tools that generate evidence
@@ -64,20 +84,29 @@ def should_capture(tool_name: str, tool_input: dict) -> bool:
     return True
 
 
+def file_change(file_path: str) -> str:
+    """' [+12 lines, 1a2b3c4→9f86d0e]' for the file's change since its last evidence."""
+    if mentu_fingerprint is None:
+        return ""
+    with phase("fingerprint"):
+        fields = mentu_fingerprint.change(file_path)
+    return f" [{mentu_fingerprint.describe(fields)}]" if fields else ""
+
+
 def format_evidence_body(tool_name: str, tool_input: dict) -> str:
     """Format evidence body for this tool operation."""
-    timestamp = datetime.utcnow().strftime("%H:%M:%S")
+    timestamp = time.strftime("%H:%M:%S", time.gmtime())
 
     if tool_name == "Edit":
         file_path = tool_input.get("file_path", "unknown")
         # Get just the filename
         filename = file_path.split("/")[-1] if "/" in file_path else file_path
-        return f"[{timestamp}] Edited: {filename}"
+        return f"[{timestamp}] Edited: {filename}{file_change(file_path)}"
 
     elif tool_name == "Write":
         file_path = tool_input.get("file_path", "unknown")
         filename = file_path.split("/")[-1] if "/" in file_path else file_path
-        return f"[{timestamp}] Created: {filename}"
+        return f"[{timestamp}] Created: {filename}{file_change(file_path)}"
 
     elif tool_name == "Bash":
         command = tool_input.get("command", "")
@@ -89,17 +118,30 @@ def format_evidence_body(tool_name: str, tool_input: dict) -> str:
     return f"[{timestamp}] Tool: {tool_name}"
 
 
-def capture_evidence(body: str) -> Optional[str]:
+def capture_evidence(body: str) -> str | None:
     """Capture evidence memory, return ID or None on failure."""
     actor = os.environ.get("MENTU_ACTOR", "agent:claude-code")
 
+    # Fast path: append to the ledger without starting Node, through the
+    # hook daemon if it is running, else directly
+    if mentu_hookd is not None:
+        with phase("ledger"):
+            mem_id = mentu_hookd.capture(body, "tool-evidence", actor)
+            if mem_id is None:
+                mem_id = mentu_ledger.capture(body, "tool-evidence", actor)
+        if mem_id:
+            return mem_id
+
+    import subprocess
+
     try:
-        result = subprocess.run(
-            ["mentu", "capture", body, "--kind", "tool-evidence", "--actor", actor, "--json"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        with phase("cli"):
+            result = subprocess.run(
+                ["mentu", "capture", body, "--kind", "tool-evidence", "--actor", actor, "--json"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
 
         if result.returncode == 0:
             data = json.loads(result.stdout)
@@ -110,18 +152,51 @@ def capture_evidence(body: str) -> Optional[str]:
     return None
 
 
+def emit(group: dict) -> None:
+    """Capture one file edit, or a coalesced group of edits to one file."""
+    file_path = group["file"]
+    filename = file_path.split("/")[-1] if "/" in file_path else file_path
+    verb = "Created" if group["type"] == "file_created" else "Edited"
+    suffix = mentu_coalesce.summary(group) if mentu_coalesce is not None else ""
+    timestamp = time.strftime("%H:%M:%S", time.gmtime(group["first"]))
+
+    body = f"[{timestamp}] {verb}: {filename}{suffix}{file_change(file_path)}"
+    evidence_id = capture_evidence(body)
+    if evidence_id:
+        sys.stderr.write(f"[Evidence] {evidence_id}: {body}\n")
+
+
 def main():
     """Main entry point."""
     try:
-        input_data = json.load(sys.stdin)
+        with phase("stdin"):
+            input_data = json.load(sys.stdin)
     except json.JSONDecodeError:
         input_data = {}
 
+    # Session end: emit edits still waiting for their window to close
+    if input_data.get("hook_event_name") == "SessionEnd":
+        if mentu_coalesce is not None:
+            for group in mentu_coalesce.take(everything=True, session=input_data.get("session_id")):
+                emit(group)
+        print(json.dumps({}))
+        sys.exit(0)
+
     tool_name = input_data.get("tool_name", "")
     tool_input = input_data.get("tool_input", {})
 
     # Check if we should capture this operation
-    if should_capture(tool_name, tool_input):
+    coalesce = tool_name in ("Edit", "Write") and mentu_coalesce is not None and mentu_coalesce.enabled()
+    if should_capture(tool_name, tool_input) and coalesce:
+        # Record the edit; capture only groups whose window has closed
+        file_path = tool_input.get("file_path", "unknown")
+        evidence_type = "file_created" if tool_name == "Write" else "file_modified"
+        with phase("coalesce"):
+            groups = mentu_coalesce.record(file_path, evidence_type, session=input_data.get("session_id"))
+        for group in groups:
+            emit(group)
+        mentu_coalesce.ensure_flusher(__file__)
+    elif should_capture(tool_name, tool_input):
         body = format_evidence_body(tool_name, tool_input)
         evidence_id = capture_evidence(body)
 
@@ -135,8 +210,12 @@ def main():
 
 
 if __name__ == "__main__":
+    if mentu_coalesce is not None and mentu_coalesce.FLUSH_ARG in sys.argv:
+        mentu_coalesce.run(emit)
+        sys.exit(0)
     try:
-        main()
+        with run("post_tool"):
+            main()
     except Exception as e:
         # Fail-safe: on error, allow tool execution to continue
         sys.stderr.write(f"PostToolUse evidence error: {e}\n")
@@ -17,8 +17,14 @@ INPUT: {
 }
 OUTPUT: {"hookSpecificOutput": {"additionalContext": "..."}}
 
-This hook reads the MENTU_ACTOR environment variable and queries
-the ledger for claimed commitments by this actor.
+This hook reads the MENTU_ACTOR environment variable and takes one
+snapshot of the ledger (claimed and in-review commitments) for this actor.
+If the ledger does not answer within MENTU_SESSION_DEADLINE seconds the
+context says so instead of holding up the session.
+
+The context stays within MENTU_CONTEXT_TOKENS: the most recently active
+commitments are listed with truncated bodies and the rest are counted.
+It is cached until the ledger changes (see mentu_context).
 
 Agent Type Behavior:
 - If agent_type is set, the hook adjusts context for subagent use
@@ -27,53 +33,17 @@ Agent Type Behavior:
 
 import json
 import os
-import subprocess
 import sys
-from typing import List, Tuple, Any
-
-
-def run_mentu(args: List[str]) -> Tuple[bool, Any]:
-    """Run mentu command, return (success, parsed_json)."""
-    try:
-        result = subprocess.run(
-            ["mentu"] + args + ["--json"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode != 0:
-            return False, None
-        return True, json.loads(result.stdout)
-    except (FileNotFoundError, subprocess.TimeoutExpired, json.JSONDecodeError):
-        return False, None
-
-
-def get_claimed_commitments(actor: str) -> List[dict]:
-    """Get commitments claimed by this actor."""
-    ok, data = run_mentu(["list", "commitments"])
-    if not ok or not isinstance(data, list):
-        return []
-
-    return [
-        c for c in data
-        if c.get("owner") == actor and c.get("state") == "claimed"
-    ]
+import time
+from typing import List
 
+import mentu_context
+import mentu_metrics
+import mentu_snapshot
 
-def get_in_review_commitments(actor: str) -> List[dict]:
-    """Get commitments in review by this actor."""
-    ok, data = run_mentu(["list", "commitments"])
-    if not ok or not isinstance(data, list):
-        return []
 
-    return [
-        c for c in data
-        if c.get("state") == "in_review"
-        # Check if this actor submitted it (created_by or last actor on it)
-    ]
-
-
-def build_context(actor: str, claimed: List[dict], in_review: List[dict]) -> str:
+def build_context(actor: str, claimed: List[dict], in_review: List[dict],
+                  complete: bool = True) -> str:
     """Build context string for injection."""
     lines = [
         "## MENTU ACCOUNTABILITY MODE",
@@ -82,6 +52,13 @@ def build_context(actor: str, claimed: List[dict], in_review: List[dict]) -> str
         ""
     ]
 
+    if not complete:
+        lines.extend([
+            "*Could not read commitments from the ledger in time; "
+            "run `mentu list commitments` to check.*",
+            "",
+        ])
+
     if not claimed and not in_review:
         lines.extend([
             "**No active commitments.**",
@@ -95,27 +72,7 @@ def build_context(actor: str, claimed: List[dict], in_review: List[dict]) -> str
         ])
         return "\n".join(lines)
 
-    if claimed:
-        lines.append("### Active Commitments (claimed)")
-        lines.append("")
-        for cmt in claimed:
-            lines.extend([
-                f"**{cmt['id']}**: {cmt.get('body', 'No description')}",
-                f"  - Source: `{cmt.get('source', 'unknown')}`",
-                f"  - Tags: {', '.join(cmt.get('tags', [])) or 'none'}",
-                ""
-            ])
-
-    if in_review:
-        lines.append("### Pending Review")
-        lines.append("")
-        for cmt in in_review:
-            lines.extend([
-                f"**{cmt['id']}**: {cmt.get('body', 'No description')} (awaiting approval)",
-                ""
-            ])
-
-    lines.extend([
+    protocol = [
         "### Completion Protocol",
         "",
         "1. Complete the work described above",
@@ -126,8 +83,48 @@ def build_context(actor: str, claimed: List[dict], in_review: List[dict]) -> str
         "   ```",
         "",
         "**Validators will be invoked based on commitment tier (tags determine tier).**",
-    ])
+    ]
+
+    # Most recently active first; claimed before in-review, within the budget
+    claimed = mentu_context.rank(claimed)
+    in_review = mentu_context.rank(in_review)
+    blocks = [
+        [
+            f"**{cmt['id']}**: {mentu_context.truncate(cmt.get('body') or 'No description')}",
+            f"  - Source: `{cmt.get('source', 'unknown')}`",
+            f"  - Tags: {', '.join(cmt.get('tags') or []) or 'none'}",
+            "",
+        ]
+        for cmt in claimed
+    ] + [
+        [
+            f"**{cmt['id']}**: {mentu_context.truncate(cmt.get('body') or 'No description')} (awaiting approval)",
+            "",
+        ]
+        for cmt in in_review
+    ]
+    fixed = lines + protocol + ["### Active Commitments (claimed)", "", "### Pending Review", "",
+                                mentu_context.more_line(len(blocks)), ""]
+    budget = mentu_context.TOKEN_BUDGET - mentu_context.estimate_tokens("\n".join(fixed))
+    shown = mentu_context.fit(blocks, budget)
+    shown_claimed = min(shown, len(claimed))
+
+    if shown_claimed:
+        lines.append("### Active Commitments (claimed)")
+        lines.append("")
+        for block in blocks[:shown_claimed]:
+            lines.extend(block)
+
+    if shown > shown_claimed:
+        lines.append("### Pending Review")
+        lines.append("")
+        for block in blocks[shown_claimed:shown]:
+            lines.extend(block)
 
+    if shown < len(blocks):
+        lines.extend([mentu_context.more_line(len(blocks) - shown), ""])
+
+    lines.extend(protocol)
     return "\n".join(lines)
 
 
@@ -141,7 +138,7 @@ def build_subagent_context(actor: str, agent_type: str, claimed: List[dict]) ->
 
     if claimed:
         # Only show IDs for subagents, not full details
-        cmt_ids = ", ".join(c["id"] for c in claimed[:3])
+        cmt_ids = ", ".join(c["id"] for c in mentu_context.rank(claimed)[:3])
         lines.append(f"**Active:** {cmt_ids}")
 
     return "\n".join(lines)
@@ -150,7 +147,8 @@ def build_subagent_context(actor: str, agent_type: str, claimed: List[dict]) ->
 def main():
     """Main entry point."""
     try:
-        input_data = json.load(sys.stdin)
+        with mentu_metrics.phase("stdin"):
+            input_data = json.load(sys.stdin)
     except json.JSONDecodeError:
         input_data = {}
 
@@ -171,17 +169,36 @@ def main():
         print(json.dumps(output))
         sys.exit(0)
 
-    # Get commitments
-    claimed = get_claimed_commitments(actor)
-    in_review = get_in_review_commitments(actor)
+    # Unchanged ledger (e.g. resume, compact): reuse the rendered context
+    with mentu_metrics.phase("cache"):
+        key = mentu_context.cache_key(actor, agent_type or "")
+        context = mentu_context.cached(key)
+    if context is not None:
+        print(json.dumps({"hookSpecificOutput": {"additionalContext": context}}))
+        sys.exit(0)
+
+    # Get commitments (one ledger query, bounded by the session deadline)
+    deadline = time.monotonic() + mentu_snapshot.SESSION_DEADLINE
+    results, late = mentu_snapshot.run_with_deadline(
+        {"snapshot": lambda: mentu_snapshot.query(actor, mentu_snapshot.remaining(deadline))},
+        deadline,
+        {"snapshot": mentu_snapshot.empty()},
+    )
+    snapshot = results["snapshot"]
+    claimed = snapshot["claimed"]
+    in_review = snapshot["in_review"]
 
     # Build context based on agent type
-    if agent_type:
-        # Subagent: lighter context to preserve tokens
-        context = build_subagent_context(actor, agent_type, claimed)
-    else:
-        # Main agent: full context
-        context = build_context(actor, claimed, in_review)
+    with mentu_metrics.phase("render"):
+        if agent_type:
+            # Subagent: lighter context to preserve tokens
+            context = build_subagent_context(actor, agent_type, claimed)
+        else:
+            # Main agent: full context
+            context = build_context(actor, claimed, in_review, snapshot["complete"])
+
+    if snapshot["complete"] and not late:
+        mentu_context.store(key, context)
 
     output = {
         "hookSpecificOutput": {
@@ -190,12 +207,13 @@ def main():
     }
 
     print(json.dumps(output))
-    sys.exit(0)
+    mentu_snapshot.finish(late)
 
 
 if __name__ == "__main__":
     try:
-        main()
+        with mentu_metrics.run("session_start"):
+            main()
     except Exception as e:
         # Fail-safe: on error, return empty context
         sys.stderr.write(f"SessionStart hook error: {e}\n")
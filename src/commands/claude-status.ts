@@ -2,12 +2,23 @@ import fs from 'fs';
 import path from 'path';
 import type { Command } from 'commander';
 import { MentuError } from '../types.js';
+import { loadSessionState, listSessionStates } from '../core/session-state.js';
+
+interface SpoolStatus {
+  pending_batches: number;
+  pending_ops: number;
+  oldest: string | null;
+  dead: number;
+  last_error: string | null;
+}
 
 interface ClaudeStatusOutput {
   initialized: boolean;
   config_path: string | null;
   hooks_installed: string[];
   active_commitment: string | null;
+  sessions: Record<string, string | null>;
+  spool: SpoolStatus | null;
   env_vars: {
     api_url: boolean;
     token: boolean;
@@ -16,6 +27,54 @@ interface ClaudeStatusOutput {
   };
 }
 
+/**
+ * Summarize the hook spool (.claude/mentu_spool.jsonl, written by mentu_spool.py):
+ * entries past the delivered offset are still waiting for the API.
+ */
+function readSpoolStatus(claudeDir: string): SpoolStatus | null {
+  const spoolPath = path.join(claudeDir, 'mentu_spool.jsonl');
+  if (!fs.existsSync(spoolPath)) {
+    return null;
+  }
+
+  let offset = 0;
+  let lastError: string | null = null;
+  try {
+    const state = JSON.parse(fs.readFileSync(path.join(claudeDir, 'mentu_spool.state.json'), 'utf-8'));
+    offset = typeof state.offset === 'number' ? state.offset : 0;
+    lastError = state.last_error || null;
+  } catch {
+    // No deliveries yet
+  }
+
+  const data = fs.readFileSync(spoolPath);
+  const pending = (offset <= data.length ? data.subarray(offset) : data)
+    .toString('utf-8')
+    .split('\n')
+    .slice(0, -1) // Last element is empty or a line still being written
+    .flatMap((line) => {
+      try {
+        const entry = JSON.parse(line);
+        return Array.isArray(entry.ops) && entry.ops.length ? [entry] : [];
+      } catch {
+        return [];
+      }
+    });
+
+  const deadPath = path.join(claudeDir, 'mentu_spool.dead.jsonl');
+  const dead = fs.existsSync(deadPath)
+    ? fs.readFileSync(deadPath, 'utf-8').split('\n').filter((line) => line.trim()).length
+    : 0;
+
+  return {
+    pending_batches: pending.length,
+    pending_ops: pending.reduce((n, entry) => n + entry.ops.length, 0),
+    oldest: pending[0]?.ts ?? null,
+    dead,
+    last_error: pending.length ? lastError : null,
+  };
+}
+
 function outputResult(result: ClaudeStatusOutput, json: boolean): void {
   if (json) {
     console.log(JSON.stringify(result));
@@ -44,6 +103,31 @@ function outputResult(result: ClaudeStatusOutput, json: boolean): void {
       console.log('');
       console.log(`Active Commitment: ${result.active_commitment}`);
     }
+
+    const sessions = Object.entries(result.sessions);
+    if (sessions.length > 1) {
+      console.log('');
+      console.log('Sessions:');
+      for (const [session, commitment] of sessions) {
+        console.log(`  ${session}: ${commitment || 'none'}`);
+      }
+    }
+
+    if (result.spool) {
+      const { pending_ops, pending_batches, oldest, dead, last_error } = result.spool;
+      console.log('');
+      console.log(
+        pending_ops
+          ? `Spool: ${pending_ops} ops in ${pending_batches} batches pending since ${oldest}`
+          : 'Spool: empty'
+      );
+      if (last_error) {
+        console.log(`  Last error: ${last_error}`);
+      }
+      if (dead) {
+        console.log(`  Rejected: ${dead} (see .claude/mentu_spool.dead.jsonl)`);
+      }
+    }
   }
 }
 
@@ -68,7 +152,6 @@ export function registerClaudeStatusCommand(program: Command): void {
         const claudeDir = path.join(projectRoot, '.claude');
         const configPath = path.join(claudeDir, 'mentu_config.yaml');
         const hooksDir = path.join(claudeDir, 'hooks');
-        const statePath = path.join(claudeDir, 'mentu_state.json');
 
         const initialized = fs.existsSync(configPath);
 
@@ -84,15 +167,11 @@ export function registerClaudeStatusCommand(program: Command): void {
           }
         }
 
-        // Check active commitment
-        let activeCommitment: string | null = null;
-        if (fs.existsSync(statePath)) {
-          try {
-            const state = JSON.parse(fs.readFileSync(statePath, 'utf-8'));
-            activeCommitment = state.active_commitment || null;
-          } catch {
-            // Ignore parse errors
-          }
+        // Check active commitment (this session's) and those of all sessions
+        const activeCommitment = loadSessionState(projectRoot)?.active_commitment || null;
+        const sessions: Record<string, string | null> = {};
+        for (const [session, state] of Object.entries(listSessionStates(projectRoot))) {
+          sessions[session] = state.active_commitment || null;
         }
 
         const result: ClaudeStatusOutput = {
@@ -100,6 +179,8 @@ export function registerClaudeStatusCommand(program: Command): void {
           config_path: initialized ? configPath : null,
           hooks_installed: hooksInstalled,
           active_commitment: activeCommitment,
+          sessions,
+          spool: readSpoolStatus(claudeDir),
           env_vars: {
             api_url: !!process.env.MENTU_API_URL,
             token: !!process.env.MENTU_PROXY_TOKEN,
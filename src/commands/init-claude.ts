@@ -3,6 +3,7 @@ import path from 'path';
 import { fileURLToPath } from 'url';
 import type { Command } from 'commander';
 import { MentuError } from '../types.js';
+import { precompileHooks } from '../utils/hooks.js';
 
 interface InitClaudeOptions {
   workspace?: string;
@@ -38,6 +39,7 @@ function outputResult(result: InitClaudeOutput, json: boolean): void {
     console.log('Hooks wired in Claude Code settings:');
     console.log('  - SessionStart: Injects claimed commitments into agent context');
     console.log('  - PostToolUse (Edit|Write): Auto-captures file edits as evidence');
+    console.log('  - SessionEnd: Captures edits still being coalesced');
     console.log('');
     console.log('Permissions added:');
     console.log('  - Bash(mentu:*) — allows mentu CLI commands');
@@ -98,10 +100,20 @@ export function registerInitClaudeCommand(program: Command): void {
         const mentuRoot = path.resolve(__dirname, '..', '..');
         const templatesDir = path.join(mentuRoot, 'src', 'templates');
 
-        // Copy hook templates (v0.7 MVP hooks)
+        // Copy hook templates (v0.7 MVP hooks + shared hook modules)
         const hookFiles = [
           'mentu_session_start.py',
-          'mentu_post_tool.py'
+          'mentu_post_tool.py',
+          'mentu_hookd.py',
+          'mentu_ledger.py',
+          'mentu_index.py',
+          'mentu_evidence_log.py',
+          'mentu_coalesce.py',
+          'mentu_fingerprint.py',
+          'mentu_http.py',
+          'mentu_spool.py',
+          'mentu_state.py',
+          'mentu_metrics.py'
         ];
 
         for (const hookFile of hookFiles) {
@@ -119,6 +131,9 @@ export function registerInitClaudeCommand(program: Command): void {
           created.push(`.claude/hooks/${hookFile}`);
         }
 
+        // Compile the hooks once now instead of on their first runs
+        precompileHooks(hooksDir);
+
         // Create config
         const config = `# Mentu Integration for Claude Code v0.7 MVP
 # Generated by: mentu init-claude
@@ -143,11 +158,11 @@ hooks:
 
         // Update .gitignore
         const gitignorePath = path.join(projectRoot, '.gitignore');
-        const mentuEntry = '\n# Mentu state\n.claude/mentu_state.json\n.claude/mentu_evidence.json\n';
+        const mentuEntry = '\n# Mentu state\n.claude/mentu_state*\n.claude/mentu_evidence.json*\n.claude/mentu_spool*\n.claude/mentu_http*\n.claude/mentu_coalesce*\n.claude/mentu_fingerprints*\n.claude/mentu_metrics*\n.claude/hooks/__pycache__/\n';
 
         if (fs.existsSync(gitignorePath)) {
           const content = fs.readFileSync(gitignorePath, 'utf-8');
-          if (!content.includes('mentu_state.json') && !content.includes('mentu_evidence.json')) {
+          if (!content.includes('mentu_state') && !content.includes('mentu_evidence.json')) {
             fs.appendFileSync(gitignorePath, mentuEntry);
           }
         }
@@ -213,6 +228,27 @@ hooks:
           postHooks.push(postToolHook);
         }
 
+        // Add SessionEnd hook (captures edits still being coalesced)
+        const sessionEndHook = {
+          matcher: '',
+          hooks: [{
+            type: 'command',
+            command: '"$CLAUDE_PROJECT_DIR"/.claude/hooks/mentu_post_tool.py',
+            timeout: 15
+          }]
+        };
+
+        if (!hooks.SessionEnd) {
+          hooks.SessionEnd = [];
+        }
+        const sessionEndHooks = hooks.SessionEnd as Record<string, unknown>[];
+        const hasSessionEndHook = sessionEndHooks.some((h) =>
+          JSON.stringify(h).includes('mentu_post_tool')
+        );
+        if (!hasSessionEndHook) {
+          sessionEndHooks.push(sessionEndHook);
+        }
+
         // Ensure mentu CLI permission is allowed
         if (!settings.permissions || typeof settings.permissions !== 'object') {
           settings.permissions = {};
@@ -1,4 +1,3 @@
-import fs from 'fs';
 import type { Command } from 'commander';
 import type { CaptureOperation, CommitOperation, ClaimOperation, CloseOperation, ReleaseOperation, AnnotateOperation } from '../types.js';
 import { MentuError } from '../types.js';
@@ -9,6 +8,8 @@ import { findWorkspace, readConfig, getWorkspaceName } from '../core/config.js';
 import { readLedger, appendOperation } from '../core/ledger.js';
 import { readGenesisKey } from '../core/genesis.js';
 import { validateOperation } from '../core/validate.js';
+import { loadSessionState, saveSessionState, clearSessionState } from '../core/session-state.js';
+import type { SessionState } from '../core/session-state.js';
 
 interface TaskOptions {
   actor?: string;
@@ -32,31 +33,21 @@ interface TaskFailOutput {
   error_annotated: boolean;
 }
 
-const STATE_FILE = '.claude/mentu_state.json';
-
+// State is per session (MENTU_SESSION_ID), so parallel sessions keep their own task
 function saveState(commitmentId: string, memoryId: string, actor: string): void {
-  fs.mkdirSync('.claude', { recursive: true });
-  fs.writeFileSync(STATE_FILE, JSON.stringify({
+  saveSessionState(process.cwd(), {
     active_commitment: commitmentId,
     source_memory: memoryId,
     actor,
-  }, null, 2));
+  });
 }
 
-function loadState(): { active_commitment?: string; actor?: string } | null {
-  try {
-    return JSON.parse(fs.readFileSync(STATE_FILE, 'utf-8'));
-  } catch {
-    return null;
-  }
+function loadState(): SessionState | null {
+  return loadSessionState(process.cwd());
 }
 
-function clearState(): void {
-  try {
-    fs.unlinkSync(STATE_FILE);
-  } catch {
-    // Ignore
-  }
+function clearState(commitmentId: string): void {
+  clearSessionState(process.cwd(), undefined, commitmentId);
 }
 
 function outputResult(result: unknown, json: boolean): void {
@@ -243,7 +234,7 @@ export function registerTaskCommand(program: Command): void {
         if (!json) console.log(`Closed: ${commitmentId}`);
 
         // 3. Clear state
-        clearState();
+        clearState(commitmentId);
 
         const result: TaskCompleteOutput = {
           commitment_id: commitmentId,
@@ -328,7 +319,7 @@ export function registerTaskCommand(program: Command): void {
         if (!json) console.log(`Released: ${commitmentId}`);
 
         // 3. Clear state
-        clearState();
+        clearState(commitmentId);
 
         const result: TaskFailOutput = {
           commitment_id: commitmentId,
@@ -9,6 +9,7 @@ import { execSync } from 'child_process';
 import { fileURLToPath } from 'url';
 import type { Command } from 'commander';
 import { MentuError } from '../types.js';
+import { precompileHooks } from '../utils/hooks.js';
 
 // ─── Types ───────────────────────────────────────────────────────────────────
 
@@ -243,6 +244,20 @@ const GITIGNORE_ENTRIES = `
 .mentu/config.yaml
 .mentu/sync-state.json
 .mentu/active_commitment
+.mentu/hookd.sock
+.mentu/snapshot.json*
+.mentu/ledger.idx*
+.mentu/sync.state.json*
+.mentu/sync.lock
+.mentu/context.cache.json*
+.claude/mentu_state/
+.claude/mentu_evidence.json*
+.claude/mentu_spool*
+.claude/mentu_http.breaker.json
+.claude/mentu_coalesce.*
+.claude/mentu_metrics.jsonl*
+.claude/mentu_fingerprints.*
+.claude/hooks/__pycache__/
 
 # Ralph
 .ralph/autopilot-state.json
@@ -250,6 +265,7 @@ const GITIGNORE_ENTRIES = `
 .ralph/logs/
 .ralph/diagnostics/
 .ralph/*.lock
+.ralph/memories.archive.md
 .ralph/events-*.jsonl
 .ralph/history.jsonl
 .ralph/current-*
@@ -322,6 +338,29 @@ function updateEnvFile(
 
 // ─── Settings.json Merge ─────────────────────────────────────────────────────
 
+/** Hooks that mentu_dispatch.py now runs in-process. */
+const LEGACY_HOOKS = ['mentu_post_tool', 'mentu_evidence_to_memory'];
+
+/**
+ * Drop separately registered legacy hook commands from a settings hooks
+ * list, and any matcher entry left without hooks.
+ */
+function removeLegacyHooks(entries: Record<string, unknown>[]): Record<string, unknown>[] {
+  return entries.filter((entry) => {
+    if (!Array.isArray(entry.hooks)) {
+      return true;
+    }
+    const kept = entry.hooks.filter((hook) =>
+      !LEGACY_HOOKS.some((name) => JSON.stringify(hook).includes(name))
+    );
+    if (kept.length === entry.hooks.length) {
+      return true;
+    }
+    entry.hooks = kept;
+    return kept.length > 0;
+  });
+}
+
 function mergeClaudeSettings(projectRoot: string): boolean {
   const settingsPath = path.join(projectRoot, '.claude', 'settings.json');
   let settings: Record<string, unknown> = {};
@@ -366,51 +405,52 @@ function mergeClaudeSettings(projectRoot: string): boolean {
     changed = true;
   }
 
-  // PostToolUse hooks (evidence capture + bridge to Ralph memories)
+  // PostToolUse hook: one dispatcher runs evidence capture, annotation,
+  // sync and the Ralph memory bridge in a single process
+  const dispatchCommand = 'python3 "$CLAUDE_PROJECT_DIR"/.claude/hooks/mentu_dispatch.py';
   const postToolHook = {
     matcher: 'Edit|Write',
-    hooks: [
-      {
-        type: 'command',
-        command: 'python3 "$CLAUDE_PROJECT_DIR"/.claude/hooks/mentu_post_tool.py',
-        timeout: 15,
-      },
-      {
-        type: 'command',
-        command: 'python3 "$CLAUDE_PROJECT_DIR"/.claude/hooks/mentu_evidence_to_memory.py',
-        timeout: 15,
-      },
-    ],
+    hooks: [{
+      type: 'command',
+      command: dispatchCommand,
+      timeout: 15,
+    }],
   };
 
   if (!hooks.PostToolUse) {
     hooks.PostToolUse = [];
   }
+  hooks.PostToolUse = removeLegacyHooks(hooks.PostToolUse as Record<string, unknown>[]);
   const postHooks = hooks.PostToolUse as Record<string, unknown>[];
   const hasPostHook = postHooks.some((h) =>
-    JSON.stringify(h).includes('mentu_post_tool')
+    JSON.stringify(h).includes('mentu_dispatch')
   );
   if (!hasPostHook) {
     postHooks.push(postToolHook);
     changed = true;
   }
 
-  // Ensure bridge hook is registered (may be missing from older installations)
-  const hasBridgeHook = postHooks.some((h) =>
-    JSON.stringify(h).includes('mentu_evidence_to_memory')
+  // SessionEnd hook (captures edits still being coalesced)
+  const sessionEndHook = {
+    matcher: '',
+    hooks: [{
+      type: 'command',
+      command: dispatchCommand,
+      timeout: 15,
+    }],
+  };
+
+  if (!hooks.SessionEnd) {
+    hooks.SessionEnd = [];
+  }
+  hooks.SessionEnd = removeLegacyHooks(hooks.SessionEnd as Record<string, unknown>[]);
+  const sessionEndHooks = hooks.SessionEnd as Record<string, unknown>[];
+  const hasSessionEndHook = sessionEndHooks.some((h) =>
+    JSON.stringify(h).includes('mentu_dispatch')
   );
-  if (!hasBridgeHook) {
-    const editWriteEntry = postHooks.find((h) =>
-      JSON.stringify(h).includes('mentu_post_tool')
-    ) as Record<string, unknown> | undefined;
-    if (editWriteEntry && Array.isArray(editWriteEntry.hooks)) {
-      editWriteEntry.hooks.push({
-        type: 'command',
-        command: 'python3 "$CLAUDE_PROJECT_DIR"/.claude/hooks/mentu_evidence_to_memory.py',
-        timeout: 15,
-      });
-      changed = true;
-    }
+  if (!hasSessionEndHook) {
+    sessionEndHooks.push(sessionEndHook);
+    changed = true;
   }
 
   // Permissions
@@ -556,6 +596,9 @@ async function workspaceInit(options: WorkspaceInitOptions, json: boolean): Prom
   created.push(...templateResult.created);
   skipped.push(...templateResult.skipped);
 
+  // Compile the hooks once now instead of on their first runs
+  precompileHooks(path.join(projectRoot, '.claude', 'hooks'));
+
   // 6. Wire .claude/settings.json
   if (!json) {
     console.log('Wiring Claude Code settings...');
@@ -48,6 +48,21 @@ export function appendOperation(workspacePath: string, op: Operation): void {
   });
 }
 
+/**
+ * Append several operations to the ledger in one locked write.
+ * Either all operations are written or none are.
+ */
+export function appendOperations(workspacePath: string, ops: Operation[]): void {
+  if (ops.length === 0) {
+    return;
+  }
+  withLockSync(workspacePath, () => {
+    const ledgerPath = getLedgerPath(workspacePath);
+    const lines = ops.map((op) => JSON.stringify(op) + '\n').join('');
+    fs.appendFileSync(ledgerPath, lines, 'utf-8');
+  });
+}
+
 /**
  * Check if an ID exists in the ledger.
  */
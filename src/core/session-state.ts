@@ -0,0 +1,151 @@
+// Session State — active commitment per session (.claude/mentu_state/<session>.json)
+//
+// Same layout as the mentu_state.py hook module: one file per session, so
+// parallel sessions in one checkout never overwrite or clear each other's
+// active commitment. Writes go through a temp file and a rename.
+
+import fs from 'fs';
+import path from 'path';
+
+const STATE_DIR = path.join('.claude', 'mentu_state');
+const DEFAULT_SESSION = 'default';
+
+// Single-file state of older versions, migrated into the default session
+const LEGACY_STATE_FILE = path.join('.claude', 'mentu_state.json');
+const LEGACY_ACTIVE_FILE = path.join('.mentu', 'active_commitment');
+
+export interface SessionState {
+  active_commitment?: string;
+  source_memory?: string;
+  actor?: string;
+  session_id?: string;
+  ended?: number;
+}
+
+/**
+ * State key for a session: MENTU_SESSION_ID, else sessionId, else "default".
+ */
+export function getSessionKey(sessionId?: string): string {
+  const key = process.env.MENTU_SESSION_ID || sessionId || DEFAULT_SESSION;
+  return key.replace(/[^A-Za-z0-9._-]/g, '_').slice(0, 128);
+}
+
+function statePath(root: string, key: string): string {
+  return path.join(root, STATE_DIR, `${key}.json`);
+}
+
+function readState(filePath: string): SessionState | null {
+  try {
+    const state = JSON.parse(fs.readFileSync(filePath, 'utf-8'));
+    return state && typeof state === 'object' && !Array.isArray(state) ? state : null;
+  } catch {
+    return null;
+  }
+}
+
+function writeState(filePath: string, state: SessionState): void {
+  fs.mkdirSync(path.dirname(filePath), { recursive: true });
+  const tmp = `${filePath}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, JSON.stringify(state, null, 2));
+  fs.renameSync(tmp, filePath);
+}
+
+/**
+ * Move the single-file state of older versions into the default session.
+ */
+function migrateLegacyState(root: string): void {
+  for (const legacy of [LEGACY_STATE_FILE, LEGACY_ACTIVE_FILE]) {
+    const legacyPath = path.join(root, legacy);
+    let raw: string;
+    let mtime: Date;
+    try {
+      raw = fs.readFileSync(legacyPath, 'utf-8').trim();
+      mtime = fs.statSync(legacyPath).mtime;
+    } catch {
+      continue;
+    }
+    let state: SessionState | null;
+    if (legacy === LEGACY_STATE_FILE) {
+      try {
+        state = JSON.parse(raw);
+      } catch {
+        state = null;
+      }
+    } else {
+      state = { active_commitment: raw };
+    }
+    const target = statePath(root, DEFAULT_SESSION);
+    if (state?.active_commitment && !fs.existsSync(target)) {
+      writeState(target, state);
+      fs.utimesSync(target, mtime, mtime); // Keep its age for stale detection
+    }
+    fs.rmSync(legacyPath, { force: true });
+  }
+}
+
+/**
+ * Load this session's state, else the default session's (unless fallback is false).
+ */
+export function loadSessionState(
+  root: string,
+  sessionId?: string,
+  fallback: boolean = true
+): SessionState | null {
+  migrateLegacyState(root);
+  const key = getSessionKey(sessionId);
+  const state = readState(statePath(root, key));
+  if (state === null && fallback && key !== DEFAULT_SESSION) {
+    return readState(statePath(root, DEFAULT_SESSION));
+  }
+  return state;
+}
+
+/**
+ * Replace this session's state.
+ */
+export function saveSessionState(root: string, state: SessionState, sessionId?: string): void {
+  migrateLegacyState(root);
+  const key = getSessionKey(sessionId);
+  writeState(statePath(root, key), { ...state, session_id: sessionId || key });
+}
+
+/**
+ * Remove this session's state.
+ * With commitmentId, only if that is still the active commitment. A session
+ * without state of its own clears the default state it fell back to only
+ * when given the commitment it read from it; other sessions may share it.
+ */
+export function clearSessionState(root: string, sessionId?: string, commitmentId?: string): void {
+  let key = getSessionKey(sessionId);
+  if (!fs.existsSync(statePath(root, key)) && key !== DEFAULT_SESSION) {
+    if (commitmentId === undefined) {
+      return;
+    }
+    key = DEFAULT_SESSION;
+  }
+  const filePath = statePath(root, key);
+  if (commitmentId !== undefined && readState(filePath)?.active_commitment !== commitmentId) {
+    return;
+  }
+  fs.rmSync(filePath, { force: true });
+}
+
+/**
+ * All sessions with state, by session key.
+ */
+export function listSessionStates(root: string): Record<string, SessionState> {
+  migrateLegacyState(root);
+  const dir = path.join(root, STATE_DIR);
+  const sessions: Record<string, SessionState> = {};
+  if (!fs.existsSync(dir)) {
+    return sessions;
+  }
+  for (const name of fs.readdirSync(dir).sort()) {
+    if (!name.endsWith('.json')) continue;
+    const state = readState(path.join(dir, name));
+    if (state) {
+      sessions[name.slice(0, -'.json'.length)] = state;
+    }
+  }
+  return sessions;
+}
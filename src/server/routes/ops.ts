@@ -15,15 +15,16 @@ import type {
   ReopenOperation,
 } from '../../types.js';
 import { MentuError } from '../../types.js';
-import { readLedger, appendOperation } from '../../core/ledger.js';
+import { readLedger, appendOperation, appendOperations } from '../../core/ledger.js';
 import { validateOperation } from '../../core/validate.js';
 import { readGenesisKey } from '../../core/genesis.js';
 import { getWorkspaceName } from '../../core/config.js';
-import { generateId } from '../../utils/id.js';
+import { generateId, getIdPrefix, isValidId, type IdPrefix } from '../../utils/id.js';
 import { timestamp } from '../../utils/time.js';
 
 interface OpRequestBody {
   op: string;
+  id?: string;
   body?: string;
   source?: string;
   commitment?: string;
@@ -48,6 +49,27 @@ interface OpRequestBody {
   from_state?: 'in_review' | 'closed';
 }
 
+interface BatchRequestBody {
+  ops?: Array<OpRequestBody & { payload?: Partial<OpRequestBody> }>;
+}
+
+const MAX_BATCH_OPS = 100;
+
+/**
+ * Use a client-supplied ID if present, so later ops in a batch can reference it.
+ */
+function resolveId(body: OpRequestBody, prefix: IdPrefix): string {
+  if (body.id === undefined) {
+    return generateId(prefix);
+  }
+  if (!isValidId(body.id) || getIdPrefix(body.id) !== prefix) {
+    throw new MentuError('E_INVALID_OP', `Invalid ${body.op} id: ${body.id} (expected ${prefix}_<8 hex>)`, {
+      id: body.id,
+    });
+  }
+  return body.id;
+}
+
 /**
  * Build an operation from request body.
  * Actor comes from context (API key), not from request body.
@@ -58,7 +80,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
 
   switch (body.op) {
     case 'capture': {
-      const id = generateId('mem');
+      const id = resolveId(body, 'mem');
       const op: CaptureOperation = {
         id,
         op: 'capture',
@@ -80,7 +102,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'commit': {
-      const id = generateId('cmt');
+      const id = resolveId(body, 'cmt');
       const op: CommitOperation = {
         id,
         op: 'commit',
@@ -98,7 +120,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'claim': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: ClaimOperation = {
         id,
         op: 'claim',
@@ -113,7 +135,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'release': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: ReleaseOperation = {
         id,
         op: 'release',
@@ -129,7 +151,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'close': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: CloseOperation = {
         id,
         op: 'close',
@@ -146,7 +168,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'annotate': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: AnnotateOperation = {
         id,
         op: 'annotate',
@@ -165,7 +187,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'link': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: LinkOperation = {
         id,
         op: 'link',
@@ -183,7 +205,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'dismiss': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: DismissOperation = {
         id,
         op: 'dismiss',
@@ -200,7 +222,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'triage': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: TriageOperation = {
         id,
         op: 'triage',
@@ -217,7 +239,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'submit': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const evidence =
         typeof body.evidence === 'string'
           ? [body.evidence]
@@ -243,7 +265,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'approve': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: ApproveOperation = {
         id,
         op: 'approve',
@@ -261,7 +283,7 @@ function buildOperation(body: OpRequestBody, actor: string, workspacePath: strin
     }
 
     case 'reopen': {
-      const id = generateId('op');
+      const id = resolveId(body, 'op');
       const op: ReopenOperation = {
         id,
         op: 'reopen',
@@ -420,5 +442,48 @@ export function opsRoutes(workspacePath: string) {
     return c.json(formatOperationResponse(operation), 201);
   });
 
+  /**
+   * POST /ops/batch - apply dependent operations in one request.
+   * Ops may carry client-generated IDs that later ops reference. Every op is
+   * validated against the ledger plus the ops before it, then all are
+   * appended in one locked write; if any op fails, nothing is written.
+   */
+  router.post('/batch', async (c) => {
+    const body = (await c.req.json()) as BatchRequestBody;
+    const actor = (c as unknown as { get: (key: string) => string }).get('actor');
+    const genesis = readGenesisKey(workspacePath);
+    const ledger = readLedger(workspacePath);
+
+    if (!Array.isArray(body.ops) || body.ops.length === 0) {
+      throw new MentuError('E_MISSING_FIELD', 'Missing field: ops', { field: 'ops' });
+    }
+    if (body.ops.length > MAX_BATCH_OPS) {
+      throw new MentuError('E_INVALID_OP', `Batch exceeds ${MAX_BATCH_OPS} operations`, {
+        count: body.ops.length,
+      });
+    }
+
+    const operations: Operation[] = [];
+    body.ops.forEach((entry, index) => {
+      // Fields may be flat (as for POST /ops) or nested under payload
+      const request = { ...(entry.payload ?? {}), ...entry } as OpRequestBody;
+      if (!request.op) {
+        throw new MentuError('E_MISSING_FIELD', `Missing field: ops[${index}].op`, { field: 'op', index });
+      }
+
+      const operation = buildOperation(request, actor, workspacePath);
+      const validation = validateOperation(operation, [...ledger, ...operations], genesis);
+      if (!validation.valid && validation.error) {
+        validation.error.details = { ...validation.error.details, index };
+        throw validation.error;
+      }
+      operations.push(operation);
+    });
+
+    appendOperations(workspacePath, operations);
+
+    return c.json({ ops: operations.map(formatOperationResponse) }, 201);
+  });
+
   return router;
 }
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Edit Coalescing - One evidence record per burst of edits to a file.
+
+An agent often edits the same file dozens of times in a few minutes, and
+the PostToolUse hook used to capture one evidence memory (plus log entry,
+sync and annotation) per edit. With coalescing, edits are recorded in
+`.claude/mentu_coalesce.json` instead, grouped by file:
+
+    {"src/app.ts": {"file": "src/app.ts", "type": "file_modified",
+                    "count": 14, "first": 1760000000.1, "last": 1760000042.7}}
+
+A group's window opens at its first edit and closes MENTU_COALESCE_WINDOW
+seconds later; the group is then emitted as a single evidence record with
+the edit count and time range. Closed groups are emitted by the next hook
+call, or by a background flusher that sleeps until the next window closes
+and exits once nothing is pending. At session end the hook emits whatever
+is still open.
+
+Set MENTU_COALESCE=0 (or the window to 0) to capture every edit directly.
+
+Usage:
+    python3 mentu_coalesce.py status
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+WINDOW = float(os.environ.get("MENTU_COALESCE_WINDOW", "30"))
+
+PENDING_FILE = Path(".claude/mentu_coalesce.json")
+LOCK_FILE = Path(".claude/mentu_coalesce.lock")
+FLUSHER_LOCK = Path(".claude/mentu_coalesce.flusher.lock")
+
+FLUSH_ARG = "--flush-coalesced"
+
+
+def enabled() -> bool:
+    return WINDOW > 0 and os.environ.get("MENTU_COALESCE", "1") != "0"
+
+
+# ─── Pending groups ──────────────────────────────────────────────────────────
+
+@contextmanager
+def _locked() -> Iterator[dict]:
+    """Pending groups under an exclusive lock; changes are saved on exit."""
+    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        groups = _load()
+        before = json.dumps(groups, sort_keys=True)
+        yield groups
+        if json.dumps(groups, sort_keys=True) != before:
+            tmp = PENDING_FILE.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(groups))
+            os.replace(tmp, PENDING_FILE)
+    finally:
+        os.close(fd)
+
+
+def _load() -> dict:
+    try:
+        groups = json.loads(PENDING_FILE.read_text())
+        if isinstance(groups, dict):
+            return groups
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _pop(groups: dict, now: float | None, session: str | None = None) -> list:
+    """
+    Remove and return groups whose window closed by now (all if now is None),
+    only those of session (or of no session) if given.
+    """
+    closed = [key for key, group in groups.items()
+              if (now is None or group["first"] + WINDOW <= now)
+              and (session is None or group.get("session") in (None, session))]
+    return sorted((groups.pop(key) for key in closed), key=lambda group: group["first"])
+
+
+def record(file_path: str, evidence_type: str, now: float | None = None,
+           session: str | None = None) -> list:
+    """
+    Add one edit of file_path to its open group.
+
+    Returns the groups whose window has closed; the caller emits them. An
+    edit after its file's window closed starts a new group. The group keeps
+    the session of its latest edit.
+    """
+    now = time.time() if now is None else now
+    with _locked() as groups:
+        closed = _pop(groups, now)
+        group = groups.get(file_path)
+        if group is None:
+            group = groups[file_path] = {"file": file_path, "type": evidence_type,
+                                         "count": 1, "first": now, "last": now}
+        else:
+            group["count"] += 1
+            group["last"] = now
+        if session:
+            group["session"] = session
+    return closed
+
+
+def take(everything: bool = False, session: str | None = None) -> list:
+    """
+    Remove and return closed groups, or at session end all groups (of that
+    session, if given; other sessions' edits keep their windows).
+    """
+    if not PENDING_FILE.exists():
+        return []
+    with _locked() as groups:
+        return _pop(groups, None if everything else time.time(), session if everything else None)
+
+
+def _clock(ts: float) -> str:
+    return time.strftime("%H:%M:%S", time.gmtime(ts))
+
+
+def _iso(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def summary(group: dict) -> str:
+    """' (14 edits, 10:01:02-10:01:44 UTC)' for a coalesced group, '' for one edit."""
+    if group["count"] == 1:
+        return ""
+    return f" ({group['count']} edits, {_clock(group['first'])}-{_clock(group['last'])} UTC)"
+
+
+def log_fields(group: dict) -> dict:
+    """Extra evidence log fields for a coalesced group."""
+    if group["count"] == 1:
+        return {}
+    return {"edits": group["count"], "first": _iso(group["first"]), "last": _iso(group["last"])}
+
+
+# ─── Flusher ─────────────────────────────────────────────────────────────────
+
+def _try_lock() -> int | None:
+    FLUSHER_LOCK.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(FLUSHER_LOCK, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def ensure_flusher(script: str) -> None:
+    """
+    Start `script FLUSH_ARG` detached unless a flusher is already running.
+
+    The hook script handles FLUSH_ARG by calling run() with its own emit
+    function, so the flusher records evidence exactly as the hook would.
+    """
+    fd = _try_lock()
+    if fd is None:
+        return
+    os.close(fd)
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(script), FLUSH_ARG],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def run(emit: Callable[[dict], None]) -> None:
+    """Flusher loop: emit groups as their windows close, exit when none are pending."""
+    fd = _try_lock()
+    if fd is None:
+        return  # Another flusher is running
+    while True:
+        groups = _load()
+        if not groups:
+            # Release, then re-check: a hook that recorded an edit while we
+            # held the lock saw a running flusher and did not start one
+            os.close(fd)
+            if not _load():
+                return
+            fd = _try_lock()
+            if fd is None:
+                return
+            continue
+        next_close = min(group["first"] for group in groups.values()) + WINDOW
+        time.sleep(max(next_close - time.time(), 0.0))
+        for group in take():
+            try:
+                emit(group)
+            except Exception as e:
+                sys.stderr.write(f"[Mentu] Coalesced evidence error: {e}\n")
+
+
+def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if command == "status":
+        groups = sorted(_load().values(), key=lambda group: group["first"])
+        now = time.time()
+        print(json.dumps({
+            "window": WINDOW,
+            "enabled": enabled(),
+            "pending": [{"file": g["file"], "edits": g["count"],
+                         "closes_in": round(max(g["first"] + WINDOW - now, 0.0), 1)} for g in groups],
+        }, indent=2))
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
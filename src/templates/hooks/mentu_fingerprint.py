@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu File Fingerprints - Content hashes and line counts for evidence.
+
+Evidence used to record only a file name, so a reviewer could not tell
+what an edit changed, and hashing or diffing files on every edit would
+make hooks slow on large files. Fingerprints are cached in
+`.claude/mentu_fingerprints.json`, keyed by path:
+
+    {"/repo/src/app.ts": {"mtime": 1760000000123456789, "size": 4096,
+                          "sha256": "9f86d0...", "lines": 132, "seen": 1760000000.2}}
+
+A file whose mtime and size match its cached entry is not read again;
+others are hashed in CHUNK_BYTES chunks, counting lines on the way. Each
+evidence record gets the file's hash and line count at its previous
+evidence (the cached entry) and now:
+
+    {"sha_before": "1a2b3c...", "sha_after": "9f86d0...", "lines": 132, "line_delta": 12}
+
+An entry cached within RACY_SECONDS of its file's mtime may predate a
+same-size write in the same clock tick, so it is always re-hashed (as git
+does for its index). Files over MENTU_FINGERPRINT_MAX_BYTES (default
+64 MiB) are not hashed; only MENTU_FINGERPRINT_ENTRIES (default 1000)
+recently seen files are kept. Set MENTU_FINGERPRINT=0 to turn it off.
+
+Usage:
+    python3 mentu_fingerprint.py show PATH
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+CACHE_FILE = Path(".claude/mentu_fingerprints.json")
+LOCK_FILE = Path(".claude/mentu_fingerprints.lock")
+
+MAX_BYTES = int(os.environ.get("MENTU_FINGERPRINT_MAX_BYTES", str(64 * 1024 * 1024)))
+MAX_ENTRIES = int(os.environ.get("MENTU_FINGERPRINT_ENTRIES", "1000"))
+
+CHUNK_BYTES = 1024 * 1024
+RACY_SECONDS = 2
+SHORT_SHA = 7
+
+
+def enabled() -> bool:
+    return os.environ.get("MENTU_FINGERPRINT", "1") != "0"
+
+
+# ─── Fingerprints ────────────────────────────────────────────────────────────
+
+def digest(path: str, size: int) -> tuple[str | None, int | None]:
+    """(sha256, line count) of a file, streamed; (None, None) if too large."""
+    if size > MAX_BYTES:
+        return None, None
+    import hashlib  # Only needed when a file changed
+
+    sha = hashlib.sha256()
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_BYTES):
+            sha.update(chunk)
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1  # Last line without a newline
+    return sha.hexdigest(), lines
+
+
+def _fresh(entry: dict | None, st: os.stat_result) -> bool:
+    """Whether a cached entry still describes the file (no need to read it)."""
+    return (
+        entry is not None
+        and entry.get("mtime") == st.st_mtime_ns
+        and entry.get("size") == st.st_size
+        and entry.get("seen", 0) - st.st_mtime_ns / 1e9 >= RACY_SECONDS
+    )
+
+
+def fingerprint(path: str, cached: dict | None = None) -> dict | None:
+    """The file's fingerprint, reusing cached if it is fresh; None if unreadable."""
+    try:
+        st = os.stat(path)
+        if _fresh(cached, st):
+            return {**cached, "seen": time.time()}
+        seen = time.time()
+        sha, lines = digest(path, st.st_size)
+    except OSError:
+        return None
+    return {"mtime": st.st_mtime_ns, "size": st.st_size, "sha256": sha, "lines": lines,
+            "seen": seen}
+
+
+# ─── Cache ───────────────────────────────────────────────────────────────────
+
+def _load() -> dict:
+    try:
+        entries = json.loads(CACHE_FILE.read_text())
+        if isinstance(entries, dict):
+            return entries
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _update(key: str, entry: dict | None) -> None:
+    """Store (or, if None, drop) one entry under the lock, evicting the least recently seen."""
+    import fcntl
+
+    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        entries = _load()
+        if entry is None:
+            if entries.pop(key, None) is None:
+                return
+        else:
+            entries[key] = entry
+        if len(entries) > MAX_ENTRIES:
+            for old in sorted(entries, key=lambda k: entries[k].get("seen", 0))[:len(entries) - MAX_ENTRIES]:
+                del entries[old]
+        tmp = CACHE_FILE.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(entries))
+        os.replace(tmp, CACHE_FILE)
+    finally:
+        os.close(fd)
+
+
+def change(file_path: str) -> dict:
+    """
+    Evidence log fields for the file's change since its previous evidence:
+    sha_before (if it was fingerprinted before), sha_after, lines and
+    line_delta. Empty if disabled or the file cannot be read.
+    """
+    if not enabled() or not file_path:
+        return {}
+    key = os.path.abspath(file_path)
+    try:
+        before = _load().get(key)
+        after = fingerprint(key, before)
+        _update(key, after)
+    except OSError:
+        return {}
+    if after is None or after["sha256"] is None:
+        return {}
+
+    fields = {}
+    if before and before.get("sha256"):
+        fields["sha_before"] = before["sha256"]
+    fields["sha_after"] = after["sha256"]
+    fields["lines"] = after["lines"]
+    if before and before.get("lines") is not None:
+        fields["line_delta"] = after["lines"] - before["lines"]
+    return fields
+
+
+def describe(fields: dict) -> str:
+    """'+12 lines, 1a2b3c4→9f86d0e' (or '132 lines, 9f86d0e' with nothing before), '' without."""
+    if not fields.get("sha_after"):
+        return ""
+    after = fields["sha_after"][:SHORT_SHA]
+    if "line_delta" not in fields:
+        return f"{_lines(fields['lines'])}, {after}"
+    if fields["sha_before"] == fields["sha_after"]:
+        return f"unchanged, {after}"
+    return f"{_lines(fields['line_delta'], '+d')}, {fields['sha_before'][:SHORT_SHA]}→{after}"
+
+
+def _lines(count: int, spec: str = "d") -> str:
+    return f"{count:{spec}} line{'' if abs(count) == 1 else 's'}"
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if len(args) == 2 and args[0] == "show":
+        key = os.path.abspath(args[1])
+        print(json.dumps({"cached": _load().get(key), "current": fingerprint(key)}, indent=2))
+    else:
+        print("Usage: mentu_fingerprint.py show PATH", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
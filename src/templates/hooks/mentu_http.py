@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu HTTP - Shared Mentu API client for the task hooks.
+
+Every hook used to carry its own copy of `call_mentu`, opening a new
+urllib connection (and TLS handshake) per operation and waiting up to 30 s
+on a dead proxy. This module is the one copy:
+
+- Connections are kept alive and reused for every call in the process.
+- A circuit breaker, shared by all hook processes through
+  `.claude/mentu_http.breaker.json`, opens after MENTU_HTTP_FAILURES
+  consecutive failures. While it is open, calls fail at once instead of
+  waiting on the network. After MENTU_HTTP_COOLDOWN seconds one trial call
+  is let through.
+- MENTU_HTTP_TIMEOUT and MENTU_HTTP_CONNECT_TIMEOUT bound each call.
+- Each call's latency is kept in `CALLS` (path, status, seconds) and
+  recorded as the hook run's "api" phase (see mentu_metrics).
+
+    from mentu_http import call_mentu, call_mentu_batch, new_id
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import sys
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    from mentu_metrics import phase
+except ImportError:  # Hook installed without the shared modules
+    from contextlib import nullcontext as phase
+
+MENTU_API = os.environ.get("MENTU_API_URL", "https://mentu-proxy.affihub.workers.dev")
+MENTU_TOKEN = os.environ.get("MENTU_PROXY_TOKEN", "")
+WORKSPACE_ID = os.environ.get("MENTU_WORKSPACE_ID", "")
+
+TIMEOUT = float(os.environ.get("MENTU_HTTP_TIMEOUT", "10"))
+CONNECT_TIMEOUT = float(os.environ.get("MENTU_HTTP_CONNECT_TIMEOUT", "3"))
+BREAKER_FAILURES = int(os.environ.get("MENTU_HTTP_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.environ.get("MENTU_HTTP_COOLDOWN", "30"))
+BREAKER_FILE = Path(".claude/mentu_http.breaker.json")
+
+# (path, status or None, seconds) for recent calls in this process
+CALLS: deque = deque(maxlen=256)
+
+
+class HttpError(Exception):
+    """A failed API call. status is None for network errors and an open circuit."""
+
+    def __init__(self, message: str, status: Optional[int] = None, body: Optional[dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.body = body or {}
+
+
+class CircuitOpen(HttpError):
+    """The API failed repeatedly; calls are short-circuited for a while."""
+
+
+# ─── Circuit breaker ─────────────────────────────────────────────────────────
+
+class Breaker:
+    """Consecutive-failure circuit breaker persisted across hook processes."""
+
+    def __init__(self, api: str, path: Path = BREAKER_FILE, failures: int = BREAKER_FAILURES,
+                 cooldown: float = BREAKER_COOLDOWN):
+        self.api = api
+        self.path = path
+        self.threshold = failures
+        self.cooldown = cooldown
+
+    def _closed(self) -> dict:
+        return {"api": self.api, "failures": 0, "opened_at": None}
+
+    def _load(self) -> dict:
+        try:
+            state = json.loads(self.path.read_text())
+            if isinstance(state, dict) and state.get("api") == self.api:
+                return state
+        except (OSError, ValueError):
+            pass
+        return self._closed()  # No state yet, or it was kept for another API URL
+
+    def _save(self, state: dict) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def check(self) -> None:
+        """Raise CircuitOpen while the breaker is open and cooling down."""
+        state = self._load()
+        opened_at = state.get("opened_at")
+        if opened_at is None:
+            return
+        remaining = opened_at + self.cooldown - time.time()
+        if remaining > 0:
+            raise CircuitOpen(f"Mentu API unavailable, retrying in {remaining:.0f}s")
+        # Half-open: let this call through as the trial, hold the others off
+        state["opened_at"] = time.time()
+        self._save(state)
+
+    def success(self) -> None:
+        if self._load() != self._closed():
+            self._save(self._closed())
+
+    def failure(self) -> None:
+        state = self._load()
+        state["failures"] = state.get("failures", 0) + 1
+        if state["failures"] >= self.threshold:
+            state["opened_at"] = time.time()
+        self._save(state)
+
+
+# ─── Client ──────────────────────────────────────────────────────────────────
+
+class MentuClient:
+    """Keep-alive client for one Mentu API base URL."""
+
+    def __init__(self, base_url: str = MENTU_API, token: str = MENTU_TOKEN,
+                 timeout: float = TIMEOUT, connect_timeout: float = CONNECT_TIMEOUT,
+                 breaker: Optional[Breaker] = None):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname or ""
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.breaker = breaker or Breaker(base_url)
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=self.connect_timeout)
+            conn.connect()
+            conn.sock.settimeout(self.timeout)
+            # Headers and body go out in separate writes; don't let Nagle hold
+            # the body back for the peer's delayed ACK on a reused connection
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.conn = conn
+        return self.conn
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _send(self, path: str, data: bytes) -> tuple:
+        headers = {"X-Proxy-Token": self.token, "Content-Type": "application/json"}
+        reused = self.conn is not None
+        try:
+            conn = self._connect()
+            conn.request("POST", self.prefix + path, body=data, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            self.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection before reading
+            # our request; send it again on a fresh one
+            conn = self._connect()
+            conn.request("POST", self.prefix + path, body=data, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+
+    def post(self, path: str, body: dict) -> dict:
+        """POST JSON and return the decoded response. Raises HttpError."""
+        self.breaker.check()
+        started = time.perf_counter()
+        try:
+            with phase("api"):
+                status, raw = self._send(path, json.dumps(body).encode("utf-8"))
+        except (OSError, http.client.HTTPException) as e:
+            self.close()
+            CALLS.append((path, None, time.perf_counter() - started))
+            self.breaker.failure()
+            raise HttpError(str(e) or type(e).__name__) from e
+        CALLS.append((path, status, time.perf_counter() - started))
+
+        try:
+            decoded = json.loads(raw.decode("utf-8") or "{}")
+        except ValueError:
+            decoded = {}
+        payload = decoded if isinstance(decoded, dict) else {}
+
+        if status >= 500:
+            self.breaker.failure()
+        else:
+            self.breaker.success()  # The API is up, even if it refused the request
+        if status >= 400:
+            message = payload.get("message") or raw.decode("utf-8", errors="replace")[:200]
+            raise HttpError(f"{status} - {message}", status, payload)
+        return payload
+
+
+_client: Optional[MentuClient] = None
+
+
+def client() -> MentuClient:
+    """The process-wide client (one pooled connection per hook process)."""
+    global _client
+    if _client is None:
+        _client = MentuClient()
+    return _client
+
+
+# ─── Hook helpers ────────────────────────────────────────────────────────────
+
+def new_id(prefix: str) -> str:
+    """Client-generated ID in Mentu's {prefix}_{8-hex} format."""
+    return f"{prefix}_{uuid.uuid4().hex[:8]}"
+
+
+def call_mentu(operation: dict) -> dict:
+    """Call Mentu API. Returns the created operation, or {} on failure."""
+    if not MENTU_TOKEN:
+        print("[Mentu] Warning: MENTU_PROXY_TOKEN not set", file=sys.stderr)
+        return {}
+    try:
+        return client().post("/ops", {"workspace_id": WORKSPACE_ID, **operation})
+    except HttpError as e:
+        print(f"[Mentu] API error: {e}", file=sys.stderr)
+        return {}
+
+
+def call_mentu_batch(operations: list) -> list:
+    """
+    Apply dependent operations in one request (POST /ops/batch).
+
+    Operations carry client-generated IDs (see new_id), so later ones can
+    reference earlier ones without a round trip in between; the batch is
+    applied atomically. If the API has no batch endpoint, the operations
+    are sent one at a time instead. Returns the created operations, which
+    is shorter than the input if any failed.
+
+    With mentu_spool installed the operations are queued on disk and
+    delivered in the background; they are returned as queued.
+    """
+    if not MENTU_TOKEN:
+        print("[Mentu] Warning: MENTU_PROXY_TOKEN not set", file=sys.stderr)
+        return []
+
+    try:
+        import mentu_spool
+    except ImportError:  # Hook installed without the shared modules
+        mentu_spool = None
+    if mentu_spool is not None and mentu_spool.enabled():
+        try:
+            with phase("spool"):
+                mentu_spool.submit(operations, WORKSPACE_ID)
+            return operations
+        except OSError as e:
+            print(f"[Mentu] Spool unavailable ({e}), sending directly", file=sys.stderr)
+
+    try:
+        return client().post("/ops/batch", {"workspace_id": WORKSPACE_ID, "ops": operations}).get("ops", [])
+    except HttpError as e:
+        if e.status not in (404, 405) or e.body.get("error"):
+            print(f"[Mentu] API error: {e}", file=sys.stderr)
+            return []
+
+    # No batch endpoint: one call per op, mapping our IDs to the ones assigned
+    assigned = {}
+    results = []
+    for operation in operations:
+        payload = {
+            key: assigned.get(value, value) if isinstance(value, str) else value
+            for key, value in operation.get("payload", {}).items()
+        }
+        result = call_mentu({**operation, "payload": payload})
+        if not result.get("id"):
+            break
+        assigned[operation.get("id")] = result["id"]
+        results.append(result)
+    return results
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Ledger Writer - Append operations to .mentu/ledger.jsonl from Python.
+
+Hooks only need to append a capture, annotate or claim line; starting the
+Node CLI for that costs far more than the write. This module produces the
+same records the CLI does (`mem_`/`cmt_`/`op_` + 8 hex IDs, millisecond UTC
+timestamps, compact JSON) and appends them under the CLI's `.mentu/.lock`.
+
+Claims and annotations get the same checks as `mentu claim` and
+`mentu annotate`, made under the lock against the ledger as it stands: a
+claim needs an existing commitment that is not closed or owned by another
+actor, an annotation an existing memory or commitment. A failed check
+raises Rejected (a ValueError), so the one-shot helpers return None and
+hooks fall back to the CLI, which reports the error.
+
+Several operations can be batched into one locked write and one fsync:
+
+    with mentu_ledger.batch() as ops:
+        mem_id = ops.capture("Modified: src/app.ts", kind="evidence", actor=actor)
+        ops.annotate(cmt_id, f"Evidence: {mem_id}", kind="evidence", actor=actor)
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+LEDGER_FILE = "ledger.jsonl"
+LOCK_FILE = ".lock"
+LOCK_TIMEOUT = 2.0
+# A lock without a readable PID is stale once this old (its owner may not
+# have written the PID yet)
+LOCK_GRACE = 1.0
+
+
+# ─── Workspace ───────────────────────────────────────────────────────────────
+
+def find_workspace(start: str | None = None) -> Path | None:
+    """Walk up from start (default cwd) to the directory containing .mentu/."""
+    directory = Path(start or os.getcwd()).resolve()
+    for candidate in (directory, *directory.parents):
+        if (candidate / ".mentu").is_dir():
+            return candidate
+    return None
+
+
+def ledger_path(workspace: Path) -> Path:
+    return workspace / ".mentu" / LEDGER_FILE
+
+
+def workspace_name(workspace: Path) -> str:
+    """Workspace name from .mentu/config.yaml, else the directory name."""
+    config = workspace / ".mentu" / "config.yaml"
+    try:
+        for line in config.read_text().splitlines():
+            if line.startswith("workspace:"):
+                value = line.split(":", 1)[1].strip().strip("'\"")
+                if value:
+                    return value
+    except OSError:
+        pass
+    return workspace.name
+
+
+def generate_id(prefix: str) -> str:
+    """ID in the CLI's {prefix}_{8-hex} format."""
+    return f"{prefix}_{os.urandom(4).hex()}"
+
+
+def timestamp() -> str:
+    """ISO 8601 UTC timestamp with milliseconds, as the CLI writes it."""
+    now = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + f".{int(now % 1 * 1000):03d}Z"
+
+
+# ─── Locking ─────────────────────────────────────────────────────────────────
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_lock(lock: Path) -> tuple:
+    """(pid or None, stat) of the lock file, from one open file."""
+    with open(lock, "rb") as f:
+        st = os.fstat(f.fileno())
+        text = f.read(32).strip()
+    try:
+        return int(text), st
+    except ValueError:
+        return None, st
+
+
+def _reclaim(lock: Path, st: os.stat_result) -> None:
+    """
+    Remove a stale lock file, but only the one that was judged stale.
+
+    It is renamed aside first (atomic); if what got renamed is a different
+    file, another process replaced the stale lock in the meantime, so it
+    is put back.
+    """
+    aside = lock.with_name(f"{lock.name}.{os.getpid()}.{os.urandom(4).hex()}")
+    try:
+        os.rename(lock, aside)
+    except FileNotFoundError:
+        return
+    try:
+        if os.stat(aside).st_ino != st.st_ino:
+            try:
+                os.link(aside, lock)
+            except FileExistsError:
+                pass
+    finally:
+        aside.unlink(missing_ok=True)
+
+
+def acquire_lock(workspace: Path, timeout: float = LOCK_TIMEOUT) -> Path:
+    """
+    Take the CLI's .mentu/.lock (a file holding the owner PID).
+
+    Waits for a live owner up to timeout. Locks whose owner is gone, or
+    that hold no PID after LOCK_GRACE seconds (as the CLI treats them),
+    are stale and taken over.
+    """
+    lock = workspace / ".mentu" / LOCK_FILE
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            try:
+                pid, st = _read_lock(lock)
+            except FileNotFoundError:
+                continue  # Released meanwhile
+            except OSError:
+                pid, st = None, None
+            if st is not None:
+                if pid is not None and pid > 0:
+                    stale = not _pid_running(pid)
+                else:
+                    stale = time.time() - st.st_mtime > LOCK_GRACE
+                if stale:
+                    _reclaim(lock, st)
+                    continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Workspace locked by process {pid}")
+            time.sleep(0.005)
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return lock
+
+
+def release_lock(lock: Path) -> None:
+    try:
+        lock.unlink()
+    except OSError:
+        pass
+
+
+# ─── Checks ──────────────────────────────────────────────────────────────────
+
+class Rejected(ValueError):
+    """The CLI would refuse this operation."""
+
+
+def _mentions(workspace: Path, record_id: str) -> list:
+    """Ledger records whose line mentions record_id; other lines are not parsed."""
+    data = ledger_path(workspace).read_bytes()
+    needle = json.dumps(record_id).encode()
+    records = []
+    pos = data.find(needle)
+    while pos != -1:
+        start = data.rfind(b"\n", 0, pos) + 1
+        end = data.find(b"\n", pos)
+        end = len(data) if end == -1 else end
+        try:
+            records.append(json.loads(data[start:end]))
+        except ValueError:
+            pass
+        pos = data.find(needle, end)
+    return records
+
+
+def commitment_state(ops: list, cmt_id: str) -> tuple:
+    """(exists, state, owner) of a commitment, folded as computeCommitmentState does."""
+    exists, state, owner = False, "open", None
+    for op in ops:
+        kind = op.get("op")
+        if kind == "commit" and op.get("id") == cmt_id:
+            exists = True
+        elif (op.get("payload") or {}).get("commitment") != cmt_id:
+            continue
+        elif kind == "claim":
+            state, owner = "claimed", op.get("actor")
+        elif kind == "release":
+            state, owner = "open", None
+        elif kind == "submit":
+            state = "in_review"
+        elif kind == "approve":
+            state, owner = "closed", None
+        elif kind == "reopen":
+            state = "reopened"
+        elif kind == "close":
+            state = "duplicate" if op["payload"].get("duplicate_of") else "closed"
+            owner = None
+    return exists, state, owner
+
+
+def _is_target(record: dict | None, target: str) -> bool:
+    return record is not None and record.get("id") == target and record.get("op") in ("capture", "commit")
+
+
+def _target_exists(workspace: Path, target: str) -> bool:
+    """Whether a memory or commitment with this ID is in the ledger."""
+    try:
+        import mentu_index  # Imports this module; one probe instead of a scan
+    except ImportError:  # Hook installed without the shared modules
+        mentu_index = None
+    if mentu_index is not None:
+        index = mentu_index.open_index(workspace)
+        if index is not None:
+            with index:
+                if _is_target(index.get(target), target):
+                    return True
+    # Not indexed (or a 16-byte key collision): confirm with a scan
+    return any(_is_target(r, target) for r in _mentions(workspace, target))
+
+
+def check(workspace: Path, records: list) -> None:
+    """
+    Raise Rejected for any claim or annotation `mentu claim` / `mentu annotate`
+    would refuse. Earlier records in the same list count as already written.
+    Call with the ledger lock held.
+    """
+    for i, record in enumerate(records):
+        payload = record["payload"]
+        if record["op"] == "claim":
+            cmt_id = payload["commitment"]
+            exists, state, owner = commitment_state(_mentions(workspace, cmt_id) + records[:i], cmt_id)
+            if not exists:
+                raise Rejected(f"Commitment {cmt_id} does not exist")
+            if state == "closed":
+                raise Rejected(f"Commitment {cmt_id} is closed")
+            if owner and owner != record["actor"]:
+                raise Rejected(f"Commitment {cmt_id} is claimed by {owner}")
+        elif record["op"] == "annotate":
+            target = payload["target"]
+            if not (any(_is_target(r, target) for r in records[:i]) or _target_exists(workspace, target)):
+                raise Rejected(f"Target {target} does not exist")
+
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+
+def make_op(op: str, actor: str, payload: dict, workspace: str, prefix: str = "op") -> dict:
+    """Build a ledger record with a fresh ID and timestamp."""
+    return {
+        "id": generate_id(prefix),
+        "op": op,
+        "ts": timestamp(),
+        "actor": actor,
+        "workspace": workspace,
+        "payload": payload,
+    }
+
+
+def encode(record: dict) -> str:
+    """Serialize a record as one ledger line (matches JSON.stringify)."""
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def append_records(workspace: Path, records: list, fsync: bool = True, handle=None,
+                   validate: bool = False) -> None:
+    """
+    Append records to the ledger in a single locked write.
+
+    Args:
+        workspace: Directory containing .mentu/
+        records: Ledger records (see make_op)
+        fsync: Flush to disk before releasing the lock
+        handle: Already-open ledger file (append mode) to reuse
+        validate: Run check() under the lock first; nothing is written if it raises
+    """
+    if not records:
+        return
+    data = "".join(encode(r) for r in records)
+    lock = acquire_lock(workspace)
+    try:
+        if validate:
+            check(workspace, records)
+        if handle is None:
+            with open(ledger_path(workspace), "a", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+        else:
+            handle.write(data)
+            handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+    finally:
+        release_lock(lock)
+
+
+class Batch:
+    """
+    Collects operations and appends them with one write and one fsync.
+
+    Claims and annotations are checked when flushed; if one is rejected,
+    nothing in the batch is written.
+    """
+
+    def __init__(self, workspace: Path, fsync: bool = True, handle=None,
+                 name: str | None = None):
+        self.workspace = workspace
+        self.name = name or workspace_name(workspace)
+        self.fsync = fsync
+        self.handle = handle
+        self.records: list = []
+
+    def add(self, op: str, actor: str, payload: dict, prefix: str = "op") -> str:
+        record = make_op(op, actor, payload, self.name, prefix)
+        self.records.append(record)
+        return record["id"]
+
+    def capture(
+        self,
+        body: str,
+        kind: str | None = None,
+        actor: str = "agent:claude-code",
+        meta: dict | None = None,
+        refs: list | None = None,
+    ) -> str:
+        body = body.strip()
+        if not body:
+            raise ValueError("Body cannot be empty")
+        payload: dict = {"body": body}
+        if kind:
+            payload["kind"] = kind
+        # Same auto-link as `mentu capture`
+        if not refs and os.environ.get("RALPH_WORKFLOW_STEP_CMT"):
+            refs = [os.environ["RALPH_WORKFLOW_STEP_CMT"]]
+        if refs:
+            payload["refs"] = refs
+        if meta:
+            payload["meta"] = meta
+        return self.add("capture", actor, payload, "mem")
+
+    def annotate(self, target: str, body: str, kind: str | None = None,
+                 actor: str = "agent:claude-code") -> str:
+        if not body.strip():
+            raise ValueError("Body cannot be empty")
+        payload: dict = {"target": target, "body": body}
+        if kind:
+            payload["kind"] = kind
+        return self.add("annotate", actor, payload)
+
+    def claim(self, commitment: str, actor: str = "agent:claude-code") -> str:
+        return self.add("claim", actor, {"commitment": commitment})
+
+    def flush(self) -> None:
+        records, self.records = self.records, []
+        validate = any(r["op"] in ("claim", "annotate") for r in records)
+        append_records(self.workspace, records, self.fsync, self.handle, validate)
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+
+def batch(workspace: Path | None = None, fsync: bool = True) -> Batch:
+    """Start a batch for the current workspace. Raises if there is none."""
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        raise FileNotFoundError('No .mentu/ found. Run "mentu init" first.')
+    return Batch(workspace, fsync)
+
+
+# ─── One-shot helpers (return None on failure, like the hook CLI wrappers) ───
+
+def capture(body: str, kind: str | None, actor: str, meta: dict | None = None) -> str | None:
+    """Append a capture. Returns the mem_ ID, or None."""
+    try:
+        with batch() as ops:
+            return ops.capture(body, kind=kind, actor=actor, meta=meta)
+    except (OSError, ValueError):
+        return None
+
+
+def annotate(target: str, body: str, kind: str | None, actor: str) -> str | None:
+    """Append an annotation. Returns the op_ ID, or None."""
+    try:
+        with batch() as ops:
+            return ops.annotate(target, body, kind=kind, actor=actor)
+    except (OSError, ValueError):
+        return None
+
+
+def claim(commitment: str, actor: str) -> str | None:
+    """Append a claim. Returns the op_ ID, or None."""
+    try:
+        with batch() as ops:
+            return ops.claim(commitment, actor=actor)
+    except (OSError, ValueError):
+        return None
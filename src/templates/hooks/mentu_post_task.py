@@ -5,63 +5,26 @@ Called when Claude completes a task. Captures evidence and closes commitment.
 """
 
 import os
-import json
 import sys
 from typing import Optional
-from urllib import request
-from urllib.error import HTTPError
 
-MENTU_API = os.environ.get("MENTU_API_URL", "https://mentu-proxy.affihub.workers.dev")
-MENTU_TOKEN = os.environ.get("MENTU_PROXY_TOKEN", "")
-WORKSPACE_ID = os.environ.get("MENTU_WORKSPACE_ID", "")
-ACTOR = os.environ.get("MENTU_ACTOR", "agent:claude-code")
-
-STATE_FILE = ".claude/mentu_state.json"
-
-
-def call_mentu(operation: dict) -> dict:
-    """Call Mentu API."""
-    if not MENTU_TOKEN:
-        return {}
-
-    data = json.dumps({
-        "workspace_id": WORKSPACE_ID,
-        **operation
-    }).encode("utf-8")
+import mentu_state
+from mentu_http import call_mentu_batch, new_id
+from mentu_metrics import phase, run
 
-    req = request.Request(
-        f"{MENTU_API}/ops",
-        data=data,
-        headers={
-            "X-Proxy-Token": MENTU_TOKEN,
-            "Content-Type": "application/json"
-        },
-        method="POST"
-    )
-
-    try:
-        with request.urlopen(req, timeout=30) as response:
-            return json.loads(response.read().decode("utf-8"))
-    except Exception as e:
-        print(f"[Mentu] Error: {e}", file=sys.stderr)
-        return {}
+ACTOR = os.environ.get("MENTU_ACTOR", "agent:claude-code")
 
 
 def load_active_commitment() -> Optional[dict]:
     """Load active commitment from session state."""
-    try:
-        with open(STATE_FILE) as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return None
+    with phase("state"):
+        return mentu_state.load()
 
 
-def clear_active_commitment() -> None:
-    """Clear active commitment state."""
-    try:
-        os.remove(STATE_FILE)
-    except FileNotFoundError:
-        pass
+def clear_active_commitment(commitment_id: str) -> None:
+    """Clear this session's state, if commitment_id is still its active one."""
+    with phase("state"):
+        mentu_state.clear(commitment=commitment_id)
 
 
 def on_task_complete(summary: str, evidence_details: Optional[dict] = None) -> None:
@@ -89,37 +52,46 @@ def on_task_complete(summary: str, evidence_details: Optional[dict] = None) -> N
         if evidence_details.get("tests_passed"):
             evidence_body += "\nTests: Passing"
 
-    # 2. Capture evidence
-    mem_result = call_mentu({
-        "op": "capture",
-        "actor": actor,
-        "payload": {
-            "body": evidence_body,
-            "kind": "evidence",
-            "meta": evidence_details or {}
+    # 2-3. Capture evidence and close with it, in one request
+    evidence_id = new_id("mem")
+    operations = [
+        {
+            "id": evidence_id,
+            "op": "capture",
+            "actor": actor,
+            "payload": {
+                "body": evidence_body,
+                "kind": "evidence",
+                "meta": evidence_details or {}
+            }
+        },
+        {
+            "id": new_id("op"),
+            "op": "close",
+            "actor": actor,
+            "payload": {
+                "commitment": commitment_id,
+                "evidence": evidence_id
+            }
         }
-    })
+    ]
+    results = call_mentu_batch(operations)
 
-    if not mem_result.get("id"):
+    if len(results) < 1:
         print("[Mentu] Failed to capture evidence", file=sys.stderr)
         return
 
-    evidence_id = mem_result["id"]
+    evidence_id = results[0]["id"]
     print(f"[Mentu] Evidence: {evidence_id}")
-
-    # 3. Close with evidence
-    call_mentu({
-        "op": "close",
-        "actor": actor,
-        "payload": {
-            "commitment": commitment_id,
-            "evidence": evidence_id
-        }
-    })
+    # Without a batch endpoint the close can fail after the capture landed;
+    # keep the commitment active until it is really closed (or spooled)
+    if len(results) < len(operations):
+        print(f"[Mentu] Failed to close {commitment_id}", file=sys.stderr)
+        return
     print(f"[Mentu] Closed: {commitment_id} with {evidence_id}")
 
     # 4. Clear state
-    clear_active_commitment()
+    clear_active_commitment(commitment_id)
 
 
 def on_task_error(error_message: str) -> None:
@@ -134,33 +106,41 @@ def on_task_error(error_message: str) -> None:
     commitment_id = state.get("active_commitment")
     actor = state.get("actor", ACTOR)
 
-    # 1. Annotate with error
-    call_mentu({
-        "op": "annotate",
-        "actor": actor,
-        "payload": {
-            "target": commitment_id,
-            "body": f"Task failed: {error_message}",
-            "kind": "error"
-        }
-    })
-    print(f"[Mentu] Annotated error on {commitment_id}")
-
-    # 2. Release claim
-    call_mentu({
-        "op": "release",
-        "actor": actor,
-        "payload": {
-            "commitment": commitment_id
+    # 1-2. Annotate with error and release claim, in one request
+    operations = [
+        {
+            "id": new_id("op"),
+            "op": "annotate",
+            "actor": actor,
+            "payload": {
+                "target": commitment_id,
+                "body": f"Task failed: {error_message}",
+                "kind": "error"
+            }
+        },
+        {
+            "id": new_id("op"),
+            "op": "release",
+            "actor": actor,
+            "payload": {
+                "commitment": commitment_id
+            }
         }
-    })
+    ]
+    results = call_mentu_batch(operations)
+    if len(results) >= 1:
+        print(f"[Mentu] Annotated error on {commitment_id}")
+    if len(results) < len(operations):
+        print(f"[Mentu] Failed to release {commitment_id}", file=sys.stderr)
+        return
     print(f"[Mentu] Released: {commitment_id}")
 
     # 3. Clear state
-    clear_active_commitment()
+    clear_active_commitment(commitment_id)
 
 
-if __name__ == "__main__":
+def main():
+    """Main hook entry point."""
     # Read from args: complete <summary> OR fail <error_message>
     if len(sys.argv) < 3:
         print("Usage: mentu_post_task.py complete <summary>", file=sys.stderr)
@@ -177,3 +157,8 @@ if __name__ == "__main__":
     else:
         print(f"Unknown action: {action}", file=sys.stderr)
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    with run("post_task"):
+        main()
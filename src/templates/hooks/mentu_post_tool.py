@@ -8,30 +8,61 @@ Mentu PostToolUse Hook - Auto-captures file modifications as evidence.
 
 This hook runs after Edit, Write, or MultiEdit tools are used and
 captures the file modification as a Mentu memory for later use as evidence.
+Repeated edits to the same file are coalesced into one record (see
+mentu_coalesce); the hook also runs at SessionEnd to emit what is pending.
+Each record carries the file's hash and line count before and after (see
+mentu_fingerprint).
 """
 from __future__ import annotations
 
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
 
-EVIDENCE_LOG = Path(".claude/mentu_evidence.json")
+try:
+    import mentu_evidence_log
+    import mentu_hookd
+    import mentu_ledger
+except ImportError:  # Hook installed without the shared modules
+    mentu_evidence_log = mentu_hookd = mentu_ledger = None
 
+try:
+    import mentu_coalesce
+    import mentu_fingerprint
+except ImportError:  # Hook installed without the shared modules
+    mentu_coalesce = mentu_fingerprint = None
 
-def capture_evidence(body: str) -> Optional[str]:
+try:
+    from mentu_metrics import phase, run
+except ImportError:  # Hook installed without the shared modules
+    from contextlib import nullcontext as phase, nullcontext as run
+
+
+def capture_evidence(body: str) -> str | None:
     """Capture a memory as evidence, return ID."""
     actor = os.environ.get("MENTU_ACTOR", "agent:claude-code")
 
+    # Fast path: append to the ledger without starting Node, through the
+    # hook daemon if it is running, else directly
+    if mentu_hookd is not None:
+        with phase("ledger"):
+            mem_id = mentu_hookd.capture(body, "evidence", actor)
+            if mem_id is None:
+                mem_id = mentu_ledger.capture(body, "evidence", actor)
+        if mem_id:
+            return mem_id
+
+    import subprocess
+
     try:
-        result = subprocess.run(
-            ["mentu", "capture", body, "--kind", "evidence", "--actor", actor, "--json"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        with phase("cli"):
+            result = subprocess.run(
+                ["mentu", "capture", body, "--kind", "evidence", "--actor", actor, "--json"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
         if result.returncode != 0:
             return None
 
@@ -41,35 +72,63 @@ def capture_evidence(body: str) -> Optional[str]:
         return None
 
 
-def append_to_evidence_log(mem_id: str, file_path: str, evidence_type: str) -> None:
-    """Store evidence for later use."""
-    log = []
-    if EVIDENCE_LOG.exists():
-        try:
-            log = json.loads(EVIDENCE_LOG.read_text())
-        except Exception:
-            log = []
+def append_to_evidence_log(mem_id: str, file_path: str, evidence_type: str, **extra) -> None:
+    """Store evidence for later use (one O(1) append to the JSONL log)."""
+    if mentu_evidence_log is not None:
+        with phase("log"):
+            mentu_evidence_log.append(mem_id, file_path, evidence_type, **extra)
+        return
+
+    from datetime import datetime, timezone
 
-    log.append({
-        "id": mem_id,
-        "file": file_path,
-        "ts": subprocess.run(["date", "-u", "+%Y-%m-%dT%H:%M:%SZ"],
-                             capture_output=True, text=True).stdout.strip(),
-        "type": evidence_type
-    })
+    log = Path(".claude/mentu_evidence.jsonl")
+    log.parent.mkdir(parents=True, exist_ok=True)
+    with open(log, "a") as f:
+        f.write(json.dumps({
+            "id": mem_id,
+            "file": file_path,
+            "ts": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "type": evidence_type,
+            **extra
+        }) + "\n")
 
-    EVIDENCE_LOG.parent.mkdir(parents=True, exist_ok=True)
-    EVIDENCE_LOG.write_text(json.dumps(log, indent=2))
+
+def emit(group: dict) -> None:
+    """Capture one evidence record for an edit, or a coalesced group of edits."""
+    file_path = group["file"]
+    evidence_type = group["type"]
+    verb = "Created" if evidence_type == "file_created" else "Modified"
+    suffix = mentu_coalesce.summary(group) if mentu_coalesce is not None else ""
+    with phase("fingerprint"):
+        fields = mentu_fingerprint.change(file_path) if mentu_fingerprint is not None else {}
+    stats = f" [{mentu_fingerprint.describe(fields)}]" if fields else ""
+
+    mem_id = capture_evidence(f"{verb}: {file_path}{suffix}{stats}")
+
+    if mem_id:
+        extra = mentu_coalesce.log_fields(group) if mentu_coalesce is not None else {}
+        extra.update(fields)
+        append_to_evidence_log(mem_id, file_path, evidence_type, **extra)
+        sys.stderr.write(f"[Mentu] Evidence captured: {mem_id} ({evidence_type}{suffix})\n")
 
 
 def main():
     """Main hook entry point."""
     try:
-        input_data = json.load(sys.stdin)
+        with phase("stdin"):
+            input_data = json.load(sys.stdin)
     except json.JSONDecodeError:
         print(json.dumps({}))
         sys.exit(0)
 
+    # Session end: emit edits still waiting for their window to close
+    if input_data.get("hook_event_name") == "SessionEnd":
+        if mentu_coalesce is not None:
+            for group in mentu_coalesce.take(everything=True, session=input_data.get("session_id")):
+                emit(group)
+        print(json.dumps({}))
+        sys.exit(0)
+
     tool_name = input_data.get("tool_name", "")
     tool_input = input_data.get("tool_input", {})
 
@@ -83,28 +142,29 @@ def main():
         print(json.dumps({}))
         sys.exit(0)
 
-    # Build evidence body and type
-    if tool_name == "Write":
-        body = f"Created: {file_path}"
-        evidence_type = "file_created"
-    else:
-        body = f"Modified: {file_path}"
-        evidence_type = "file_modified"
-
-    # Capture as evidence memory
-    mem_id = capture_evidence(body)
+    evidence_type = "file_created" if tool_name == "Write" else "file_modified"
 
-    if mem_id:
-        append_to_evidence_log(mem_id, file_path, evidence_type)
-        sys.stderr.write(f"[Mentu] Evidence captured: {mem_id} ({evidence_type})\n")
+    if mentu_coalesce is not None and mentu_coalesce.enabled():
+        # Record the edit; capture only groups whose window has closed
+        with phase("coalesce"):
+            groups = mentu_coalesce.record(file_path, evidence_type, session=input_data.get("session_id"))
+        for group in groups:
+            emit(group)
+        mentu_coalesce.ensure_flusher(__file__)
+    else:
+        emit({"file": file_path, "type": evidence_type, "count": 1})
 
     print(json.dumps({}))
     sys.exit(0)
 
 
 if __name__ == "__main__":
+    if mentu_coalesce is not None and mentu_coalesce.FLUSH_ARG in sys.argv:
+        mentu_coalesce.run(emit)
+        sys.exit(0)
     try:
-        main()
+        with run("post_tool"):
+            main()
     except Exception as e:
         sys.stderr.write(f"PostToolUse hook error: {e}\n")
         print(json.dumps({}))
@@ -5,63 +5,26 @@ Called when PRs are created or merged.
 """
 
 import os
-import json
 import sys
 from typing import Optional
-from urllib import request
 
-MENTU_API = os.environ.get("MENTU_API_URL", "https://mentu-proxy.affihub.workers.dev")
-MENTU_TOKEN = os.environ.get("MENTU_PROXY_TOKEN", "")
-WORKSPACE_ID = os.environ.get("MENTU_WORKSPACE_ID", "")
-ACTOR = os.environ.get("MENTU_ACTOR", "agent:claude-code")
-
-STATE_FILE = ".claude/mentu_state.json"
-
-
-def call_mentu(operation: dict) -> dict:
-    """Call Mentu API."""
-    if not MENTU_TOKEN:
-        return {}
-
-    data = json.dumps({
-        "workspace_id": WORKSPACE_ID,
-        **operation
-    }).encode("utf-8")
-
-    req = request.Request(
-        f"{MENTU_API}/ops",
-        data=data,
-        headers={
-            "X-Proxy-Token": MENTU_TOKEN,
-            "Content-Type": "application/json"
-        },
-        method="POST"
-    )
+import mentu_state
+from mentu_http import call_mentu_batch, new_id
+from mentu_metrics import phase, run
 
-    try:
-        with request.urlopen(req, timeout=30) as response:
-            return json.loads(response.read().decode("utf-8"))
-    except Exception as e:
-        print(f"[Mentu] Error: {e}", file=sys.stderr)
-        return {}
+ACTOR = os.environ.get("MENTU_ACTOR", "agent:claude-code")
 
 
 def load_active_commitment() -> Optional[str]:
     """Load active commitment from session state."""
-    try:
-        with open(STATE_FILE) as f:
-            state = json.load(f)
-            return state.get("active_commitment")
-    except FileNotFoundError:
-        return None
+    with phase("state"):
+        return mentu_state.active_commitment() or None
 
 
-def clear_active_commitment() -> None:
-    """Clear active commitment state."""
-    try:
-        os.remove(STATE_FILE)
-    except FileNotFoundError:
-        pass
+def clear_active_commitment(commitment_id: str) -> None:
+    """Clear this session's state, if commitment_id is still its active one."""
+    with phase("state"):
+        mentu_state.clear(commitment=commitment_id)
 
 
 def on_pr_created(pr_number: int, pr_url: str, pr_title: str) -> None:
@@ -70,7 +33,8 @@ def on_pr_created(pr_number: int, pr_url: str, pr_title: str) -> None:
     if not commitment_id:
         return
 
-    call_mentu({
+    call_mentu_batch([{
+        "id": new_id("op"),
         "op": "annotate",
         "actor": ACTOR,
         "payload": {
@@ -82,7 +46,7 @@ def on_pr_created(pr_number: int, pr_url: str, pr_title: str) -> None:
                 "pr_url": pr_url
             }
         }
-    })
+    }])
     print(f"[Mentu] Linked PR #{pr_number} to {commitment_id}")
 
 
@@ -92,43 +56,52 @@ def on_pr_merged(pr_number: int, pr_url: str, merge_sha: str) -> None:
     if not commitment_id:
         return
 
-    # Capture PR merge as evidence
-    mem_result = call_mentu({
-        "op": "capture",
-        "actor": ACTOR,
-        "payload": {
-            "body": f"PR #{pr_number} merged\nCommit: {merge_sha}\nURL: {pr_url}",
-            "kind": "evidence",
-            "meta": {
-                "type": "pr_merged",
-                "pr_number": pr_number,
-                "pr_url": pr_url,
-                "merge_sha": merge_sha
+    # Capture PR merge as evidence and auto-close with it, in one request
+    evidence_id = new_id("mem")
+    operations = [
+        {
+            "id": evidence_id,
+            "op": "capture",
+            "actor": ACTOR,
+            "payload": {
+                "body": f"PR #{pr_number} merged\nCommit: {merge_sha}\nURL: {pr_url}",
+                "kind": "evidence",
+                "meta": {
+                    "type": "pr_merged",
+                    "pr_number": pr_number,
+                    "pr_url": pr_url,
+                    "merge_sha": merge_sha
+                }
+            }
+        },
+        {
+            "id": new_id("op"),
+            "op": "close",
+            "actor": ACTOR,
+            "payload": {
+                "commitment": commitment_id,
+                "evidence": evidence_id
             }
         }
-    })
+    ]
+    results = call_mentu_batch(operations)
 
-    if not mem_result.get("id"):
+    # Without a batch endpoint the capture can land and the close fail;
+    # keep the commitment active until it is really closed (or spooled)
+    if not results:
         print("[Mentu] Failed to capture PR evidence", file=sys.stderr)
         return
+    if len(results) < len(operations):
+        print(f"[Mentu] Captured PR evidence {results[0].get('id')} but failed to close {commitment_id}",
+              file=sys.stderr)
+        return
 
-    evidence_id = mem_result["id"]
-
-    # Auto-close commitment with this evidence
-    call_mentu({
-        "op": "close",
-        "actor": ACTOR,
-        "payload": {
-            "commitment": commitment_id,
-            "evidence": evidence_id
-        }
-    })
-
-    clear_active_commitment()
+    clear_active_commitment(commitment_id)
     print(f"[Mentu] Closed {commitment_id} - PR #{pr_number} merged")
 
 
-if __name__ == "__main__":
+def main():
+    """Main hook entry point."""
     # Usage: mentu_pr_events.py created <number> <url> <title>
     #        mentu_pr_events.py merged <number> <url> <sha>
     if len(sys.argv) < 5:
@@ -145,3 +118,8 @@ if __name__ == "__main__":
         on_pr_created(pr_number, pr_url, extra)
     elif event == "merged":
         on_pr_merged(pr_number, pr_url, extra)
+
+
+if __name__ == "__main__":
+    with run("pr_events"):
+        main()
@@ -17,18 +17,29 @@ import subprocess
 import sys
 from typing import List, Dict
 
+try:
+    import mentu_state
+except ImportError:  # Hook installed without the shared modules
+    mentu_state = None
+
+try:
+    from mentu_metrics import phase, run
+except ImportError:  # Hook installed without the shared modules
+    from contextlib import nullcontext as phase, nullcontext as run
+
 
 def get_claimed_commitments() -> List[Dict]:
     """Get commitments claimed by this agent."""
     actor = os.environ.get("MENTU_ACTOR", "agent:claude-code")
 
     try:
-        result = subprocess.run(
-            ["mentu", "list", "commitments", "--state", "claimed", "--json"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        with phase("cli"):
+            result = subprocess.run(
+                ["mentu", "list", "commitments", "--state", "claimed", "--json"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
         if result.returncode != 0:
             return []
 
@@ -41,6 +52,17 @@ def get_claimed_commitments() -> List[Dict]:
 
 def main():
     """Main hook entry point - returns context to inject."""
+    try:
+        with phase("stdin"):
+            hook_input = json.load(sys.stdin)
+    except ValueError:
+        hook_input = {}
+
+    # Key the task hooks' state by this session
+    if mentu_state is not None:
+        with phase("state"):
+            mentu_state.export_session(hook_input.get("session_id"))
+
     claimed = get_claimed_commitments()
 
     if not claimed:
@@ -66,7 +88,8 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        with run("session_start"):
+            main()
     except Exception as e:
         sys.stderr.write(f"SessionStart hook error: {e}\n")
         print(json.dumps({}))
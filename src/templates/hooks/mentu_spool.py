@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Hook Spool - Durable write-ahead queue for Mentu API operations.
+
+The task hooks used to POST each operation to MENTU_API_URL and wait for
+it, up to 30 s, dropping the operation if the API never answered. They now
+append operations to `.claude/mentu_spool.jsonl` (one batch per line) and
+return at once:
+
+    {"ts": "2026-...Z", "workspace_id": "...", "ops": [{"id": "mem_...", ...}]}
+
+A background flusher, started on demand and exiting once the spool is
+drained, delivers entries in order through POST /ops/batch. It combines
+consecutive entries into one request and retries with backoff until the
+API accepts them. Operations carry client-generated IDs, so a retry of an
+already-applied batch is recognized (E_DUPLICATE_ID) rather than repeated;
+a combined request that hits one is split and each entry redelivered on
+its own, so entries after the applied one are not lost.
+Entries the API rejects outright are moved to `.claude/mentu_spool.dead.jsonl`
+instead of blocking the queue.
+
+Set MENTU_SPOOL=0 to send operations synchronously instead.
+
+Usage:
+    python3 mentu_spool.py status
+    python3 mentu_spool.py flush      # deliver now, in the foreground
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from mentu_http import HttpError, client
+
+SPOOL_FILE = Path(".claude/mentu_spool.jsonl")
+STATE_FILE = Path(".claude/mentu_spool.state.json")
+DEAD_FILE = Path(".claude/mentu_spool.dead.jsonl")
+LOCK_FILE = Path(".claude/mentu_spool.lock")
+
+MAX_BATCH_OPS = 100
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+# A flusher that has failed this long exits; the next hook starts another
+GIVE_UP_AFTER = 3600.0
+
+# Statuses that mean "try again later"; any other 4xx rejects the entry
+RETRY_STATUSES = (401, 403, 408, 425, 429)
+
+
+def enabled() -> bool:
+    return os.environ.get("MENTU_SPOOL", "1") != "0"
+
+
+def utc_timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ─── Queue ───────────────────────────────────────────────────────────────────
+
+def _append(path: Path, entry: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)  # Excludes compaction, see compact()
+        os.write(fd, (json.dumps(entry) + "\n").encode("utf-8"))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def submit(operations: list, workspace_id: str) -> None:
+    """Queue operations for delivery and make sure a flusher is running."""
+    _append(SPOOL_FILE, {"ts": utc_timestamp(), "workspace_id": workspace_id, "ops": operations})
+    ensure_flusher()
+
+
+def load_state() -> dict:
+    try:
+        state = json.loads(STATE_FILE.read_text())
+        if isinstance(state, dict):
+            return state
+    except (OSError, ValueError):
+        pass
+    return {"offset": 0, "assigned": {}}
+
+
+def save_state(state: dict) -> None:
+    """Write delivery state atomically (tmp + fsync + rename)."""
+    tmp = STATE_FILE.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, STATE_FILE)
+
+
+def pending(offset: int) -> list:
+    """(entry, end_offset) pairs for complete lines after offset."""
+    try:
+        with open(SPOOL_FILE, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if offset > size:
+                offset = 0  # Compacted after the state was saved
+            f.seek(offset)
+            data = f.read(size - offset)
+    except OSError:
+        return []
+
+    entries = []
+    position = offset
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break  # Still being written
+        position += len(line)
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # Torn write from a crashed hook
+        if isinstance(entry, dict) and entry.get("ops"):
+            entries.append((entry, position))
+    return entries
+
+
+def compact(state: dict) -> None:
+    """Truncate a fully delivered spool (appenders hold the same flock)."""
+    try:
+        fd = os.open(SPOOL_FILE, os.O_RDWR)
+    except OSError:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        if os.fstat(fd).st_size == state["offset"]:
+            os.ftruncate(fd, 0)
+            state["offset"] = 0
+            save_state(state)
+    finally:
+        os.close(fd)
+
+
+# ─── Delivery ────────────────────────────────────────────────────────────────
+
+class Rejected(Exception):
+    """The API refused the operations; retrying will not help."""
+
+
+class Duplicate(Exception):
+    """The API has applied (some of) the operations before."""
+
+
+def _rejected(e: HttpError) -> bool:
+    """Network errors, an open circuit, 5xx and RETRY_STATUSES are retried."""
+    return e.status is not None and e.status < 500 and e.status not in RETRY_STATUSES
+
+
+def deliver(ops: list, workspace_id: str, assigned: dict) -> None:
+    """
+    Deliver one batch. Raises Rejected, Duplicate, or HttpError to retry.
+
+    `assigned` maps our IDs to the ones an API without batch support
+    assigned, so later operations can still reference earlier ones.
+    """
+    try:
+        client().post("/ops/batch", {"workspace_id": workspace_id, "ops": ops})
+        return
+    except HttpError as e:
+        if e.body.get("error") == "E_DUPLICATE_ID":
+            raise Duplicate(str(e)) from e
+        if e.status in (404, 405) and not e.body.get("error"):
+            pass  # No batch endpoint: fall back to one call per op
+        elif _rejected(e):
+            raise Rejected(str(e)) from e
+        else:
+            raise
+
+    for op in ops:
+        if op.get("id") in assigned:
+            continue  # Delivered by an earlier, interrupted attempt
+        payload = {
+            key: assigned.get(value, value) if isinstance(value, str) else value
+            for key, value in op.get("payload", {}).items()
+        }
+        try:
+            result = client().post("/ops", {"workspace_id": workspace_id, **op, "payload": payload})
+        except HttpError as e:
+            if _rejected(e):
+                raise Rejected(str(e)) from e
+            raise
+        if op.get("id") and result.get("id"):
+            assigned[op["id"]] = result["id"]
+
+
+def flush_once(state: dict) -> bool:
+    """
+    Deliver everything currently queued. Returns False if a delivery failed
+    and should be retried later.
+    """
+    entries = pending(state["offset"])
+    isolate = False
+    while entries:
+        # Combine consecutive entries for the same workspace into one request
+        group = [entries[0]]
+        ops = list(entries[0][0]["ops"])
+        workspace_id = entries[0][0].get("workspace_id", "")
+        for entry, end in entries[1:]:
+            if isolate or entry.get("workspace_id", "") != workspace_id or \
+                    len(ops) + len(entry["ops"]) > MAX_BATCH_OPS:
+                break
+            group.append((entry, end))
+            ops.extend(entry["ops"])
+
+        try:
+            deliver(ops, workspace_id, state.setdefault("assigned", {}))
+        except Rejected as e:
+            if len(group) > 1:
+                isolate = True  # Find the entry that was rejected
+                continue
+            _append(DEAD_FILE, {**group[0][0], "error": str(e), "failed_at": utc_timestamp()})
+        except Duplicate:
+            if len(group) > 1:
+                isolate = True  # Only some entries were applied before
+                continue
+            # Applied before; our earlier attempt lost the response
+        except (HttpError, OSError) as e:
+            state["last_error"] = str(e)
+            state["last_attempt"] = utc_timestamp()
+            save_state(state)
+            return False
+
+        isolate = False
+        state["offset"] = group[-1][1]
+        state["last_delivery"] = utc_timestamp()
+        state.pop("last_error", None)
+        # Keep the ID map from growing without bound
+        if len(state.get("assigned", {})) > 1000:
+            state["assigned"] = dict(list(state["assigned"].items())[-500:])
+        save_state(state)
+        entries = entries[len(group):]
+    return True
+
+
+# ─── Flusher ─────────────────────────────────────────────────────────────────
+
+def _try_lock() -> Optional[int]:
+    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def flusher_running() -> bool:
+    fd = _try_lock()
+    if fd is None:
+        return True
+    os.close(fd)
+    return False
+
+
+def ensure_flusher() -> None:
+    """Start a detached flusher unless one is already running."""
+    if flusher_running():
+        return
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "run"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def run() -> None:
+    """Flusher loop: deliver until the spool is empty, backing off on errors."""
+    fd = _try_lock()
+    if fd is None:
+        return  # Another flusher owns the spool
+    backoff = BACKOFF_INITIAL
+    failing_since = None
+    while True:
+        state = load_state()
+        if flush_once(state):
+            compact(state)
+            # Release, then re-check: a hook that appended while we held the
+            # lock saw a running flusher and did not start one
+            os.close(fd)
+            if not pending(load_state()["offset"]):
+                return
+            fd = _try_lock()
+            if fd is None:
+                return
+            backoff = BACKOFF_INITIAL
+            failing_since = None
+            continue
+
+        failing_since = failing_since or time.monotonic()
+        if time.monotonic() - failing_since > GIVE_UP_AFTER:
+            os.close(fd)
+            return
+        time.sleep(backoff)
+        backoff = min(backoff * 2, BACKOFF_MAX)
+
+
+def status() -> dict:
+    """Backlog size and age, dead letters and flusher state."""
+    state = load_state()
+    entries = pending(state.get("offset", 0))
+    oldest = entries[0][0].get("ts") if entries else None
+    age = None
+    if oldest:
+        try:
+            then = datetime.strptime(oldest, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            age = int((datetime.now(timezone.utc) - then).total_seconds())
+        except ValueError:
+            pass
+    try:
+        with open(DEAD_FILE, "rb") as f:
+            dead = sum(1 for _ in f)
+    except OSError:
+        dead = 0
+    return {
+        "pending_batches": len(entries),
+        "pending_ops": sum(len(entry["ops"]) for entry, _ in entries),
+        "oldest": oldest,
+        "age_seconds": age,
+        "dead": dead,
+        "flusher_running": flusher_running(),
+        "last_delivery": state.get("last_delivery"),
+        "last_error": state.get("last_error"),
+    }
+
+
+def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if command == "run":
+        run()
+    elif command == "flush":
+        run()
+        print(json.dumps(status()))
+    elif command == "status":
+        print(json.dumps(status(), indent=2))
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
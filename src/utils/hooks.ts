@@ -0,0 +1,17 @@
+import { spawnSync } from 'child_process';
+
+/**
+ * Byte-compile installed Python hooks into __pycache__/.
+ *
+ * Hooks run on every tool call; precompiling at install means no hook run
+ * pays to compile the shared modules, including when .claude/hooks/ is not
+ * writable at run time. Best-effort: returns false when python3 is missing
+ * or compilation fails, and the hooks then compile on first run as before.
+ */
+export function precompileHooks(hooksDir: string): boolean {
+  const result = spawnSync('python3', ['-m', 'compileall', '-q', hooksDir], {
+    stdio: 'ignore',
+    timeout: 15000,
+  });
+  return result.status === 0;
+}
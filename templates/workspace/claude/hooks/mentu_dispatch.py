@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+Mentu PostToolUse Dispatcher - All Mentu PostToolUse handlers in one process.
+
+Each edit used to start two hook processes (mentu_post_tool.py, then
+mentu_evidence_to_memory.py), each paying interpreter startup and reading
+the hook input and evidence log on its own. This entry point reads the
+input once and runs the handlers in order, passing a shared context:
+
+    {"input": {...}, "groups": [...], "evidence": [{"id": "mem_...", ...}]}
+
+- capture:  record the edit (coalesced) and capture the groups now due
+- annotate: annotate the active commitment with each captured entry
+- sync:     request one push for everything captured
+- bridge:   append the captured entries to .ralph/memories.md (compacted
+            once it outgrows MENTU_MEMORY_MAX_BYTES), without re-reading
+            the evidence log
+- session:  at SessionEnd, mark the session's state as ended
+
+The annotate, sync and bridge handlers do nothing when nothing was captured. Set
+MENTU_HOOK_TIMINGS=1 to print per-handler timings to stderr; they are also
+recorded as phases of the "post_tool" run (see mentu_metrics).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+import mentu_coalesce
+import mentu_evidence_to_memory
+import mentu_metrics
+import mentu_post_tool
+import mentu_state
+
+
+def handle_capture(ctx: dict) -> None:
+    if "groups" not in ctx:
+        ctx["groups"] = mentu_post_tool.due_groups(ctx["input"], __file__)
+    for group in ctx["groups"]:
+        entry = mentu_post_tool.capture_group(group)
+        if entry:
+            ctx["evidence"].append(entry)
+
+
+def handle_annotate(ctx: dict) -> None:
+    for entry in ctx["evidence"]:
+        mentu_post_tool.annotate(entry)
+
+
+def handle_sync(ctx: dict) -> None:
+    if ctx["evidence"]:
+        mentu_post_tool.push()
+
+
+def handle_bridge(ctx: dict) -> None:
+    if ctx["evidence"]:
+        mentu_evidence_to_memory.bridge(entries=ctx["evidence"])
+
+
+def handle_session(ctx: dict) -> None:
+    if ctx["input"].get("hook_event_name") == "SessionEnd":
+        mentu_state.end(ctx["input"].get("session_id"))
+
+
+HANDLERS = (
+    ("capture", handle_capture),
+    ("annotate", handle_annotate),
+    ("sync", handle_sync),
+    ("bridge", handle_bridge),
+    ("session", handle_session),
+)
+
+
+def dispatch(ctx: dict) -> dict:
+    """Run every handler on the context. Returns {handler: milliseconds}."""
+    ctx.setdefault("evidence", [])
+    timings = {}
+    for name, handler in HANDLERS:
+        started = time.perf_counter()
+        try:
+            with mentu_metrics.phase(name):
+                handler(ctx)
+        except Exception as e:
+            # One failing handler must not keep the others from running
+            sys.stderr.write(f"[Mentu] {name} handler error: {e}\n")
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    ctx["timings"] = timings
+    return timings
+
+
+def report(timings: dict) -> None:
+    if os.environ.get("MENTU_HOOK_TIMINGS") == "1":
+        total = sum(timings.values())
+        parts = ", ".join(f"{name} {ms}ms" for name, ms in timings.items())
+        sys.stderr.write(f"[Mentu] PostToolUse {total:.2f}ms ({parts})\n")
+
+
+def main():
+    """Main hook entry point."""
+    try:
+        with mentu_metrics.phase("stdin"):
+            input_data = json.load(sys.stdin)
+    except json.JSONDecodeError:
+        print(json.dumps({}))
+        sys.exit(0)
+
+    report(dispatch({"input": input_data}))
+
+    print(json.dumps({}))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    if mentu_coalesce.FLUSH_ARG in sys.argv:
+        # Coalescing flusher: closed groups go through the same handlers
+        mentu_coalesce.run(lambda group: report(dispatch({"input": {}, "groups": [group]})))
+        sys.exit(0)
+    try:
+        with mentu_metrics.run("post_tool"):
+            main()
+    except Exception as e:
+        sys.stderr.write(f"PostToolUse dispatcher error: {e}\n")
+        print(json.dumps({}))
+        sys.exit(0)
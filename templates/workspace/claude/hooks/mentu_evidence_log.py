@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Evidence Log - Append-only JSONL log of captured evidence.
+
+The PostToolUse hook records every evidence memory it captures here so other
+hooks (stale-session close, the Ralph memory bridge) can find recent
+evidence without querying the ledger. One JSON object per line:
+
+    {"id": "mem_...", "file": "src/app.ts", "ts": "2026-...Z", "type": "file_modified"}
+
+Appends are a single O(1) write; `tail()` reads backwards from the end of
+the file and `read_from()` reads only what was appended after a byte
+offset. The former `.claude/mentu_evidence.json` array is migrated on
+first use.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+EVIDENCE_LOG = Path(".claude/mentu_evidence.jsonl")
+LEGACY_EVIDENCE_LOG = Path(".claude/mentu_evidence.json")
+
+TAIL_BLOCK = 8192
+
+
+def utc_timestamp() -> str:
+    """Second-precision UTC timestamp (same format the log always used)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def migrate() -> None:
+    """
+    Convert the legacy JSON array log to JSONL, once.
+
+    Hooks may migrate concurrently: the JSONL log is only created if it
+    does not exist yet (a hard link of a complete temp file), so a log
+    another hook already created, and maybe appended to, is kept.
+    """
+    if EVIDENCE_LOG.exists() or not LEGACY_EVIDENCE_LOG.exists():
+        return
+    try:
+        entries = json.loads(LEGACY_EVIDENCE_LOG.read_text())
+    except FileNotFoundError:
+        return  # Migrated by another hook meanwhile
+    except (json.JSONDecodeError, OSError):
+        entries = []
+
+    EVIDENCE_LOG.parent.mkdir(parents=True, exist_ok=True)
+    tmp = EVIDENCE_LOG.with_name(f"{EVIDENCE_LOG.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text("".join(json.dumps(e) + "\n" for e in entries if isinstance(e, dict)))
+        os.link(tmp, EVIDENCE_LOG)
+    except FileExistsError:
+        pass
+    finally:
+        tmp.unlink(missing_ok=True)
+    try:
+        LEGACY_EVIDENCE_LOG.rename(LEGACY_EVIDENCE_LOG.with_suffix(".json.migrated"))
+    except FileNotFoundError:
+        pass
+
+
+def append(mem_id: str, file_path: str, evidence_type: str, **extra) -> dict:
+    """
+    Append one evidence entry and return it. The returned entry (not the
+    logged line) also has "log_span": the (start, end) byte offsets of its
+    line, so a reader handed the entry can move a read_from() cursor past it.
+    """
+    migrate()
+    entry = {"id": mem_id, "file": file_path, "ts": utc_timestamp(), "type": evidence_type, **extra}
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    EVIDENCE_LOG.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(EVIDENCE_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+        end = os.lseek(fd, 0, os.SEEK_CUR)  # Just past our write, whoever else appends
+    finally:
+        os.close(fd)
+    entry["log_span"] = (end - len(line), end)
+    return entry
+
+
+def _parse(lines: list) -> list:
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # Torn write from a crashed hook
+    return entries
+
+
+def tail(n: int) -> list:
+    """Last n entries, reading backwards from the end of the file."""
+    migrate()
+    try:
+        with open(EVIDENCE_LOG, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            while position > 0 and data.count(b"\n") <= n:
+                step = min(TAIL_BLOCK, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+    except OSError:
+        return []
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if position > 0:
+        lines = lines[1:]  # First line may be partial
+    return _parse(lines)[-n:]
+
+
+def read_from(offset: int) -> tuple:
+    """
+    Entries appended after a byte offset.
+
+    Returns (entries, new_offset). Only complete lines are consumed, so a
+    line still being written is picked up on the next call. An offset past
+    the end of the file (log replaced or truncated) restarts from 0.
+    """
+    migrate()
+    try:
+        with open(EVIDENCE_LOG, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if offset > size:
+                offset = 0
+            f.seek(offset)
+            data = f.read(size - offset)
+    except OSError:
+        return [], offset
+    end = data.rfind(b"\n") + 1
+    lines = data[:end].decode("utf-8", errors="replace").splitlines()
+    return _parse(lines), offset + end
+
+
+def offset_after(lines: int) -> int:
+    """Byte offset just past the first `lines` lines (for entry-count cursors)."""
+    migrate()
+    offset = 0
+    try:
+        with open(EVIDENCE_LOG, "rb") as f:
+            for _ in range(lines):
+                line = f.readline()
+                if not line:
+                    break
+                offset += len(line)
+    except OSError:
+        return 0
+    return offset
+
+
+def read_all() -> list:
+    """All entries, oldest first."""
+    migrate()
+    try:
+        with open(EVIDENCE_LOG, encoding="utf-8") as f:
+            return _parse(f.readlines())
+    except OSError:
+        return []
@@ -6,92 +6,303 @@
 """
 Mentu Evidence-to-Memory Bridge Hook
 
-Listens for Mentu capture operations (via the evidence log written by
+Listens for Mentu capture operations (via the JSONL evidence log written by
 mentu_post_tool.py) and appends evidence entries to .ralph/memories.md.
 This bridges the Mentu evidence chain into the Ralph memory injection system.
 
 Trigger: PostToolUse (runs after Edit/Write, same as mentu_post_tool.py)
 Flow: File edit -> mentu_post_tool.py captures evidence -> this hook appends to memories
+
+The memories file is injected into agent context, so the Evidence Trail is
+kept to a constant size. Once the file grows past MENTU_MEMORY_MAX_BYTES,
+the trail is compacted: the newest MENTU_MEMORY_RECENT entries stay in
+full, older ones are rolled into one summary line per file, and every
+entry rolled out is appended verbatim to .ralph/memories.archive.md.
+Summaries that still do not fit are dropped, oldest first (their entries
+are in the archive). Everything above the Evidence Trail is left as is.
+
+Entries with a file fingerprint end in its line delta and hashes:
+
+    - `mem_...` | file_modified | `src/app.ts` | 2026-...Z | +12 lines, 1a2b3c4→9f86d0e
 """
 from __future__ import annotations
 
+import fcntl
 import json
 import os
+import re
 import sys
-from datetime import datetime, timezone
 from pathlib import Path
 
-EVIDENCE_LOG = Path(".claude/mentu_evidence.json")
+import mentu_evidence_log
+import mentu_fingerprint
+import mentu_metrics
+
 MEMORY_FILE = Path(".ralph/memories.md")
+MEMORY_ARCHIVE = Path(".ralph/memories.archive.md")
 BRIDGE_STATE = Path(".ralph/.evidence_bridge_cursor")
+BRIDGE_LOCK = Path(".ralph/memories.lock")
+
+TRAIL_MARKER = "## Evidence Trail"
+SUMMARY_HEADER = "### Earlier evidence (by file)"
+RECENT_HEADER = "### Recent evidence"
+
+# Compaction budget: the file is compacted once it exceeds MAX_BYTES, down
+# to half of it so that appends are not followed by a rewrite every time
+MAX_BYTES = int(os.environ.get("MENTU_MEMORY_MAX_BYTES", "16384"))
+RECENT_ENTRIES = int(os.environ.get("MENTU_MEMORY_RECENT", "40"))
 
+ENTRY_LINE = re.compile(
+    r"^- `(?P<id>[^`]*)` \| (?P<type>[^|]*?) \| `(?P<file>[^`]*)` \| (?P<ts>\S+)"
+    r"(?: \| (?P<change>[^|]*))?$"
+)
+SUMMARY_LINE = re.compile(
+    r"^- `(?P<file>[^`]*)` \| (?P<count>\d+) entr(?:y|ies) \| (?P<types>[^|]*?)"
+    r" \| (?P<first>\S+) → (?P<last>\S+)$"
+)
 
-def get_new_evidence_entries() -> list[dict]:
-    """Read evidence entries that haven't been bridged yet."""
-    if not EVIDENCE_LOG.exists():
-        return []
 
+def load_cursor() -> dict:
+    """
+    Bridge state: byte offset into the evidence log and whether the memories
+    file is known to have an Evidence Trail section.
+
+    Older versions stored a bare entry count; it is converted to the byte
+    offset after that many lines.
+    """
+    try:
+        raw = BRIDGE_STATE.read_text().strip()
+    except OSError:
+        return {"offset": 0, "trail": False}
     try:
-        all_entries = json.loads(EVIDENCE_LOG.read_text())
-    except (json.JSONDecodeError, OSError):
-        return []
+        state = json.loads(raw)
+    except json.JSONDecodeError:
+        return {"offset": 0, "trail": False}
+    if isinstance(state, int):
+        return {"offset": mentu_evidence_log.offset_after(state), "trail": False}
+    if not isinstance(state, dict):
+        return {"offset": 0, "trail": False}
+    return {"offset": int(state.get("offset", 0)), "trail": bool(state.get("trail"))}
 
-    # Track which entries we've already bridged
-    cursor = 0
-    if BRIDGE_STATE.exists():
-        try:
-            cursor = int(BRIDGE_STATE.read_text().strip())
-        except (ValueError, OSError):
-            cursor = 0
 
-    new_entries = all_entries[cursor:]
+def save_cursor(state: dict) -> None:
+    """Write the cursor atomically (temp file + rename)."""
+    BRIDGE_STATE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = BRIDGE_STATE.with_name(BRIDGE_STATE.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, BRIDGE_STATE)
 
-    # Update cursor
-    if new_entries:
-        BRIDGE_STATE.parent.mkdir(parents=True, exist_ok=True)
-        BRIDGE_STATE.write_text(str(len(all_entries)))
 
-    return new_entries
+def get_new_evidence_entries(state: dict, entries: list[dict] | None = None) -> tuple[list[dict], int]:
+    """
+    The evidence appended since the cursor. Returns (entries, offset).
+
+    Entries just captured in this process are used as they are when their
+    log lines directly follow the cursor; otherwise (no log_span, or other
+    entries in between) the log is read from the cursor.
+    """
+    if entries:
+        offset = state["offset"]
+        for entry in entries:
+            span = entry.get("log_span")
+            if not span or span[0] != offset:
+                break
+            offset = span[1]
+        else:
+            return entries, offset
+    return mentu_evidence_log.read_from(state["offset"])
 
 
-def append_to_memories(entries: list[dict]) -> None:
-    """Append evidence entries to the memories file."""
+def append_to_memories(entries: list[dict], state: dict) -> None:
+    """Append evidence entries to the memories file without rewriting it."""
     if not entries:
         return
 
     MEMORY_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    if not MEMORY_FILE.exists():
-        MEMORY_FILE.write_text("# Ralph Memory Context\n\n## Evidence Trail\n\n")
-
-    content = MEMORY_FILE.read_text()
-
     # Build new evidence lines
     lines = []
     for entry in entries:
         mem_id = entry.get("id", "unknown")
         file_path = entry.get("file", "unknown")
         evidence_type = entry.get("type", "unknown")
-        timestamp = entry.get("ts", datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
-        lines.append(f"- `{mem_id}` | {evidence_type} | `{file_path}` | {timestamp}")
+        timestamp = entry.get("ts") or mentu_evidence_log.utc_timestamp()
+        change = mentu_fingerprint.describe(entry)
+        change = f" | {change}" if change else ""
+        lines.append(f"- `{mem_id}` | {evidence_type} | `{file_path}` | {timestamp}{change}")
 
     evidence_block = "\n".join(lines) + "\n"
 
-    # Append under Evidence Trail section
-    marker = "## Evidence Trail"
-    if marker in content:
-        # Insert after the marker (and any existing content)
-        content = content.rstrip() + "\n" + evidence_block
-    else:
-        content += f"\n{marker}\n\n{evidence_block}"
+    # Evidence lines go at the end, under the Evidence Trail section. The
+    # file is only scanned for the marker until the cursor remembers it.
+    marker = TRAIL_MARKER
+    if not MEMORY_FILE.exists():
+        evidence_block = f"# Ralph Memory Context\n\n{marker}\n\n" + evidence_block
+    elif not state["trail"]:
+        content = MEMORY_FILE.read_text()
+        if marker not in content:
+            evidence_block = f"\n{marker}\n\n" + evidence_block
+        elif content and not content.endswith("\n"):
+            evidence_block = "\n" + evidence_block
+    state["trail"] = True
+
+    with open(MEMORY_FILE, "a") as f:
+        f.write(evidence_block)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# ─── Rotation ────────────────────────────────────────────────────────────────
 
-    MEMORY_FILE.write_text(content)
+def summarize(summaries: dict, entry: dict) -> None:
+    """Fold one rolled-out entry into the per-file summaries."""
+    summary = summaries.setdefault(entry["file"], {
+        "count": 0, "types": [], "first": entry["ts"], "last": entry["ts"],
+    })
+    summary["count"] += 1
+    if entry["type"] not in summary["types"]:
+        summary["types"].append(entry["type"])
+    summary["first"] = min(summary["first"], entry["ts"])
+    summary["last"] = max(summary["last"], entry["ts"])
+
+
+def summary_line(file_path: str, summary: dict) -> str:
+    count = summary["count"]
+    return (f"- `{file_path}` | {count} entr{'y' if count == 1 else 'ies'} | "
+            f"{', '.join(summary['types'])} | {summary['first']} → {summary['last']}")
+
+
+def render_trail(summaries: dict, recent: list[str]) -> str:
+    """The Evidence Trail section: summary lines (newest first), then recent entries."""
+    trail = f"{TRAIL_MARKER}\n\n"
+    if summaries:
+        lines = [summary_line(f, s) for f, s in
+                 sorted(summaries.items(), key=lambda item: item[1]["last"], reverse=True)]
+        trail += f"{SUMMARY_HEADER}\n\n" + "\n".join(lines) + "\n\n"
+    return trail + f"{RECENT_HEADER}\n\n" + "".join(f"{line}\n" for line in recent)
+
+
+def compact(max_bytes: int = MAX_BYTES, recent_entries: int = RECENT_ENTRIES) -> bool:
+    """
+    Compact the Evidence Trail to half of max_bytes (see module docstring).
+    Returns whether the memories file was rewritten.
+    """
+    try:
+        content = MEMORY_FILE.read_text()
+    except OSError:
+        return False
+    head, marker, trail = content.partition(TRAIL_MARKER)
+    if not marker:
+        return False
+    if head and not head.endswith("\n\n"):
+        head = head.rstrip("\n") + "\n\n"
+
+    # Parse the trail: earlier summaries, then entries (oldest first). Lines
+    # that are neither are notes and are kept with the recent entries.
+    summaries: dict = {}
+    entries: list[tuple[str, dict | None]] = []
+    for line in trail.splitlines():
+        if not line.strip() or line in (SUMMARY_HEADER, RECENT_HEADER):
+            continue
+        match = SUMMARY_LINE.match(line)
+        if match:
+            summaries[match["file"]] = {
+                "count": int(match["count"]),
+                "types": [t.strip() for t in match["types"].split(",") if t.strip()],
+                "first": match["first"],
+                "last": match["last"],
+            }
+            continue
+        match = ENTRY_LINE.match(line)
+        entries.append((line, match.groupdict() if match else None))
+
+    # Roll out all but the newest recent_entries entries; if the file still
+    # exceeds half the budget, drop the oldest summaries (their entries are
+    # archived), then keep fewer entries in full
+    target = max_bytes // 2
+    keep = min(len(entries), recent_entries)
+    while True:
+        older, newer = entries[:len(entries) - keep], entries[len(entries) - keep:]
+        rolled = [(line, entry) for line, entry in older if entry]
+        recent = [line for line, entry in older if not entry] + [line for line, _ in newer]
+        folded = {f: {**s, "types": list(s["types"])} for f, s in summaries.items()}
+        for _, entry in rolled:
+            summarize(folded, entry)
+        while folded and len((head + render_trail(folded, recent)).encode()) > target:
+            del folded[min(folded, key=lambda f: folded[f]["last"])]
+        if keep <= 1 or len((head + render_trail(folded, recent)).encode()) <= target:
+            break
+        keep //= 2
+
+    if not rolled and folded == summaries:
+        return False
+
+    if rolled:
+        MEMORY_ARCHIVE.parent.mkdir(parents=True, exist_ok=True)
+        with open(MEMORY_ARCHIVE, "a") as f:
+            if f.tell() == 0:
+                f.write(f"# Ralph Memory Archive\n\nEvidence rolled out of {MEMORY_FILE.name}.\n\n")
+            f.write("".join(f"{line}\n" for line, _ in rolled))
+            f.flush()
+            os.fsync(f.fileno())
+
+    tmp = MEMORY_FILE.with_name(MEMORY_FILE.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(head + render_trail(folded, recent))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, MEMORY_FILE)
+    return True
+
+
+def over_budget(max_bytes: int = MAX_BYTES) -> bool:
+    try:
+        return max_bytes > 0 and MEMORY_FILE.stat().st_size > max_bytes
+    except OSError:
+        return False
+
+
+def bridge(entries: list[dict] | None = None) -> int:
+    """
+    Bridge new evidence entries to memories. Returns how many were bridged.
+
+    The dispatcher passes the entries it just captured (see
+    get_new_evidence_entries); the standalone hook reads them from the log.
+    """
+    # The cursor only advances after the append, so a crash re-bridges
+    # rather than drops entries. Bridges run one at a time, so a compaction
+    # never races an append.
+    BRIDGE_LOCK.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(BRIDGE_LOCK, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        state = load_cursor()
+        new_entries, offset = get_new_evidence_entries(state, entries)
+        if offset != state["offset"]:
+            with mentu_metrics.phase("memories"):
+                append_to_memories(new_entries, state)
+            state["offset"] = offset
+            save_cursor(state)
+        if over_budget():
+            with mentu_metrics.phase("compact"):
+                compact()
+    finally:
+        os.close(fd)
+    if new_entries:
+        sys.stderr.write(
+            f"[Ralph Memory] Bridged {len(new_entries)} evidence entries to memories.md\n"
+        )
+    return len(new_entries)
 
 
 def main():
     """Main hook entry point."""
     try:
-        input_data = json.load(sys.stdin)
+        with mentu_metrics.phase("stdin"):
+            input_data = json.load(sys.stdin)
     except json.JSONDecodeError:
         print(json.dumps({}))
         sys.exit(0)
@@ -103,13 +314,7 @@ def main():
         print(json.dumps({}))
         sys.exit(0)
 
-    # Bridge new evidence entries to memories
-    new_entries = get_new_evidence_entries()
-    if new_entries:
-        append_to_memories(new_entries)
-        sys.stderr.write(
-            f"[Ralph Memory] Bridged {len(new_entries)} evidence entries to memories.md\n"
-        )
+    bridge()
 
     print(json.dumps({}))
     sys.exit(0)
@@ -117,7 +322,8 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        with mentu_metrics.run("bridge"):
+            main()
     except Exception as e:
         sys.stderr.write(f"Evidence-to-memory bridge error: {e}\n")
         print(json.dumps({}))
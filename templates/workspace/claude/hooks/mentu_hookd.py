@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Hook Daemon - Long-lived local server for hook ledger writes.
+
+Hooks run once per tool call, and shelling out to `mentu capture` cold-starts
+the Node CLI every time. This daemon keeps the workspace and the ledger file
+open and appends capture/annotate operations through mentu_ledger, in the
+same format and under the same `.mentu/.lock` as the CLI.
+
+Hooks talk to it over a Unix socket (newline-delimited JSON). The daemon is
+started lazily by the first hook that cannot reach it and exits after
+MENTU_HOOKD_IDLE seconds without requests. Hooks fall back to the `mentu`
+CLI whenever it is unavailable; set MENTU_HOOKD=0 to disable it entirely.
+
+Usage:
+    python3 mentu_hookd.py serve [--workspace DIR]
+    python3 mentu_hookd.py status
+    python3 mentu_hookd.py stop
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from mentu_ledger import Batch, find_workspace, ledger_path, workspace_name
+
+IDLE_TIMEOUT = float(os.environ.get("MENTU_HOOKD_IDLE", "600"))
+CONNECT_TIMEOUT = 0.05
+REQUEST_TIMEOUT = 2.0
+
+# sun_path is 104-108 bytes depending on platform
+MAX_SOCKET_PATH = 100
+
+
+# ─── Workspace ───────────────────────────────────────────────────────────────
+
+def socket_path(workspace: Path) -> str:
+    """Socket path for a workspace (.mentu/hookd.sock, or a temp path if too long)."""
+    path = str(workspace / ".mentu" / "hookd.sock")
+    if len(path.encode()) <= MAX_SOCKET_PATH:
+        return path
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(str(workspace).encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"mentu-hookd-{digest}.sock")
+
+
+# ─── Server ──────────────────────────────────────────────────────────────────
+
+class HookDaemon:
+    """Serves hook requests for one workspace, keeping the ledger open."""
+
+    def __init__(self, workspace: Path):
+        import threading
+
+        self.workspace = workspace
+        self.path = socket_path(workspace)
+        self.name = workspace_name(workspace)
+        self.ledger = open(ledger_path(workspace), "a", encoding="utf-8")
+        self.write_lock = threading.Lock()
+        self.last_request = time.monotonic()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.running = True
+
+    def batch(self) -> Batch:
+        """Batch writing through the daemon's open ledger handle."""
+        return Batch(self.workspace, handle=self.ledger, name=self.name)
+
+    def handle(self, request: dict) -> dict:
+        cmd = request.get("cmd")
+        actor = request.get("actor") or "agent:claude-code"
+
+        if cmd == "ping":
+            return {"ok": True, "pid": os.getpid(), "workspace": str(self.workspace),
+                    "uptime": round(time.monotonic() - self.started, 1),
+                    "requests": self.requests}
+
+        if cmd == "capture":
+            with self.write_lock, self.batch() as ops:
+                mem_id = ops.capture(request.get("body") or "", kind=request.get("kind"),
+                                     actor=actor, meta=request.get("meta"),
+                                     refs=request.get("refs"))
+            return {"ok": True, "id": mem_id}
+
+        if cmd == "annotate":
+            with self.write_lock, self.batch() as ops:
+                op_id = ops.annotate(request.get("target"), request.get("body", ""),
+                                     kind=request.get("kind"), actor=actor)
+            return {"ok": True, "id": op_id}
+
+        if cmd == "shutdown":
+            self.running = False
+            return {"ok": True}
+
+        return {"ok": False, "error": f"Unknown command: {cmd}"}
+
+    def serve_connection(self, conn: socket.socket) -> None:
+        with conn:
+            conn.settimeout(REQUEST_TIMEOUT)
+            try:
+                for raw in conn.makefile("rb"):
+                    self.last_request = time.monotonic()
+                    self.requests += 1
+                    try:
+                        response = self.handle(json.loads(raw))
+                    except Exception as e:
+                        response = {"ok": False, "error": str(e)}
+                    conn.sendall(json.dumps(response).encode() + b"\n")
+            except OSError:
+                pass  # Client went away or idled past the timeout
+
+    def serve(self) -> None:
+        import socket
+        import threading
+
+        server = bind_socket(self.path)
+        if server is None:
+            return  # Another daemon already owns this workspace
+        server.settimeout(1.0)
+        try:
+            while self.running and time.monotonic() - self.last_request < IDLE_TIMEOUT:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(target=self.serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            server.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.ledger.close()
+
+
+def bind_socket(path: str) -> socket.socket | None:
+    """Bind the daemon socket, replacing a stale one. None if a daemon is live."""
+    import socket
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(path)
+    except OSError:
+        if _connect(path) is not None:
+            server.close()
+            return None
+        os.unlink(path)
+        server.bind(path)
+    os.chmod(path, 0o600)
+    server.listen(64)
+    return server
+
+
+# ─── Client ──────────────────────────────────────────────────────────────────
+
+def _connect(path: str) -> socket.socket | None:
+    import socket  # Not needed by hook runs that write nothing
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CONNECT_TIMEOUT)
+    try:
+        client.connect(path)
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def start_daemon(workspace: Path) -> None:
+    """Spawn a detached daemon for the workspace."""
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--workspace", str(workspace)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def request(message: dict, workspace: Path | None = None, autostart: bool = True) -> dict | None:
+    """
+    Send one request to the workspace daemon.
+
+    Returns None when the daemon is disabled or unreachable; in that case a
+    daemon is started in the background for subsequent hook calls.
+    """
+    if os.environ.get("MENTU_HOOKD", "1") == "0":
+        return None
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        return None
+
+    path = socket_path(workspace)
+    client = _connect(path)
+    if client is None:
+        if autostart:
+            try:
+                start_daemon(workspace)
+            except OSError:
+                pass
+        return None
+
+    try:
+        with client:
+            client.settimeout(REQUEST_TIMEOUT)
+            client.sendall(json.dumps(message).encode() + b"\n")
+            response = client.makefile("rb").readline()
+        return json.loads(response) if response else None
+    except (OSError, ValueError):
+        return None
+
+
+def capture(body: str, kind: str, actor: str, meta: dict | None = None) -> str | None:
+    """Capture a memory through the daemon. Returns the mem_ ID, or None."""
+    response = request({"cmd": "capture", "body": body, "kind": kind, "actor": actor, "meta": meta})
+    if response and response.get("ok"):
+        return response.get("id")
+    return None
+
+
+def annotate(target: str, body: str, kind: str, actor: str) -> str | None:
+    """Annotate a record through the daemon. Returns the op_ ID, or None."""
+    response = request({"cmd": "annotate", "target": target, "body": body, "kind": kind, "actor": actor})
+    if response and response.get("ok"):
+        return response.get("id")
+    return None
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    command = args[0] if args else "status"
+    workspace = None
+    if "--workspace" in args:
+        workspace = Path(args[args.index("--workspace") + 1]).resolve()
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        print("No .mentu/ found", file=sys.stderr)
+        sys.exit(1)
+
+    if command == "serve":
+        HookDaemon(workspace).serve()
+    elif command == "status":
+        response = request({"cmd": "ping"}, workspace, autostart=False)
+        print(json.dumps(response or {"ok": False, "error": "not running"}))
+    elif command == "stop":
+        response = request({"cmd": "shutdown"}, workspace, autostart=False)
+        print(json.dumps(response or {"ok": False, "error": "not running"}))
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
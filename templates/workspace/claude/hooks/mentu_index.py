@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Ledger Index - Random access into .mentu/ledger.jsonl.
+
+Finding one record, or every operation since a point in time, otherwise
+means scanning the ledger from the top. `.mentu/ledger.idx` is a sidecar
+of fixed-size entries, one per ledger line, in ledger order:
+
+    id (16 bytes, NUL-padded) | byte offset (u64) | ts (u32) | max ts (u32)
+
+`ts` is the record's own timestamp in epoch seconds; `max ts` is the
+running maximum up to that line, which is non-decreasing even when synced
+operations arrive out of order, so time queries can bisect on it.
+
+ID lookups go through `.mentu/ledger.idx.ids`, an open-addressing hash
+table of fixed-size slots (linear probing, kept at most half full):
+
+    id (16 bytes, NUL-padded) | entry number + 1 (u32, 0 = empty slot)
+
+so finding a record costs a probe or two and one seek, however long the
+ledger. A later line with the same ID takes over its slot.
+
+Both files are read through mmap and caught up incrementally with whatever
+was appended to the ledger since they were last touched (by hooks or the
+CLI). If the ledger was rewritten they are rebuilt from scratch; the hash
+table is also rebuilt, at four times the entry count, when it fills up.
+
+Usage:
+    python3 mentu_index.py get <id>
+    python3 mentu_index.py since <iso-timestamp>
+    python3 mentu_index.py rebuild
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from mentu_ledger import find_workspace, ledger_path
+
+INDEX_FILE = "ledger.idx"
+MAGIC = b"MENTUIX1"
+
+# magic | ledger offset covered | sha1 of the bytes before that offset
+HEADER = struct.Struct("<8sQ20s")
+HEADER_SIZE = 64
+ENTRY = struct.Struct("<16sQII")
+
+IDS_SUFFIX = ".ids"
+IDS_MAGIC = b"MENTUIH1"
+# magic | slot count (a power of two) | index entries inserted
+IDS_HEADER = struct.Struct("<8sQQ")
+SLOT = struct.Struct("<16sI")
+MIN_SLOTS = 1024
+
+CHECK_BYTES = 256
+
+
+def index_path(workspace: Path) -> Path:
+    return workspace / ".mentu" / INDEX_FILE
+
+
+def ids_path(workspace: Path) -> Path:
+    return workspace / ".mentu" / (INDEX_FILE + IDS_SUFFIX)
+
+
+def epoch(ts: str) -> int:
+    """Epoch seconds for a ledger timestamp (0 if unparseable)."""
+    try:
+        moment = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return 0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(int(moment.timestamp()), 0)
+
+
+def _key(record_id: str) -> bytes:
+    return record_id.encode("utf-8")[:16].ljust(16, b"\0")
+
+
+def _home(key: bytes, slots: int) -> int:
+    """First slot to probe for a key (stable across processes, unlike hash())."""
+    return int.from_bytes(hashlib.sha1(key).digest()[:8], "little") & (slots - 1)
+
+
+def _insert(read, write, slots: int, key: bytes, number: int) -> None:
+    """Point key at entry number (replacing an earlier line with the same ID)."""
+    slot = _home(key, slots)
+    while True:
+        existing, taken = SLOT.unpack(read(slot))
+        if not taken or existing == key:
+            write(slot, SLOT.pack(key, number + 1))
+            return
+        slot = (slot + 1) & (slots - 1)
+
+
+def _check(ledger, offset: int) -> bytes:
+    start = max(offset - CHECK_BYTES, 0)
+    ledger.seek(start)
+    return hashlib.sha1(ledger.read(offset - start)).digest()
+
+
+class LedgerIndex:
+    """Index over one workspace ledger. Call refresh() to pick up appends."""
+
+    def __init__(self, workspace: Path):
+        self.workspace = workspace
+        self.path = index_path(workspace)
+        self.ids_path = ids_path(workspace)
+        self.ledger = open(ledger_path(workspace), "rb")
+        self.map: Optional[mmap.mmap] = None
+        self.ids: Optional[mmap.mmap] = None
+        self.count = 0
+        self.slots = 0
+
+    # ─── Maintenance ─────────────────────────────────────────────────────────
+
+    def refresh(self) -> int:
+        """Index lines appended since the last refresh. Returns how many."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            added, reset = self._catch_up(fd)
+            self._catch_up_ids(fd, reset)
+        finally:
+            os.close(fd)  # Releases the flock
+        self._map()
+        return added
+
+    def rebuild(self) -> int:
+        """Discard the index and rebuild it from the whole ledger."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            os.ftruncate(fd, 0)
+            added, _ = self._catch_up(fd)
+            self._catch_up_ids(fd, True)
+        finally:
+            os.close(fd)
+        self._map()
+        return added
+
+    def _catch_up(self, fd: int) -> tuple:
+        """Index new ledger lines. Returns (lines added, whether it started over)."""
+        with os.fdopen(os.dup(fd), "r+b") as index:
+            header = index.read(HEADER.size)
+            size = self.ledger.seek(0, os.SEEK_END)
+            offset = 0
+            if len(header) == HEADER.size:
+                magic, offset, check = HEADER.unpack(header)
+                if magic != MAGIC or offset > size or (offset and _check(self.ledger, offset) != check):
+                    offset = 0
+            reset = offset == 0
+            if reset:
+                index.seek(0)
+                index.truncate()
+                index.write(HEADER.pack(MAGIC, 0, b"\0" * 20).ljust(HEADER_SIZE, b"\0"))
+
+            entries = (index.seek(0, os.SEEK_END) - HEADER_SIZE) // ENTRY.size
+            max_ts = 0
+            if entries:
+                index.seek(HEADER_SIZE + (entries - 1) * ENTRY.size)
+                max_ts = ENTRY.unpack(index.read(ENTRY.size))[3]
+            index.seek(HEADER_SIZE + entries * ENTRY.size)
+            index.truncate()  # Drop a torn entry from a crashed writer
+
+            self.ledger.seek(offset)
+            data = self.ledger.read(size - offset)
+            end = data.rfind(b"\n") + 1  # Leave a line still being written
+            out = []
+            position = offset
+            for line in data[:end].splitlines(keepends=True):
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                        record_id, ts = record.get("id") or "", epoch(record.get("ts"))
+                    except (ValueError, AttributeError):
+                        record_id, ts = "", 0
+                    max_ts = max(max_ts, ts)
+                    out.append(ENTRY.pack(_key(record_id), position, ts, max_ts))
+                position += len(line)
+            if not out:
+                return 0, reset
+
+            index.write(b"".join(out))
+            index.flush()
+            index.seek(0)
+            index.write(HEADER.pack(MAGIC, offset + end, _check(self.ledger, offset + end)))
+            index.flush()
+            return len(out), reset
+
+    def _catch_up_ids(self, fd: int, reset: bool) -> None:
+        """Insert index entries added since the hash table was last updated."""
+        total = max(os.fstat(fd).st_size - HEADER_SIZE, 0) // ENTRY.size
+        ids_fd = os.open(self.ids_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            header = os.pread(ids_fd, IDS_HEADER.size, 0)
+            slots = done = 0
+            if len(header) == IDS_HEADER.size:
+                magic, slots, done = IDS_HEADER.unpack(header)
+                if magic != IDS_MAGIC:
+                    slots = done = 0
+            if reset or done > total or not slots or (total + 1) * 2 > slots:
+                self._rebuild_ids(fd, total)
+                return
+            if done == total:
+                return
+
+            def read(slot: int) -> bytes:
+                return os.pread(ids_fd, SLOT.size, HEADER_SIZE + slot * SLOT.size)
+
+            def write(slot: int, data: bytes) -> None:
+                os.pwrite(ids_fd, data, HEADER_SIZE + slot * SLOT.size)
+
+            for number, key in self._keys(fd, done, total):
+                _insert(read, write, slots, key, number)
+            os.pwrite(ids_fd, IDS_HEADER.pack(IDS_MAGIC, slots, total), 0)
+        finally:
+            os.close(ids_fd)
+
+    def _rebuild_ids(self, fd: int, total: int) -> None:
+        """Write a new hash table for all entries (replacing the file, so maps stay valid)."""
+        slots = MIN_SLOTS
+        while slots < total * 4:
+            slots *= 2
+        table = bytearray(slots * SLOT.size)
+
+        def read(slot: int) -> bytes:
+            return table[slot * SLOT.size:(slot + 1) * SLOT.size]
+
+        def write(slot: int, data: bytes) -> None:
+            table[slot * SLOT.size:(slot + 1) * SLOT.size] = data
+
+        for number, key in self._keys(fd, 0, total):
+            _insert(read, write, slots, key, number)
+        tmp = self.ids_path.with_name(f"{self.ids_path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(IDS_HEADER.pack(IDS_MAGIC, slots, total).ljust(HEADER_SIZE, b"\0"))
+            f.write(table)
+        os.replace(tmp, self.ids_path)
+
+    def _keys(self, fd: int, start: int, stop: int) -> Iterator[tuple]:
+        """(entry number, id key) of index entries start..stop that have an ID."""
+        data = os.pread(fd, (stop - start) * ENTRY.size, HEADER_SIZE + start * ENTRY.size)
+        for number, (key, _, _, _) in enumerate(ENTRY.iter_unpack(data), start):
+            if key.strip(b"\0"):
+                yield number, key
+
+    def _map(self) -> None:
+        self._unmap()
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            self.count = max(size - HEADER_SIZE, 0) // ENTRY.size
+            if self.count:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with open(self.ids_path, "rb") as f:
+                ids = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+        magic, slots, _ = IDS_HEADER.unpack_from(ids, 0)
+        if magic == IDS_MAGIC and len(ids) >= HEADER_SIZE + slots * SLOT.size:
+            self.ids, self.slots = ids, slots
+        else:
+            ids.close()
+
+    def _unmap(self) -> None:
+        for mapped in (self.map, self.ids):
+            if mapped is not None:
+                mapped.close()
+        self.map = self.ids = None
+        self.slots = 0
+
+    # ─── Reads ───────────────────────────────────────────────────────────────
+
+    def entry(self, n: int) -> tuple:
+        """(id, offset, ts, max_ts) of the n-th ledger line."""
+        raw_id, offset, ts, max_ts = ENTRY.unpack_from(self.map, HEADER_SIZE + n * ENTRY.size)
+        return raw_id.rstrip(b"\0").decode("utf-8", errors="replace"), offset, ts, max_ts
+
+    def read_at(self, offset: int) -> Optional[dict]:
+        """The ledger record starting at a byte offset."""
+        self.ledger.seek(offset)
+        try:
+            return json.loads(self.ledger.readline())
+        except ValueError:
+            return None
+
+    def offset_of(self, record_id: str) -> Optional[int]:
+        """Byte offset of the most recent line with this ID, or None."""
+        if self.map is None or self.ids is None:
+            return None
+        key = _key(record_id)
+        slot = _home(key, self.slots)
+        while True:
+            existing, number = SLOT.unpack_from(self.ids, HEADER_SIZE + slot * SLOT.size)
+            if not number:
+                return None
+            if existing == key:
+                # A slot can point past our map if another process appended since
+                return self.entry(number - 1)[1] if number <= self.count else None
+            slot = (slot + 1) & (self.slots - 1)
+
+    def get(self, record_id: str) -> Optional[dict]:
+        """Read one record by ID with a single seek."""
+        offset = self.offset_of(record_id)
+        if offset is None:
+            return None
+        record = self.read_at(offset)
+        if record is None or record.get("id") != record_id:
+            return None  # IDs longer than 16 bytes share a key
+        return record
+
+    def since(self, ts: str) -> Iterator[dict]:
+        """Records with a timestamp at or after ts, in ledger order."""
+        if self.map is None:
+            return
+        target = epoch(ts)
+        lo, hi = 0, self.count
+        while lo < hi:  # First entry whose running max reaches the target
+            mid = (lo + hi) // 2
+            if self.entry(mid)[3] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        for n in range(lo, self.count):
+            _, offset, entry_ts, _ = self.entry(n)
+            if entry_ts >= target:
+                record = self.read_at(offset)
+                if record is not None:
+                    yield record
+
+    def close(self) -> None:
+        self._unmap()
+        self.ledger.close()
+
+    def __enter__(self) -> "LedgerIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def open_index(workspace: Optional[Path] = None) -> Optional[LedgerIndex]:
+    """Open and refresh the index for the current workspace, or None."""
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        return None
+    try:
+        index = LedgerIndex(workspace)
+    except OSError:
+        return None
+    try:
+        index.refresh()
+    except OSError:
+        index.close()
+        return None
+    return index
+
+
+def get(record_id: str) -> Optional[dict]:
+    """Look up one ledger record by ID (None if missing or no workspace)."""
+    index = open_index()
+    if index is None:
+        return None
+    with index:
+        return index.get(record_id)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    command = args[0] if args else "rebuild"
+    index = open_index()
+    if index is None:
+        print("No .mentu/ledger.jsonl found", file=sys.stderr)
+        sys.exit(1)
+
+    with index:
+        if command == "get" and len(args) > 1:
+            record = index.get(args[1])
+            if record is None:
+                print(f"Not found: {args[1]}", file=sys.stderr)
+                sys.exit(1)
+            print(json.dumps(record))
+        elif command == "since" and len(args) > 1:
+            for record in index.since(args[1]):
+                print(json.dumps(record))
+        elif command == "rebuild":
+            print(json.dumps({"entries": index.rebuild()}))
+        else:
+            print(f"Unknown command: {command}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Hook Metrics - Latency telemetry for every hook run.
+
+Hooks run on every session start and tool call, so a slow one slows the
+agent down, but nothing recorded which. Each hook run now appends one line
+to .claude/mentu_metrics.jsonl:
+
+    {"hook":"post_tool","ts":1760000000.123,"ms":14.2,"phases":{"stdin":0.1,"ledger":3.4}}
+
+`run()` times the whole hook run, up to and including a sys.exit() inside
+it (interpreter startup and imports come before and are not counted), and
+`phase()` a step inside it: stdin parsing, ledger writes, CLI and API
+calls, file I/O. Phases of the same name add up and may overlap (nested
+or concurrent steps). Hooks that leave with os._exit() call flush() first.
+
+Recording costs a perf_counter() per phase boundary and one O_APPEND
+write per run; the file is rotated to mentu_metrics.jsonl.1 once it passes
+MENTU_METRICS_MAX_BYTES (default 1 MiB). Set MENTU_METRICS=0 to turn
+recording off.
+
+Usage:
+    python3 mentu_metrics.py report [--budget MS] [--hook NAME] [--json]
+    python3 mentu_metrics.py clear
+
+The report shows p50/p95/p99 per hook and phase and flags hooks whose p95
+exceeds the budget (MENTU_HOOK_BUDGET_MS, default 100); it exits 1 if any
+hook is over budget.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+METRICS_FILE = Path(".claude/mentu_metrics.jsonl")
+MAX_BYTES = int(os.environ.get("MENTU_METRICS_MAX_BYTES", str(1024 * 1024)))
+BUDGET_MS = float(os.environ.get("MENTU_HOOK_BUDGET_MS", "100"))
+
+PERCENTILES = (50, 95, 99)
+
+# The run being timed in this process (hooks are one run per process)
+_current: Run | None = None
+
+
+def enabled() -> bool:
+    return os.environ.get("MENTU_METRICS", "1") != "0"
+
+
+# ─── Recording ───────────────────────────────────────────────────────────────
+
+class Run:
+    """Times one hook run; recorded when the with-block exits."""
+
+    def __init__(self, hook: str):
+        self.hook = hook
+        self.phases: dict = {}
+        self.started = 0.0
+
+    def __enter__(self) -> Run:
+        global _current
+        _current = self
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.stop()
+        return False
+
+    def stop(self) -> None:
+        """Record this run (once)."""
+        global _current
+        if _current is not self:
+            return
+        _current = None
+        if enabled():
+            record(self.hook, (time.perf_counter() - self.started) * 1000, dict(self.phases))
+
+
+class Phase:
+    """Times one step of the current run (a no-op outside of one)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> Phase:
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        if _current is not None:
+            elapsed = (time.perf_counter() - self.started) * 1000
+            _current.phases[self.name] = _current.phases.get(self.name, 0.0) + elapsed
+        return False
+
+
+def run(hook: str) -> Run:
+    return Run(hook)
+
+
+def phase(name: str) -> Phase:
+    return Phase(name)
+
+
+def flush() -> None:
+    """Record the current run now (os._exit() skips its with-block)."""
+    if _current is not None:
+        _current.stop()
+
+
+def record(hook: str, ms: float, phases: dict | None = None) -> None:
+    """Append one run to the metrics file (best-effort)."""
+    line = json.dumps({
+        "hook": hook,
+        "ts": round(time.time(), 3),
+        "ms": round(ms, 2),
+        "phases": {name: round(value, 2) for name, value in (phases or {}).items()},
+    }, separators=(",", ":")) + "\n"
+    try:
+        try:
+            fd = os.open(METRICS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except FileNotFoundError:
+            METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(METRICS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size > MAX_BYTES:
+            os.replace(METRICS_FILE, rotated_path())
+    except OSError:
+        pass
+
+
+def rotated_path() -> Path:
+    return METRICS_FILE.with_name(METRICS_FILE.name + ".1")
+
+
+# ─── Report ──────────────────────────────────────────────────────────────────
+
+def load(hook: str | None = None) -> list[dict]:
+    """Recorded runs, oldest first (the rotated file, then the current one)."""
+    runs = []
+    for path in (rotated_path(), METRICS_FILE):
+        try:
+            lines = path.read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Torn line from a crashed write
+            if isinstance(entry, dict) and (hook is None or entry.get("hook") == hook):
+                runs.append(entry)
+    return runs
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of values (0.0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(runs: list[dict], budget: float = BUDGET_MS) -> list[dict]:
+    """
+    One row per hook ("total") and per hook phase:
+    {"hook", "phase", "count", "p50", "p95", "p99", "over_budget"}.
+    """
+    samples: dict = {}
+    for entry in runs:
+        hook = str(entry.get("hook", "unknown"))
+        phases = samples.setdefault(hook, {"total": []})
+        phases["total"].append(float(entry.get("ms", 0)))
+        for name, ms in (entry.get("phases") or {}).items():
+            phases.setdefault(name, []).append(float(ms))
+
+    rows = []
+    for hook in sorted(samples):
+        for name, values in samples[hook].items():
+            row = {"hook": hook, "phase": name, "count": len(values)}
+            row.update({f"p{pct}": round(percentile(values, pct), 2) for pct in PERCENTILES})
+            row["over_budget"] = name == "total" and row["p95"] > budget
+            rows.append(row)
+    return rows
+
+
+def format_report(rows: list[dict], budget: float = BUDGET_MS) -> str:
+    if not rows:
+        return "No hook metrics recorded yet."
+    lines = [f"{'HOOK':<16} {'PHASE':<12} {'RUNS':>6} {'P50 ms':>9} {'P95 ms':>9} {'P99 ms':>9}"]
+    for row in rows:
+        hook = row["hook"] if row["phase"] == "total" else ""
+        flag = f"  OVER BUDGET ({budget:g} ms)" if row["over_budget"] else ""
+        lines.append(f"{hook:<16} {row['phase']:<12} {row['count']:>6} "
+                     f"{row['p50']:>9.2f} {row['p95']:>9.2f} {row['p99']:>9.2f}{flag}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    command = args[0] if args and not args[0].startswith("--") else "report"
+    budget = BUDGET_MS
+    hook = None
+    try:
+        if "--budget" in args:
+            budget = float(args[args.index("--budget") + 1])
+        if "--hook" in args:
+            hook = args[args.index("--hook") + 1]
+    except (IndexError, ValueError):
+        command = "usage"
+
+    if command == "report":
+        rows = summarize(load(hook), budget)
+        if "--json" in args:
+            print(json.dumps(rows, indent=2))
+        else:
+            print(format_report(rows, budget))
+        sys.exit(1 if any(row["over_budget"] for row in rows) else 0)
+    elif command == "clear":
+        for path in (METRICS_FILE, rotated_path()):
+            path.unlink(missing_ok=True)
+    else:
+        print("Usage: mentu_metrics.py report [--budget MS] [--hook NAME] [--json] | clear",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
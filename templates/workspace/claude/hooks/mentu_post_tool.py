@@ -8,30 +8,66 @@ Mentu PostToolUse Hook - Auto-captures file modifications as evidence.
 
 This hook runs after Edit or Write tools are used and
 captures the file modification as a Mentu memory for later use as evidence.
+Repeated edits to the same file are coalesced into one record (see
+mentu_coalesce); the hook also runs at SessionEnd to emit what is pending.
+Each record carries the file's hash and line count before and after (see
+mentu_fingerprint).
+
+mentu_dispatch runs these steps in-process together with the memory
+bridge; this script remains usable as a standalone hook.
 """
 from __future__ import annotations
 
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
 
-EVIDENCE_LOG = Path(".claude/mentu_evidence.json")
+try:
+    import mentu_evidence_log
+    import mentu_hookd
+    import mentu_ledger
+except ImportError:  # Hook installed without the shared modules
+    mentu_evidence_log = mentu_hookd = mentu_ledger = None
+
+try:
+    import mentu_coalesce
+    import mentu_fingerprint
+    import mentu_state
+    import mentu_sync
+except ImportError:  # Hook installed without the shared modules
+    mentu_coalesce = mentu_fingerprint = mentu_state = mentu_sync = None
 
+try:
+    from mentu_metrics import phase, run
+except ImportError:  # Hook installed without the shared modules
+    from contextlib import nullcontext as phase, nullcontext as run
 
-def capture_evidence(body: str) -> Optional[str]:
+
+def capture_evidence(body: str) -> str | None:
     """Capture a memory as evidence, return ID."""
     actor = os.environ.get("MENTU_ACTOR", "{{ACTOR}}")
 
+    # Fast path: append to the ledger without starting Node, through the
+    # hook daemon if it is running, else directly
+    if mentu_hookd is not None:
+        with phase("ledger"):
+            mem_id = mentu_hookd.capture(body, "evidence", actor)
+            if mem_id is None:
+                mem_id = mentu_ledger.capture(body, "evidence", actor)
+        if mem_id:
+            return mem_id
+
+    import subprocess
+
     try:
-        result = subprocess.run(
-            ["mentu", "capture", body, "--kind", "evidence", "--actor", actor, "--json"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        with phase("cli"):
+            result = subprocess.run(
+                ["mentu", "capture", body, "--kind", "evidence", "--actor", actor, "--json"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
         if result.returncode != 0:
             return None
 
@@ -41,92 +77,158 @@ def capture_evidence(body: str) -> Optional[str]:
         return None
 
 
-def append_to_evidence_log(mem_id: str, file_path: str, evidence_type: str) -> None:
-    """Store evidence for later use."""
-    log = []
-    if EVIDENCE_LOG.exists():
-        try:
-            log = json.loads(EVIDENCE_LOG.read_text())
-        except Exception:
-            log = []
+def append_to_evidence_log(mem_id: str, file_path: str, evidence_type: str, **extra) -> dict:
+    """Store evidence for later use (one O(1) append to the JSONL log)."""
+    if mentu_evidence_log is not None:
+        with phase("log"):
+            return mentu_evidence_log.append(mem_id, file_path, evidence_type, **extra)
+
+    from datetime import datetime, timezone
 
-    log.append({
+    entry = {
         "id": mem_id,
         "file": file_path,
-        "ts": subprocess.run(["date", "-u", "+%Y-%m-%dT%H:%M:%SZ"],
-                             capture_output=True, text=True).stdout.strip(),
-        "type": evidence_type
-    })
+        "ts": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "type": evidence_type,
+        **extra
+    }
+    log = Path(".claude/mentu_evidence.jsonl")
+    log.parent.mkdir(parents=True, exist_ok=True)
+    with open(log, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def capture_group(group: dict) -> dict | None:
+    """Capture one edit, or a coalesced group of edits. Returns the log entry."""
+    file_path = group["file"]
+    evidence_type = group["type"]
+    verb = "Created" if evidence_type == "file_created" else "Modified"
+    suffix = mentu_coalesce.summary(group) if mentu_coalesce is not None else ""
+    with phase("fingerprint"):
+        fields = mentu_fingerprint.change(file_path) if mentu_fingerprint is not None else {}
+    stats = f" [{mentu_fingerprint.describe(fields)}]" if fields else ""
+
+    mem_id = capture_evidence(f"{verb}: {file_path}{suffix}{stats}")
+    if not mem_id:
+        return None
 
-    EVIDENCE_LOG.parent.mkdir(parents=True, exist_ok=True)
-    EVIDENCE_LOG.write_text(json.dumps(log, indent=2))
+    extra = mentu_coalesce.log_fields(group) if mentu_coalesce is not None else {}
+    extra.update(fields)
+    if group.get("session"):
+        extra["session"] = group["session"]
+    entry = append_to_evidence_log(mem_id, file_path, evidence_type, **extra)
+    sys.stderr.write(f"[Mentu] Evidence captured: {mem_id} ({evidence_type}{suffix})\n")
+    return entry
 
 
-def main():
-    """Main hook entry point."""
+def push() -> None:
+    """Push to cloud (best-effort, non-blocking; one sync in flight at most)."""
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        print(json.dumps({}))
-        sys.exit(0)
+        if mentu_sync is None or not mentu_sync.request(push=True):
+            import subprocess
+
+            subprocess.Popen(
+                ["mentu", "sync", "--push"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+    except Exception:
+        pass
+
+
+def annotate(entry: dict) -> None:
+    """Annotate its session's active commitment with an evidence entry (best-effort)."""
+    try:
+        if mentu_state is not None:
+            cmt_id = mentu_state.active_commitment(entry.get("session"))
+            if cmt_id:
+                mentu_state.touch(entry.get("session"))
+                edits = f" ({entry['edits']} edits)" if entry.get("edits") else ""
+                stats = f" [{mentu_fingerprint.describe(entry)}]" if entry.get("sha_after") else ""
+                note = f"Evidence: {entry['id']} — {entry['type']}: {entry['file']}{edits}{stats}"
+                actor = os.environ.get("MENTU_ACTOR", "{{ACTOR}}")
+                if mentu_hookd is None or not (
+                    mentu_hookd.annotate(cmt_id, note, "evidence", actor)
+                    or mentu_ledger.annotate(cmt_id, note, "evidence", actor)
+                ):
+                    import subprocess
+
+                    subprocess.Popen(
+                        ["mentu", "annotate", cmt_id, note, "--kind", "evidence"],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    )
+    except Exception:
+        pass
+
+
+def emit(group: dict) -> None:
+    """Capture, push and annotate one edit, or a coalesced group of edits."""
+    entry = capture_group(group)
+    if entry:
+        push()
+        annotate(entry)
+
+
+def due_groups(input_data: dict, script: str) -> list:
+    """
+    Edit groups to capture now for one hook input.
+
+    With coalescing, the edit is recorded and only groups whose window has
+    closed are returned; a flusher running `script` emits the rest. At
+    SessionEnd every pending group is returned.
+    """
+    # Session end: emit edits still waiting for their window to close
+    if input_data.get("hook_event_name") == "SessionEnd":
+        if mentu_coalesce is None:
+            return []
+        return mentu_coalesce.take(everything=True, session=input_data.get("session_id"))
 
     tool_name = input_data.get("tool_name", "")
     tool_input = input_data.get("tool_input", {})
 
     # Only capture file changes
     if tool_name not in ("Edit", "Write"):
-        print(json.dumps({}))
-        sys.exit(0)
+        return []
 
     file_path = tool_input.get("file_path") or tool_input.get("path", "")
     if not file_path:
-        print(json.dumps({}))
-        sys.exit(0)
+        return []
 
-    # Build evidence body and type
-    if tool_name == "Write":
-        body = f"Created: {file_path}"
-        evidence_type = "file_created"
-    else:
-        body = f"Modified: {file_path}"
-        evidence_type = "file_modified"
+    evidence_type = "file_created" if tool_name == "Write" else "file_modified"
 
-    # Capture as evidence memory
-    mem_id = capture_evidence(body)
+    if mentu_coalesce is not None and mentu_coalesce.enabled():
+        # Record the edit; capture only groups whose window has closed
+        with phase("coalesce"):
+            groups = mentu_coalesce.record(file_path, evidence_type, session=input_data.get("session_id"))
+        mentu_coalesce.ensure_flusher(script)
+        return groups
+    return [{"file": file_path, "type": evidence_type, "count": 1,
+             "session": input_data.get("session_id")}]
 
-    if mem_id:
-        append_to_evidence_log(mem_id, file_path, evidence_type)
-        sys.stderr.write(f"[Mentu] Evidence captured: {mem_id} ({evidence_type})\n")
 
-        # Push to cloud (best-effort, non-blocking)
-        try:
-            subprocess.Popen(
-                ["mentu", "sync", "--push"],
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-            )
-        except Exception:
-            pass
-
-        # Annotate active commitment with evidence (best-effort)
-        try:
-            active_cmt_file = Path(".mentu/active_commitment")
-            if active_cmt_file.exists():
-                cmt_id = active_cmt_file.read_text().strip()
-                if cmt_id.startswith("cmt_"):
-                    subprocess.Popen(
-                        ["mentu", "annotate", cmt_id, f"Evidence: {mem_id} — {evidence_type}: {file_path}", "--kind", "evidence"],
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                    )
-        except Exception:
-            pass
+def main():
+    """Main hook entry point."""
+    try:
+        with phase("stdin"):
+            input_data = json.load(sys.stdin)
+    except json.JSONDecodeError:
+        print(json.dumps({}))
+        sys.exit(0)
+
+    for group in due_groups(input_data, __file__):
+        emit(group)
 
     print(json.dumps({}))
     sys.exit(0)
 
 
 if __name__ == "__main__":
+    if mentu_coalesce is not None and mentu_coalesce.FLUSH_ARG in sys.argv:
+        mentu_coalesce.run(emit)
+        sys.exit(0)
     try:
-        main()
+        with run("post_tool"):
+            main()
     except Exception as e:
         sys.stderr.write(f"PostToolUse hook error: {e}\n")
         print(json.dumps({}))
@@ -7,7 +7,13 @@
 Mentu SessionStart Hook - Injects claimed commitments into Claude's context.
 
 This hook runs when a Claude Code session starts and returns context
-about any commitments claimed by this agent.
+about any commitments claimed by this agent. Commitment setup and the
+ledger snapshot run concurrently. The snapshot is abandoned after
+MENTU_SESSION_DEADLINE seconds and left out of the context; commitment
+setup writes the ledger and session state, so it always runs to the end.
+
+The context stays within MENTU_CONTEXT_TOKENS (see mentu_context). On
+resume and compact it is reused as long as the ledger has not changed.
 """
 from __future__ import annotations
 
@@ -15,35 +21,46 @@ import json
 import os
 import subprocess
 import sys
-from pathlib import Path
-from typing import List, Dict
+import time
+
+import mentu_context
+import mentu_index
+import mentu_metrics
+import mentu_snapshot
+import mentu_state
+import mentu_sync
 
+try:
+    import mentu_evidence_log
+    import mentu_ledger
+except ImportError:  # Hook installed without the shared modules
+    mentu_evidence_log = mentu_ledger = None
 
-def get_active_commitment() -> str:
-    """Get active commitment from tracking file."""
+
+def get_active_commitment(session_id: str | None) -> str:
+    """Get this session's active commitment from the session state store."""
     try:
-        active_file = Path(".mentu/active_commitment")
-        if active_file.exists():
-            cmt_id = active_file.read_text().strip()
-            if cmt_id.startswith("cmt_"):
-                return cmt_id
+        return mentu_state.active_commitment(session_id)
     except Exception:
-        pass
-    return ""
+        return ""
 
 
-def close_stale_commitment(cmt_id: str) -> None:
-    """Submit + close a leftover commitment from a crashed session."""
+def close_stale_commitment(cmt_id: str) -> bool:
+    """Submit + close a leftover commitment from a crashed session. Returns whether it closed."""
     actor = os.environ.get("MENTU_ACTOR", "{{ACTOR}}")
     evidence_ids: list[str] = []
-    evidence_log = Path(".claude/mentu_evidence.json")
-    if evidence_log.exists():
+    if mentu_evidence_log is not None:
         try:
-            entries = json.loads(evidence_log.read_text())
-            evidence_ids = [e["id"] for e in entries[-10:]]
+            evidence_ids = [e["id"] for e in mentu_evidence_log.tail(10) if "id" in e]
         except Exception:
             pass
 
+    # Only cite evidence the ledger actually has (the log can outlive it)
+    index = mentu_index.open_index()
+    if index is not None:
+        with index:
+            evidence_ids = [i for i in evidence_ids if index.offset_of(i) is not None]
+
     # Submit (sync, best-effort)
     try:
         subprocess.run(
@@ -59,24 +76,19 @@ def close_stale_commitment(cmt_id: str) -> None:
         cmd = ["mentu", "close", cmt_id, "--actor", actor]
         if evidence_ids:
             cmd.extend(["--evidence", evidence_ids[0]])
-        subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=10).returncode == 0
     except Exception:
-        pass
+        return False
 
-    # Clear tracking file
-    Path(".mentu/active_commitment").unlink(missing_ok=True)
 
-
-def ensure_active_commitment() -> str:
+def ensure_active_commitment(session_id: str | None) -> str:
     """Create a commitment for this session if none exists. Returns cmt_id or ''."""
-    active_file = Path(".mentu/active_commitment")
     actor = os.environ.get("MENTU_ACTOR", "{{ACTOR}}")
 
     # Already have one
-    if active_file.exists():
-        existing = active_file.read_text().strip()
-        if existing.startswith("cmt_"):
-            return existing
+    existing = (mentu_state.load(session_id, fallback=False) or {}).get("active_commitment", "")
+    if existing.startswith("cmt_"):
+        return existing
 
     # Step 1: Capture a session-start memory (sync — need the mem_id)
     try:
@@ -119,132 +131,175 @@ def ensure_active_commitment() -> str:
     if not cmt_id:
         return ""
 
-    # Step 3: Claim it (fire-and-forget)
-    try:
-        subprocess.Popen(
-            ["mentu", "claim", cmt_id, "--actor", actor],
-            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        )
-    except Exception:
-        pass
+    # Step 3: Record it as this session's active commitment, before anything
+    # else can fail, so the next session start can close it
+    mentu_state.save({"active_commitment": cmt_id, "source_memory": mem_id, "actor": actor},
+                     session_id)
 
-    # Step 4: Write tracking file
-    active_file.parent.mkdir(parents=True, exist_ok=True)
-    active_file.write_text(cmt_id)
+    # Step 4: Claim it (direct ledger append, else fire-and-forget CLI)
+    if mentu_ledger is None or not mentu_ledger.claim(cmt_id, actor):
+        try:
+            subprocess.Popen(
+                ["mentu", "claim", cmt_id, "--actor", actor],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+        except Exception:
+            pass
 
     return cmt_id
 
 
-def get_lifecycle_summary() -> str:
-    """Get commitment lifecycle summary from mentu status."""
-    try:
-        result = subprocess.run(
-            ["mentu", "status", "--json"],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode != 0:
-            return ""
-        return result.stdout.strip()
-    except Exception:
+def start_session(source: str, session_id: str | None) -> tuple[str, list]:
+    """
+    Close leftover commitments and open this session's. Returns cmt_id (or
+    '') and the IDs of the leftovers closed.
+    """
+    # Only manage commitment lifecycle on new sessions or clear
+    # Resume and compact are the same session — don't touch the active commitment
+    if source not in ("startup", "clear"):
+        return get_active_commitment(session_id), []
+
+    # Leftovers: this session key's previous commitment (a loop reusing
+    # MENTU_SESSION_ID) and those of ended or crashed sessions. Live
+    # sibling sessions keep theirs.
+    leftovers = mentu_state.stale()
+    key = mentu_state.session_key(session_id)
+    own = mentu_state.load(session_id, fallback=False)
+    if own is not None:
+        leftovers[key] = own
+    closed = []
+    for stale_key, state in leftovers.items():
+        stale = state.get("active_commitment", "")
+        if stale.startswith("cmt_") and close_stale_commitment(stale):
+            closed.append(stale)
+        mentu_state.remove(stale_key, stale)
+    return ensure_active_commitment(session_id), closed
+
+
+def without_closed(snapshot: dict, closed: list) -> tuple[list, dict]:
+    """
+    Claimed commitments and counts, less the leftovers start_session closed
+    (the snapshot runs alongside it and may predate the close).
+    """
+    claimed = [cmt for cmt in snapshot["claimed"] if cmt.get("id") not in closed]
+    counts = dict(snapshot["counts"])
+    moved = len(snapshot["claimed"]) - len(claimed)
+    if moved:
+        counts["claimed"] = max(0, counts.get("claimed", 0) - moved)
+        counts["closed"] = counts.get("closed", 0) + moved
+    return claimed, counts
+
+
+def render(active_cmt: str, claimed: list, counts: dict, late: list) -> str:
+    """Context to inject ('' if there is nothing to say), within the token budget."""
+    if not (claimed or active_cmt or counts or late):
+        # No commitments = no context to inject
         return ""
 
+    header = "## Mentu Lifecycle State\n\n"
 
-def get_claimed_commitments() -> List[Dict]:
-    """Get commitments claimed by this agent."""
-    actor = os.environ.get("MENTU_ACTOR", "{{ACTOR}}")
+    # Active commitment (from session state, body read from the ledger index)
+    if active_cmt:
+        record = None if late else mentu_index.get(active_cmt)
+        body = mentu_context.truncate(((record or {}).get("payload") or {}).get("body"))
+        header += f"**Active commitment (in-progress):** `{active_cmt}`"
+        header += f" — {body}\n\n" if body else "\n\n"
 
-    try:
-        result = subprocess.run(
-            ["mentu", "list", "commitments", "--state", "claimed", "--json"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode != 0:
-            return []
+    footer = ""
 
-        all_commitments = json.loads(result.stdout)
-        # Filter to commitments claimed by this actor
-        return [c for c in all_commitments if c.get("owner") == actor]
-    except Exception:
-        return []
+    # Lifecycle summary
+    summary = [f"{state}: {counts[state]}" for state in mentu_snapshot.LIFECYCLE_STATES
+               if counts.get(state)]
+    if summary:
+        footer += f"**Lifecycle counts:** {', '.join(summary)}\n\n"
+
+    if late:
+        footer += f"*Mentu did not answer within {mentu_snapshot.SESSION_DEADLINE:g}s "
+        footer += f"({', '.join(late)}); this state may be incomplete.*\n\n"
+
+    footer += "Use `mentu submit <id> --summary '...'` when complete."
+
+    # Claimed commitments: the active one first, then the most recently
+    # active, as many as the budget allows
+    claimed_header = "**Claimed commitments** — you MUST submit each before stopping:\n\n"
+    blocks = [[f"- `{cmt['id']}`: {mentu_context.truncate(cmt.get('body'))}"]
+              for cmt in mentu_context.rank(claimed, first=active_cmt)]
+    fixed = header + claimed_header + mentu_context.more_line(len(blocks)) + footer
+    shown = mentu_context.fit(blocks, mentu_context.TOKEN_BUDGET - mentu_context.estimate_tokens(fixed))
+
+    context = header
+    if blocks:
+        context += claimed_header
+        context += "".join(f"{block[0]}\n" for block in blocks[:shown])
+        if shown < len(blocks):
+            context += mentu_context.more_line(len(blocks) - shown) + "\n"
+        context += "\n"
+    return context + footer
 
 
 def main():
     """Main hook entry point - returns context to inject."""
     # Read hook input from stdin to determine session source
     try:
-        hook_input = json.load(sys.stdin)
+        with mentu_metrics.phase("stdin"):
+            hook_input = json.load(sys.stdin)
     except (json.JSONDecodeError, EOFError):
         hook_input = {}
 
     source = hook_input.get("source", "startup")
+    session_id = hook_input.get("session_id")
+    mentu_state.export_session(session_id)
+    actor = os.environ.get("MENTU_ACTOR", "{{ACTOR}}")
+    deadline = time.monotonic() + mentu_snapshot.SESSION_DEADLINE
 
-    # Sync with cloud before checking commitments (best-effort, non-blocking)
+    # Sync with cloud before checking commitments (best-effort, non-blocking;
+    # joins a sync already in flight instead of starting another)
     try:
-        subprocess.Popen(
-            ["mentu", "sync"],
-            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        )
+        with mentu_metrics.phase("sync"):
+            mentu_sync.request()
     except Exception:
         pass
 
-    # Only manage commitment lifecycle on new sessions or clear
-    # Resume and compact are the same session — don't touch the active commitment
-    if source in ("startup", "clear"):
-        stale = get_active_commitment()
-        if stale:
-            close_stale_commitment(stale)
-        active_cmt = ensure_active_commitment()
-    else:
-        active_cmt = get_active_commitment()
-
-    claimed = get_claimed_commitments()
-    lifecycle_json = get_lifecycle_summary()
-
-    has_context = claimed or active_cmt or lifecycle_json
-
-    if not has_context:
-        # No commitments = no context to inject
-        sys.exit(0)
-
-    # Format for injection
-    context = "## Mentu Lifecycle State\n\n"
-
-    # Active commitment (from tracking file)
-    if active_cmt:
-        context += f"**Active commitment (in-progress):** `{active_cmt}`\n\n"
-
-    # Claimed commitments
-    if claimed:
-        context += "**Claimed commitments** — you MUST submit each before stopping:\n\n"
-        for cmt in claimed:
-            context += f"- `{cmt['id']}`: {cmt['body']}\n"
-        context += "\n"
-
-    # Lifecycle summary
-    if lifecycle_json:
-        try:
-            status = json.loads(lifecycle_json)
-            counts = []
-            for state in ["open", "claimed", "in_review", "closed"]:
-                count = status.get(state, 0)
-                if count:
-                    counts.append(f"{state}: {count}")
-            if counts:
-                context += f"**Lifecycle counts:** {', '.join(counts)}\n\n"
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-    context += "Use `mentu submit <id> --summary '...'` when complete."
-
-    print(context)
-    sys.exit(0)
+    # Resume and compact leave the commitments alone: with an unchanged
+    # ledger the context rendered last time is still current
+    key = None
+    if source not in ("startup", "clear"):
+        with mentu_metrics.phase("cache"):
+            key = mentu_context.cache_key(actor, get_active_commitment(session_id))
+            context = mentu_context.cached(key)
+        if context is not None:
+            if context:
+                print(context)
+            sys.exit(0)
+
+    # Commitment setup and the ledger snapshot are independent; only the
+    # read-only snapshot may be abandoned at the deadline
+    results, late = mentu_snapshot.run_with_deadline(
+        {
+            "active": lambda: start_session(source, session_id),
+            "snapshot": lambda: mentu_snapshot.query(actor, mentu_snapshot.remaining(deadline)),
+        },
+        deadline,
+        {"active": ("", []), "snapshot": mentu_snapshot.empty()},
+        required=("active",),
+    )
+    active_cmt, closed = results["active"]
+    snapshot = results["snapshot"]
+    claimed, counts = without_closed(snapshot, closed)
+
+    with mentu_metrics.phase("render"):
+        context = render(active_cmt, claimed, counts, late)
+    if context:
+        print(context)
+    if key is not None and not late and snapshot["complete"]:
+        mentu_context.store(key, context)
+    mentu_snapshot.finish(late)
 
 
 if __name__ == "__main__":
     try:
-        main()
+        with mentu_metrics.run("session_start"):
+            main()
     except Exception as e:
         sys.stderr.write(f"SessionStart hook error: {e}\n")
         sys.exit(0)
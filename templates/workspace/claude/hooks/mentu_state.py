@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Session State - Active commitment per session, safe under concurrency.
+
+The active commitment used to live in one file (.claude/mentu_state.json,
+or .mentu/active_commitment in workspaces), so parallel sessions and
+subagents in one checkout overwrote each other's commitment and clearing
+one session's state deleted a sibling's. State is now one file per session:
+
+    .claude/mentu_state/<session>.json
+        {"active_commitment": "cmt_...", "source_memory": "mem_...",
+         "actor": "...", "session_id": "..."}
+
+Each session writes only its own file, with a temp file and a rename, so
+sessions never wait on each other and a reader never sees a partial write.
+The session key is MENTU_SESSION_ID if set (session hooks export it for the
+session's shell commands), else the hook input's session_id, else
+"default". A session without state of its own falls back to "default".
+
+Usage:
+    python3 mentu_state.py get
+    python3 mentu_state.py set cmt_XXXXXXXX
+    python3 mentu_state.py clear
+    python3 mentu_state.py list
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+STATE_DIR = Path(".claude/mentu_state")
+DEFAULT_SESSION = "default"
+
+# Pre-session state files, migrated into the default session on first use
+LEGACY_STATE_FILE = Path(".claude/mentu_state.json")
+LEGACY_ACTIVE_FILE = Path(".mentu/active_commitment")
+
+# Sessions untouched this long are treated as crashed
+STALE_AFTER = float(os.environ.get("MENTU_SESSION_STALE_HOURS", "12")) * 3600
+
+
+def session_key(session_id: str | None = None) -> str:
+    """State key for a session: MENTU_SESSION_ID, else session_id, else default."""
+    key = os.environ.get("MENTU_SESSION_ID") or session_id or DEFAULT_SESSION
+    return re.sub(r"[^A-Za-z0-9._-]", "_", key)[:128]
+
+
+def state_path(key: str) -> Path:
+    return STATE_DIR / f"{key}.json"
+
+
+# ─── Migration ───────────────────────────────────────────────────────────────
+
+def _migrate() -> None:
+    """Move the single-file state of older versions into the default session."""
+    for legacy in (LEGACY_STATE_FILE, LEGACY_ACTIVE_FILE):
+        try:
+            raw = legacy.read_text().strip()
+            mtime = legacy.stat().st_mtime
+        except OSError:
+            continue
+        try:
+            state = json.loads(raw) if legacy == LEGACY_STATE_FILE else {"active_commitment": raw}
+        except ValueError:
+            state = {}
+        target = state_path(DEFAULT_SESSION)
+        if isinstance(state, dict) and state.get("active_commitment") and not target.exists():
+            _write(target, state)
+            os.utime(target, (mtime, mtime))  # Keep its age for stale detection
+        legacy.unlink(missing_ok=True)
+
+
+# ─── Reading and writing ─────────────────────────────────────────────────────
+
+def _read(path: Path) -> dict | None:
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _write(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(session_id: str | None = None, fallback: bool = True) -> dict | None:
+    """This session's state, else the default session's (unless fallback=False)."""
+    _migrate()
+    key = session_key(session_id)
+    state = _read(state_path(key))
+    if state is None and fallback and key != DEFAULT_SESSION:
+        state = _read(state_path(DEFAULT_SESSION))
+    return state
+
+
+def active_commitment(session_id: str | None = None) -> str:
+    """This session's active commitment ID, or ''."""
+    cmt_id = (load(session_id) or {}).get("active_commitment") or ""
+    return cmt_id if cmt_id.startswith("cmt_") else ""
+
+
+def save(state: dict, session_id: str | None = None) -> None:
+    """Replace this session's state (atomically)."""
+    _migrate()
+    key = session_key(session_id)
+    _write(state_path(key), {**state, "session_id": session_id or key})
+
+
+def clear(session_id: str | None = None, commitment: str | None = None) -> None:
+    """
+    Remove this session's state.
+
+    With commitment, only if that is still the active one, so a late clear
+    cannot drop a commitment started since. A session without state of its
+    own clears the default state it fell back to only when given the
+    commitment it read from it; other sessions may share that state.
+    """
+    key = session_key(session_id)
+    if not state_path(key).exists() and key != DEFAULT_SESSION:
+        if commitment is None:
+            return
+        key = DEFAULT_SESSION
+    remove(key, commitment)
+
+
+def remove(key: str, commitment: str | None = None) -> None:
+    """Remove the state stored under key (see clear() for commitment)."""
+    path = state_path(key)
+    if commitment is not None:
+        if (_read(path) or {}).get("active_commitment") != commitment:
+            return
+    path.unlink(missing_ok=True)
+
+
+def end(session_id: str | None = None) -> None:
+    """Mark this session as ended; the next session start closes its commitment."""
+    state = load(session_id, fallback=False)
+    if state is not None:
+        save({**state, "ended": time.time()}, session_id)
+
+
+def touch(session_id: str | None = None) -> None:
+    """Mark this session as alive (keeps it from being treated as stale)."""
+    try:
+        os.utime(state_path(session_key(session_id)))
+    except OSError:
+        pass
+
+
+def sessions() -> dict:
+    """All sessions with state: {key: state}."""
+    _migrate()
+    found = {}
+    for path in sorted(STATE_DIR.glob("*.json")):
+        state = _read(path)
+        if state is not None:
+            found[path.stem] = state
+    return found
+
+
+def stale(max_age: float = STALE_AFTER) -> dict:
+    """Sessions that ended or went untouched for max_age seconds: {key: state}."""
+    cutoff = time.time() - max_age
+    found = {}
+    for key, state in sessions().items():
+        try:
+            if state.get("ended") or state_path(key).stat().st_mtime < cutoff:
+                found[key] = state
+        except OSError:
+            pass
+    return found
+
+
+def export_session(session_id: str | None) -> None:
+    """
+    Export MENTU_SESSION_ID to the session's shell commands (via
+    CLAUDE_ENV_FILE), so scripts run by the agent use this session's state.
+    """
+    env_file = os.environ.get("CLAUDE_ENV_FILE")
+    if not env_file or not session_id or os.environ.get("MENTU_SESSION_ID"):
+        return
+    try:
+        with open(env_file, "a") as f:
+            f.write(f"export MENTU_SESSION_ID={session_key(session_id)}\n")
+    except OSError:
+        pass
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    command = args[0] if args else "get"
+
+    if command == "get":
+        print(active_commitment())
+    elif command == "set" and len(args) > 1 and args[1].startswith("cmt_"):
+        state = load(fallback=False) or {}
+        state["active_commitment"] = args[1]
+        if os.environ.get("MENTU_ACTOR"):
+            state["actor"] = os.environ["MENTU_ACTOR"]
+        save(state)
+    elif command == "clear":
+        clear()
+    elif command == "list":
+        print(json.dumps(sessions(), indent=2))
+    else:
+        print("Usage: mentu_state.py get | set cmt_XXXXXXXX | clear | list", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
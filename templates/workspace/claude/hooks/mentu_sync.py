@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.9"
+# dependencies = []
+# ///
+"""
+Mentu Sync Scheduler - At most one `mentu sync` per workspace at a time.
+
+Hooks used to start `mentu sync --push` after every evidence capture and
+`mentu sync` at every session start, so a burst of edits ran dozens of
+syncs at once against the same ledger and network. Hooks now call
+`request()`, which records the request in `.mentu/sync.state.json` and
+starts a detached runner unless one is already running:
+
+- One runner per workspace (flock on `.mentu/sync.lock`) runs the syncs
+  one after another.
+- Requests made while a sync is running collapse into one trailing run.
+  A full sync request absorbs pending push-only requests.
+- Consecutive syncs start at least MENTU_SYNC_INTERVAL seconds apart.
+
+Usage:
+    python3 mentu_sync.py status
+    python3 mentu_sync.py request [--push]
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from mentu_ledger import find_workspace
+
+MIN_INTERVAL = float(os.environ.get("MENTU_SYNC_INTERVAL", "10"))
+SYNC_TIMEOUT = float(os.environ.get("MENTU_SYNC_TIMEOUT", "120"))
+
+
+def state_path(workspace: Path) -> Path:
+    return workspace / ".mentu" / "sync.state.json"
+
+
+def lock_path(workspace: Path) -> Path:
+    return workspace / ".mentu" / "sync.lock"
+
+
+# ─── Requests ────────────────────────────────────────────────────────────────
+
+@contextmanager
+def _state(workspace: Path) -> Iterator[dict]:
+    """Scheduler state under an exclusive lock; saved on exit."""
+    path = state_path(workspace)
+    fd = os.open(path.with_suffix(".json.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            state = json.loads(path.read_text())
+            if not isinstance(state, dict):
+                state = {}
+        except (OSError, ValueError):
+            state = {}
+        yield state
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+    finally:
+        os.close(fd)
+
+
+def request(push: bool = False, workspace: Path | None = None) -> bool:
+    """
+    Ask for a sync (`--push` only if push). Returns False without a workspace.
+
+    Never waits for the sync: the request is merged into the pending one
+    and a runner is started if none is running.
+    """
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        return False
+    with _state(workspace) as state:
+        pending = state.get("pending")
+        # A full sync covers a push; keep the broader of the two
+        state["pending"] = "push" if push and pending in (None, "push") else "full"
+        state["requested_at"] = time.time()
+    if not running(workspace):
+        import subprocess
+
+        try:
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "run", "--workspace", str(workspace)],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError:
+            pass
+    return True
+
+
+# ─── Runner ──────────────────────────────────────────────────────────────────
+
+def _try_lock(workspace: Path) -> int | None:
+    fd = os.open(lock_path(workspace), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def running(workspace: Path) -> bool:
+    fd = _try_lock(workspace)
+    if fd is None:
+        return True
+    os.close(fd)
+    return False
+
+
+def _take(workspace: Path) -> str | None:
+    with _state(workspace) as state:
+        return state.pop("pending", None)
+
+
+def sync(workspace: Path, mode: str) -> int:
+    """Run one `mentu sync`. Returns its exit code (-1 if it could not run)."""
+    import subprocess
+
+    cmd = ["mentu", "sync", "--push"] if mode == "push" else ["mentu", "sync"]
+    try:
+        return subprocess.run(
+            cmd, cwd=workspace, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            timeout=SYNC_TIMEOUT,
+        ).returncode
+    except (OSError, subprocess.TimeoutExpired):
+        return -1
+
+
+def run(workspace: Path) -> None:
+    """Runner loop: sync while requests are pending, then exit."""
+    fd = _try_lock(workspace)
+    if fd is None:
+        return  # Another runner will pick the request up
+    while True:
+        with _state(workspace) as state:
+            pending = state.get("pending")
+            last_start = state.get("last_start", 0.0)
+        if pending is None:
+            # Release, then re-check: a request made while we held the lock
+            # saw a running runner and did not start one
+            os.close(fd)
+            with _state(workspace) as state:
+                pending = state.get("pending")
+            if pending is None:
+                return
+            fd = _try_lock(workspace)
+            if fd is None:
+                return
+            continue
+
+        # Requests made while waiting out the interval join this run
+        time.sleep(max(last_start + MIN_INTERVAL - time.time(), 0.0))
+        mode = _take(workspace)
+        if mode is None:
+            continue
+        started = time.time()
+        with _state(workspace) as state:
+            state["last_start"] = started
+        code = sync(workspace, mode)
+        with _state(workspace) as state:
+            state.update({"last_mode": mode, "last_exit": code,
+                          "last_duration": round(time.time() - started, 2)})
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    command = args[0] if args else "status"
+    workspace = None
+    if "--workspace" in args:
+        workspace = Path(args[args.index("--workspace") + 1]).resolve()
+    workspace = workspace or find_workspace()
+    if workspace is None:
+        print("No .mentu/ found", file=sys.stderr)
+        sys.exit(1)
+
+    if command == "run":
+        run(workspace)
+    elif command == "request":
+        request("--push" in args, workspace)
+    elif command == "status":
+        with _state(workspace) as state:
+            print(json.dumps({**state, "running": running(workspace)}, indent=2))
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,29 +16,29 @@ if [[ -f .env ]]; then
   set +a
 fi
 
+# All sessions of this loop share one session state (see mentu_state.py)
+export MENTU_SESSION_ID="${MENTU_SESSION_ID:-ralph-$$}"
+
 # Background cloud sync — watches ledger.jsonl, pushes on change
 SYNC_PID=""
 cleanup() {
-  # Submit + close active commitment
-  if [[ -f .mentu/active_commitment ]]; then
-    CMT_ID=$(cat .mentu/active_commitment)
-    if [[ -n "$CMT_ID" ]]; then
-      EVIDENCE_ID=$(python3 -c "
-import json
+  # Submit + close this loop's active commitment
+  CMT_ID=$(python3 .claude/hooks/mentu_state.py get 2>/dev/null)
+  if [[ -n "$CMT_ID" ]]; then
+    EVIDENCE_ID=$(tail -n 1 .claude/mentu_evidence.jsonl 2>/dev/null | python3 -c "
+import json, sys
 try:
-    entries = json.load(open('.claude/mentu_evidence.json'))
-    print(entries[-1]['id'] if entries else '')
+    print(json.loads(sys.stdin.read())['id'])
 except: print('')
 " 2>/dev/null)
 
-      mentu submit "$CMT_ID" --summary "Session complete" \
-        ${EVIDENCE_ID:+--evidence "$EVIDENCE_ID"} 2>/dev/null || true
+    mentu submit "$CMT_ID" --summary "Session complete" \
+      ${EVIDENCE_ID:+--evidence "$EVIDENCE_ID"} 2>/dev/null || true
 
-      mentu close "$CMT_ID" \
-        ${EVIDENCE_ID:+--evidence "$EVIDENCE_ID"} 2>/dev/null || true
+    mentu close "$CMT_ID" \
+      ${EVIDENCE_ID:+--evidence "$EVIDENCE_ID"} 2>/dev/null || true
 
-      rm -f .mentu/active_commitment
-    fi
+    python3 .claude/hooks/mentu_state.py clear 2>/dev/null || true
   fi
 
   # Kill sync watcher
@@ -7,6 +7,7 @@ import {
   getLedgerPath,
   readLedger,
   appendOperation,
+  appendOperations,
   idExists,
   sourceKeyExists,
   getMemoryIds,
@@ -237,6 +238,38 @@ describe('Ledger', () => {
     });
   });
 
+  describe('appendOperations', () => {
+    it('should append all operations in order', () => {
+      const op1: Operation = {
+        id: 'mem_001',
+        op: 'capture',
+        ts: '2025-01-01T00:00:00.000Z',
+        actor: 'alice',
+        workspace: 'test',
+        payload: { body: 'Test memory' },
+      };
+      const op2: Operation = {
+        id: 'cmt_001',
+        op: 'commit',
+        ts: '2025-01-01T00:00:00.000Z',
+        actor: 'alice',
+        workspace: 'test',
+        payload: { body: 'Test commitment', source: 'mem_001' },
+      };
+
+      appendOperations(testDir, [op1, op2]);
+
+      const ops = readLedger(testDir);
+      expect(ops).toEqual([op1, op2]);
+    });
+
+    it('should not create the ledger for an empty batch', () => {
+      appendOperations(testDir, []);
+
+      expect(fs.existsSync(getLedgerPath(testDir))).toBe(false);
+    });
+  });
+
   describe('idExists', () => {
     it('should return false for empty ledger', () => {
       expect(idExists([], 'mem_001')).toBe(false);
@@ -0,0 +1,99 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+import os from 'os';
+import {
+  getSessionKey,
+  loadSessionState,
+  saveSessionState,
+  clearSessionState,
+  listSessionStates,
+} from '../../src/core/session-state.js';
+
+describe('Session State', () => {
+  let testDir: string;
+  let savedSessionId: string | undefined;
+
+  beforeEach(() => {
+    testDir = fs.mkdtempSync(path.join(os.tmpdir(), 'mentu-test-'));
+    savedSessionId = process.env.MENTU_SESSION_ID;
+    delete process.env.MENTU_SESSION_ID;
+  });
+
+  afterEach(() => {
+    fs.rmSync(testDir, { recursive: true, force: true });
+    if (savedSessionId === undefined) {
+      delete process.env.MENTU_SESSION_ID;
+    } else {
+      process.env.MENTU_SESSION_ID = savedSessionId;
+    }
+  });
+
+  describe('getSessionKey', () => {
+    it('prefers MENTU_SESSION_ID over the session ID', () => {
+      process.env.MENTU_SESSION_ID = 'ralph-42';
+      expect(getSessionKey('abc')).toBe('ralph-42');
+    });
+
+    it('falls back to default and sanitizes keys', () => {
+      expect(getSessionKey()).toBe('default');
+      expect(getSessionKey('../x y')).toBe('.._x_y');
+    });
+  });
+
+  it('keeps each session\'s active commitment separate', () => {
+    saveSessionState(testDir, { active_commitment: 'cmt_aaaaaaaa' }, 'session-a');
+    saveSessionState(testDir, { active_commitment: 'cmt_bbbbbbbb' }, 'session-b');
+
+    expect(loadSessionState(testDir, 'session-a')?.active_commitment).toBe('cmt_aaaaaaaa');
+    expect(loadSessionState(testDir, 'session-b')?.active_commitment).toBe('cmt_bbbbbbbb');
+
+    clearSessionState(testDir, 'session-a');
+
+    expect(loadSessionState(testDir, 'session-a')).toBeNull();
+    expect(loadSessionState(testDir, 'session-b')?.active_commitment).toBe('cmt_bbbbbbbb');
+  });
+
+  it('falls back to the default session', () => {
+    saveSessionState(testDir, { active_commitment: 'cmt_dddddddd' });
+
+    expect(loadSessionState(testDir, 'session-a')?.active_commitment).toBe('cmt_dddddddd');
+    expect(loadSessionState(testDir, 'session-a', false)).toBeNull();
+  });
+
+  it('leaves the shared default state alone without a matching commitment', () => {
+    saveSessionState(testDir, { active_commitment: 'cmt_dddddddd' });
+
+    clearSessionState(testDir, 'session-a');
+    expect(loadSessionState(testDir)?.active_commitment).toBe('cmt_dddddddd');
+
+    clearSessionState(testDir, 'session-a', 'cmt_oldoldol');
+    expect(loadSessionState(testDir)?.active_commitment).toBe('cmt_dddddddd');
+
+    clearSessionState(testDir, 'session-a', 'cmt_dddddddd');
+    expect(loadSessionState(testDir)).toBeNull();
+  });
+
+  it('only clears the given commitment', () => {
+    saveSessionState(testDir, { active_commitment: 'cmt_newnewnw' }, 'session-a');
+
+    clearSessionState(testDir, 'session-a', 'cmt_oldoldol');
+    expect(loadSessionState(testDir, 'session-a')?.active_commitment).toBe('cmt_newnewnw');
+
+    clearSessionState(testDir, 'session-a', 'cmt_newnewnw');
+    expect(loadSessionState(testDir, 'session-a')).toBeNull();
+  });
+
+  it('migrates the single-file state into the default session', () => {
+    fs.mkdirSync(path.join(testDir, '.claude'), { recursive: true });
+    fs.writeFileSync(
+      path.join(testDir, '.claude', 'mentu_state.json'),
+      JSON.stringify({ active_commitment: 'cmt_11111111', actor: 'agent:test' })
+    );
+
+    expect(listSessionStates(testDir)).toEqual({
+      default: { active_commitment: 'cmt_11111111', actor: 'agent:test' },
+    });
+    expect(fs.existsSync(path.join(testDir, '.claude', 'mentu_state.json'))).toBe(false);
+  });
+});
@@ -0,0 +1,105 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+import { createApp } from '../../src/server/app.js';
+import { hashApiKey } from '../../src/server/types.js';
+import { readLedger } from '../../src/core/ledger.js';
+import { createTestWorkspace } from '../helpers.js';
+
+const API_KEY = 'test-key-0123456789';
+
+function writeServerConfig(workspacePath: string): void {
+  fs.writeFileSync(
+    path.join(workspacePath, '.mentu', 'config.yaml'),
+    [
+      'workspace: test-workspace',
+      'created: 2025-01-01T00:00:00.000Z',
+      'api:',
+      '  keys:',
+      '    - id: key_1',
+      '      name: test',
+      `      key_hash: "${hashApiKey(API_KEY)}"`,
+      '      key_prefix: test-key',
+      '      actor: agent:test',
+      '      permissions: [read, write]',
+      '      created: 2025-01-01T00:00:00.000Z',
+      '',
+    ].join('\n'),
+    'utf-8'
+  );
+  fs.writeFileSync(path.join(workspacePath, '.mentu', 'ledger.jsonl'), '', 'utf-8');
+}
+
+describe('POST /ops/batch', () => {
+  let workspace: { path: string; cleanup: () => void };
+  let app: ReturnType<typeof createApp>;
+
+  beforeEach(() => {
+    workspace = createTestWorkspace();
+    writeServerConfig(workspace.path);
+    app = createApp(workspace.path, false);
+  });
+
+  afterEach(() => {
+    workspace.cleanup();
+  });
+
+  function postBatch(ops: unknown[]) {
+    return app.request('/ops/batch', {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${API_KEY}`, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ops }),
+    });
+  }
+
+  it('should apply dependent ops that reference client-generated IDs', async () => {
+    const res = await postBatch([
+      { id: 'mem_0000000a', op: 'capture', payload: { body: 'Task received: fix login' } },
+      { id: 'cmt_0000000b', op: 'commit', payload: { body: 'Fix login', source: 'mem_0000000a' } },
+      { op: 'claim', payload: { commitment: 'cmt_0000000b' } },
+    ]);
+
+    expect(res.status).toBe(201);
+    const data = (await res.json()) as { ops: Array<{ id: string; op: string }> };
+    expect(data.ops.map((op) => op.op)).toEqual(['capture', 'commit', 'claim']);
+    expect(data.ops[0].id).toBe('mem_0000000a');
+    expect(data.ops[1].id).toBe('cmt_0000000b');
+
+    const ledger = readLedger(workspace.path);
+    expect(ledger.map((op) => op.op)).toEqual(['capture', 'commit', 'claim']);
+    expect(ledger.every((op) => op.actor === 'agent:test')).toBe(true);
+  });
+
+  it('should accept flat op fields like POST /ops', async () => {
+    const res = await postBatch([{ op: 'capture', body: 'Flat capture', kind: 'evidence' }]);
+
+    expect(res.status).toBe(201);
+    expect(readLedger(workspace.path)).toHaveLength(1);
+  });
+
+  it('should write nothing when any op is invalid', async () => {
+    const res = await postBatch([
+      { id: 'mem_0000000a', op: 'capture', payload: { body: 'Task received' } },
+      { op: 'commit', payload: { body: 'Missing source', source: 'mem_ffffffff' } },
+    ]);
+
+    expect(res.status).toBe(404);
+    const data = (await res.json()) as { error: string; index: number };
+    expect(data.error).toBe('E_REF_NOT_FOUND');
+    expect(data.index).toBe(1);
+    expect(readLedger(workspace.path)).toHaveLength(0);
+  });
+
+  it('should reject IDs with the wrong prefix', async () => {
+    const res = await postBatch([{ id: 'cmt_0000000a', op: 'capture', payload: { body: 'x' } }]);
+
+    expect(res.status).toBe(400);
+    expect(readLedger(workspace.path)).toHaveLength(0);
+  });
+
+  it('should reject an empty batch', async () => {
+    const res = await postBatch([]);
+
+    expect(res.status).toBe(400);
+  });
+});
@@ -0,0 +1,51 @@
+import { describe, it, expect } from 'vitest';
+import { spawnSync } from 'child_process';
+import path from 'path';
+
+const BENCH = path.join(__dirname, '..', '..', 'tools', 'hook-bench', 'hook_bench.py');
+
+const hasPython = spawnSync('python3', ['--version'], { stdio: 'ignore' }).status === 0;
+
+interface BenchResult {
+  scenario: string;
+  runs: number;
+  errors: number;
+  error_sample?: string;
+}
+
+/** Run the offline hook benchmark and return its per-scenario results. */
+function bench(...args: string[]): BenchResult[] {
+  const result = spawnSync(
+    'python3',
+    [BENCH, '--runs', '2', '--warmup', '0', '--ledger-ops', '200', '--json', ...args],
+    { encoding: 'utf-8', timeout: 120_000 }
+  );
+  if (result.status !== 0) {
+    throw new Error(`hook_bench.py failed: ${result.stderr}`);
+  }
+  return JSON.parse(result.stdout).results;
+}
+
+function scenarios(): string[] {
+  const result = spawnSync('python3', [BENCH, '--list'], { encoding: 'utf-8' });
+  return result.stdout.split('\n').map((line) => line.split(/\s+/)[0]).filter(Boolean);
+}
+
+describe.skipIf(!hasPython)('hook benchmark', () => {
+  it('runs every scenario offline without errors', () => {
+    const results = bench();
+
+    expect(results.map((r) => r.scenario)).toEqual(scenarios());
+    for (const result of results) {
+      expect(result.errors, `${result.scenario}: ${result.error_sample}`).toBe(0);
+    }
+  });
+
+  it('keeps hooks exiting cleanly when the CLI and proxy fail', () => {
+    const results = bench('--cli-fail-rate', '1', '--api-fail-rate', '1');
+
+    for (const result of results) {
+      expect(result.errors, `${result.scenario}: ${result.error_sample}`).toBe(0);
+    }
+  });
+});
@@ -0,0 +1,82 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { spawnSync } from 'child_process';
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+
+const HOOKS_DIR = path.join(__dirname, '..', '..', 'src', 'templates', 'hooks');
+
+const hasPython = spawnSync('python3', ['--version'], { stdio: 'ignore' }).status === 0;
+
+// A local API that applies batches atomically and answers E_DUPLICATE_ID
+// for any batch holding an already-applied operation. Spools A, marks it
+// applied (an earlier attempt whose response was lost), spools B, flushes.
+const SCENARIO = `
+import json, os, sys, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+applied = []
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        ops = body.get("ops", [])
+        if any(op["id"] in applied for op in ops):
+            status, reply = 409, {"error": "E_DUPLICATE_ID", "message": "duplicate"}
+        else:
+            applied.extend(op["id"] for op in ops)
+            status, reply = 200, {"ops": ops}
+        data = json.dumps(reply).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+os.environ["MENTU_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+os.environ["MENTU_PROXY_TOKEN"] = "test"
+sys.path.insert(0, sys.argv[1])
+import mentu_spool
+
+mentu_spool.ensure_flusher = lambda: None  # Deliver in the foreground
+op_a = {"id": "mem_a", "op": "capture", "payload": {"body": "A"}}
+op_b = {"id": "mem_b", "op": "capture", "payload": {"body": "B"}}
+mentu_spool.submit([op_a], "ws")
+applied.append("mem_a")  # A was applied, but its response was lost
+mentu_spool.submit([op_b], "ws")
+delivered = mentu_spool.flush_once(mentu_spool.load_state())
+print(json.dumps({"delivered": delivered, "applied": applied,
+                  "pending": len(mentu_spool.pending(mentu_spool.load_state()["offset"]))}))
+`;
+
+describe.skipIf(!hasPython)('hook spool', () => {
+  let tmpDir: string;
+
+  beforeAll(() => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'mentu-spool-'));
+    fs.writeFileSync(path.join(tmpDir, 'scenario.py'), SCENARIO);
+  });
+
+  afterAll(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true });
+  });
+
+  it('redelivers the rest of a combined batch after a duplicate ID', () => {
+    const result = spawnSync('python3', ['scenario.py', HOOKS_DIR], {
+      cwd: tmpDir,
+      encoding: 'utf-8',
+      timeout: 30_000,
+    });
+    expect(result.status, result.stderr).toBe(0);
+
+    const outcome = JSON.parse(result.stdout);
+    expect(outcome.delivered).toBe(true);
+    expect(outcome.applied).toEqual(['mem_a', 'mem_b']);
+    expect(outcome.pending).toBe(0);
+  });
+});
@@ -0,0 +1,107 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { spawnSync } from 'child_process';
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { precompileHooks } from '../../src/utils/hooks.js';
+
+const ROOT = path.join(__dirname, '..', '..');
+
+// Hook directories, each with the entry point that runs on every tool call
+const HOT_HOOKS: Array<[string, string]> = [
+  ['src/templates/hooks', 'mentu_post_tool'],
+  ['templates/workspace/claude/hooks', 'mentu_dispatch'],
+  ['mentu-workspace/hooks', 'post_tool_evidence'],
+];
+
+// Cold start budget per hook run: a fresh `python3 -S` importing the entry
+// point. Raise it with MENTU_HOOK_STARTUP_BUDGET_MS on slow CI machines.
+const BUDGET_MS = Number(process.env.MENTU_HOOK_STARTUP_BUDGET_MS || 50);
+const RUNS = 7;
+
+const hasPython = spawnSync('python3', ['--version'], { stdio: 'ignore' }).status === 0;
+
+function python(script: string, cwd?: string): string {
+  const result = spawnSync('python3', ['-c', script], { cwd, encoding: 'utf-8' });
+  if (result.status !== 0) {
+    throw new Error(`python3 failed: ${result.stderr}`);
+  }
+  return result.stdout.trim();
+}
+
+/**
+ * Median wall time, in milliseconds, of a cold interpreter importing a hook
+ * module. Timed from a Python driver, which starts processes with far less
+ * overhead than Node.
+ */
+function coldStart(hooksDir: string, module: string): number {
+  const script = [
+    'import subprocess, sys, time',
+    'timings = []',
+    `for _ in range(${RUNS}):`,
+    '    started = time.perf_counter()',
+    `    subprocess.run([sys.executable, "-S", "-c", "import ${module}"], check=True)`,
+    '    timings.append((time.perf_counter() - started) * 1000)',
+    'print(sorted(timings)[len(timings) // 2])',
+  ].join('\n');
+  return Number(python(script, hooksDir));
+}
+
+/** Copy a hook directory into tmpDir and precompile it there. */
+function install(dir: string, tmpDir: string): string {
+  const hooksDir = path.join(tmpDir, dir.replace(/\//g, '_'));
+  fs.cpSync(path.join(ROOT, dir), hooksDir, { recursive: true });
+  fs.rmSync(path.join(hooksDir, '__pycache__'), { recursive: true, force: true });
+  expect(precompileHooks(hooksDir)).toBe(true);
+  return hooksDir;
+}
+
+function pycTimes(hooksDir: string): Map<string, number> {
+  const cache = path.join(hooksDir, '__pycache__');
+  return new Map(fs.readdirSync(cache).map((name) => [name, fs.statSync(path.join(cache, name)).mtimeMs]));
+}
+
+describe.skipIf(!hasPython)('hook precompile', () => {
+  let tmpDir: string;
+  let cacheTag: string;
+
+  beforeAll(() => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'mentu-hooks-'));
+    cacheTag = python('import sys; print(sys.implementation.cache_tag)');
+  });
+
+  afterAll(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true });
+  });
+
+  for (const [dir, module] of HOT_HOOKS) {
+    it(`writes a current .pyc for every module in ${dir}`, () => {
+      const hooksDir = install(dir, tmpDir);
+      const sources = fs.readdirSync(hooksDir).filter((name) => name.endsWith('.py'));
+
+      expect(sources).toContain(`${module}.py`);
+      for (const source of sources) {
+        const pyc = path.join(hooksDir, '__pycache__', `${path.basename(source, '.py')}.${cacheTag}.pyc`);
+        expect(fs.existsSync(pyc), pyc).toBe(true);
+
+        // Timestamp-based pyc header: magic, flags, source mtime, source size
+        const header = fs.readFileSync(pyc).subarray(0, 16);
+        const stat = fs.statSync(path.join(hooksDir, source));
+        expect(header.readUInt32LE(4), source).toBe(0);
+        expect(header.readUInt32LE(8), source).toBe(Math.floor(stat.mtimeMs / 1000) >>> 0);
+        expect(header.readUInt32LE(12), source).toBe(stat.size >>> 0);
+      }
+    });
+
+    it(`starts ${dir}/${module}.py cold within ${BUDGET_MS}ms from the precompiled modules`, () => {
+      const hooksDir = install(dir, tmpDir);
+      const before = pycTimes(hooksDir);
+
+      const ms = coldStart(hooksDir, module);
+
+      // Python rewrites a stale .pyc and writes a missing one; neither happened
+      expect(pycTimes(hooksDir)).toEqual(before);
+      expect(ms).toBeLessThan(BUDGET_MS);
+    });
+  }
+});
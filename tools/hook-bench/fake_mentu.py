@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Fake mentu CLI - Stand-in for the `mentu` executable the hooks shell out to.
+
+Installed on PATH as `mentu` by hook_bench.py. Answers the commands the
+hooks run with the JSON the real CLI prints, without Node or a ledger:
+
+    capture / commit / claim / annotate / submit / close / release -> {"id": ...}
+    list commitments       -> .mentu/fake_commitments.json (else [])
+    anything else          -> exit 0, no output
+
+Set in the environment:
+    MENTU_FAKE_LATENCY_MS  delay before answering (default 0)
+    MENTU_FAKE_FAIL_RATE   probability of exiting 1 instead (default 0)
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+PREFIXES = {"capture": "mem", "commit": "cmt"}
+OPERATIONS = {"capture", "commit", "claim", "annotate", "submit", "close", "release"}
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    latency = float(os.environ.get("MENTU_FAKE_LATENCY_MS", "0"))
+    if latency:
+        time.sleep(latency / 1000)
+    if random.random() < float(os.environ.get("MENTU_FAKE_FAIL_RATE", "0")):
+        sys.stderr.write("Error: injected failure\n")
+        sys.exit(1)
+
+    command = args[0] if args else ""
+    if command in OPERATIONS:
+        print(json.dumps({"id": f"{PREFIXES.get(command, 'op')}_{os.urandom(4).hex()}",
+                          "op": command}))
+    elif command == "list" and args[1:2] == ["commitments"]:
+        try:
+            commitments = json.loads(Path(".mentu/fake_commitments.json").read_text())
+        except (OSError, ValueError):
+            commitments = []
+        if "--state" in args:
+            state = args[args.index("--state") + 1]
+            commitments = [c for c in commitments if c.get("state") == state]
+        print(json.dumps(commitments))
+
+
+if __name__ == "__main__":
+    main()
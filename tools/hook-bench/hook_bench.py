@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Mentu hook benchmark - Offline latency, throughput and memory of the Python hooks.
+
+Runs each hook the way Claude Code does (a fresh python3 process with the
+hook input on stdin) in a scratch workspace, with no network access:
+
+- `mentu` on PATH is fake_mentu.py, which answers the CLI commands the
+  hooks run with canned JSON.
+- MENTU_API_URL points at mock_proxy.py, a local /ops and /ops/batch
+  server.
+- The workspace ledger is generated with --ledger-ops operations.
+- Hook inputs are replayed from payloads/ (or --payloads DIR: *.json files
+  holding one payload or a list, and *.jsonl files with one per line, such
+  as the output of `tee -a payloads.jsonl` in front of a hook command).
+
+Latency and failures can be injected into both the CLI and the API. For
+each scenario the report gives runs per second, p50/p95/p99 wall-clock
+latency (interpreter startup included) and peak RSS of the hook process;
+--phases adds each hook's own phase timings (see mentu_metrics).
+
+Usage:
+    python3 tools/hook-bench/hook_bench.py [--runs N] [--only PATTERN ...]
+        [--cli-latency MS] [--api-latency MS] [--cli-fail-rate P] [--api-fail-rate P]
+        [--ledger-ops N] [--cold] [--concurrency N] [--phases] [--json] [--max-p95 MS]
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from mock_proxy import MockProxy
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parents[1]
+
+sys.path.insert(0, str(ROOT / "src" / "templates" / "hooks"))
+import mentu_metrics  # noqa: E402  (hook module, for the phase report)
+
+ACTOR = "agent:bench"
+
+# Hook sets, as installed by `mentu init-claude`, `mentu workspace-init`
+# and the mentu-workspace plugin
+HOOK_SETS = {
+    "claude": ROOT / "src" / "templates" / "hooks",
+    "workspace": ROOT / "templates" / "workspace" / "claude" / "hooks",
+    "plugin": ROOT / "mentu-workspace" / "hooks",
+}
+
+# Caches the hooks derive from the ledger and edited files, removed before
+# each run by --cold
+DERIVED_FILES = (".mentu/snapshot.json", ".mentu/context.cache.json", ".mentu/ledger.idx",
+                 ".mentu/ledger.idx.ids", ".claude/mentu_fingerprints.json")
+
+# Size of a file an Edit payload changes, created on first use
+EDITED_FILE_LINES = 2000
+
+
+@dataclass
+class Scenario:
+    name: str
+    hooks: str                      # HOOK_SETS key
+    script: str
+    event: str | None = None        # Replay payloads with this hook_event_name
+    sources: tuple = ()             # SessionStart sources to replay (default: all)
+    stdin: str = ""                 # Fixed stdin when not replaying payloads
+    args: tuple = ()
+    active_commitment: bool = False # Start each run with an active commitment
+
+
+SCENARIOS = [
+    Scenario("claude:session_start", "claude", "mentu_session_start.py", event="SessionStart"),
+    Scenario("claude:post_tool", "claude", "mentu_post_tool.py", event="PostToolUse"),
+    Scenario("claude:session_end", "claude", "mentu_post_tool.py", event="SessionEnd"),
+    Scenario("claude:pre_task", "claude", "mentu_pre_task.py", stdin="Implement retry backoff"),
+    Scenario("claude:post_task", "claude", "mentu_post_task.py",
+             args=("complete", "Retry backoff implemented"), active_commitment=True),
+    Scenario("claude:pr_events", "claude", "mentu_pr_events.py",
+             args=("created", "42", "https://github.com/example/app/pull/42", "Add retry backoff"),
+             active_commitment=True),
+    Scenario("workspace:session_start", "workspace", "mentu_session_start.py",
+             event="SessionStart", sources=("startup", "clear")),
+    Scenario("workspace:session_resume", "workspace", "mentu_session_start.py",
+             event="SessionStart", sources=("resume", "compact")),
+    Scenario("workspace:post_tool", "workspace", "mentu_dispatch.py", event="PostToolUse"),
+    Scenario("workspace:session_end", "workspace", "mentu_dispatch.py", event="SessionEnd"),
+    Scenario("workspace:bridge", "workspace", "mentu_evidence_to_memory.py", event="PostToolUse"),
+    Scenario("plugin:session_start", "plugin", "session_start.py", event="SessionStart"),
+    Scenario("plugin:post_tool", "plugin", "post_tool_evidence.py", event="PostToolUse"),
+]
+
+
+# ─── Inputs ──────────────────────────────────────────────────────────────────
+
+def load_payloads(directory: Path) -> list[dict]:
+    """Hook inputs from *.json (one payload or a list) and *.jsonl files."""
+    payloads = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix == ".jsonl":
+            items = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+        elif path.suffix == ".json":
+            loaded = json.loads(path.read_text())
+            items = loaded if isinstance(loaded, list) else [loaded]
+        else:
+            continue
+        payloads.extend(item for item in items if isinstance(item, dict))
+    return payloads
+
+
+def inputs_for(scenario: Scenario, payloads: list[dict]) -> list[bytes]:
+    """The stdin of each run, cycled through (empty if no payload matches)."""
+    if scenario.event is None:
+        return [scenario.stdin.encode()]
+    return [
+        json.dumps(p).encode() for p in payloads
+        if p.get("hook_event_name") == scenario.event
+        and (not scenario.sources or p.get("source") in scenario.sources)
+    ]
+
+
+def generate_ledger(mentu_dir: Path, count: int) -> list[dict]:
+    """
+    Write a ledger of about count operations; return its commitments as
+    `mentu list commitments --json` would. Every third commitment stays
+    claimed and the rest are submitted and closed; every twentieth is ACTOR's.
+    """
+    base = time.time() - count
+    records = []
+    commitments = []
+
+    def op(kind: str, actor: str, payload: dict, prefix: str = "op") -> dict:
+        ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(base + len(records)))
+        record = {"id": f"{prefix}_{len(records):08x}", "op": kind, "ts": ts,
+                  "actor": actor, "workspace": "bench", "payload": payload}
+        records.append(record)
+        return record
+
+    i = 0
+    while len(records) < count:
+        owner = ACTOR if i % 20 == 0 else "agent:other"
+        mem = op("capture", owner, {"body": f"Bug report {i}: retries exhausted on upload", "kind": "bug"}, "mem")
+        cmt = op("commit", owner, {"body": f"Fix upload retries ({i}) " + "details " * 20,
+                                   "source": mem["id"]}, "cmt")
+        op("claim", owner, {"commitment": cmt["id"]})
+        op("annotate", owner, {"target": cmt["id"], "body": f"Investigating {i}", "kind": "note"})
+        state = "claimed"
+        if i % 3:
+            op("submit", owner, {"commitment": cmt["id"], "summary": "Fixed", "evidence": [mem["id"]]})
+            op("close", owner, {"commitment": cmt["id"], "evidence": mem["id"]})
+            state = "closed"
+        commitments.append({"id": cmt["id"], "body": cmt["payload"]["body"], "state": state,
+                            "owner": owner if state == "claimed" else None, "ts": cmt["ts"]})
+        i += 1
+
+    mentu_dir.mkdir(parents=True, exist_ok=True)
+    with open(mentu_dir / "ledger.jsonl", "w") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    (mentu_dir / "fake_commitments.json").write_text(json.dumps(commitments))
+    return commitments
+
+
+# ─── Workspaces ──────────────────────────────────────────────────────────────
+
+def build_template(root: Path, hooks: str, ledger_ops: int) -> tuple[Path, list[dict]]:
+    """A workspace with the ledger and the hook set installed (and precompiled)."""
+    workspace = root / "templates" / hooks
+    commitments = generate_ledger(workspace / ".mentu", ledger_ops)
+    hooks_dir = workspace / ".claude" / "hooks"
+    shutil.copytree(HOOK_SETS[hooks], hooks_dir,
+                    ignore=shutil.ignore_patterns("__pycache__", "*.json"))
+    for script in hooks_dir.glob("*.py"):
+        script.write_text(script.read_text().replace("{{ACTOR}}", ACTOR))
+    subprocess.run([sys.executable, "-m", "compileall", "-q", str(hooks_dir)], check=False)
+    return workspace, commitments
+
+
+def install_fake_mentu(root: Path) -> Path:
+    bin_dir = root / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    fake = bin_dir / "mentu"
+    fake.write_text(f"#!{sys.executable}\n" + (HERE / "fake_mentu.py").read_text())
+    fake.chmod(0o755)
+    return bin_dir
+
+
+def apply_edit(workspace: Path, stdin: bytes) -> None:
+    """Make the edit a PostToolUse input reports, so hooks see the file change."""
+    try:
+        payload = json.loads(stdin)
+    except ValueError:
+        return
+    if not isinstance(payload, dict) or payload.get("hook_event_name") != "PostToolUse":
+        return
+    tool_input = payload.get("tool_input") or {}
+    file_path = tool_input.get("file_path")
+    if not file_path:
+        return
+    path = workspace / file_path  # Absolute paths stay as they are
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if "content" in tool_input:
+        path.write_text(tool_input["content"])
+        return
+    if not path.exists():
+        path.write_text("".join(f"// line {n}\n" for n in range(EDITED_FILE_LINES)))
+    with open(path, "a") as f:
+        f.write(str(tool_input.get("new_string", "")) + "\n")
+
+
+def reset(workspace: Path, scenario: Scenario, active: str, cold: bool, stdin: bytes) -> None:
+    """Per-run setup (not timed)."""
+    apply_edit(workspace, stdin)
+    if cold:
+        for name in DERIVED_FILES:
+            (workspace / name).unlink(missing_ok=True)
+    if scenario.active_commitment and active:
+        state_dir = workspace / ".claude" / "mentu_state"
+        state_dir.mkdir(parents=True, exist_ok=True)
+        (state_dir / "default.json").write_text(json.dumps(
+            {"active_commitment": active, "actor": ACTOR, "session_id": "default"}))
+
+
+def stop_background(root: Path, workspaces: list[Path]) -> None:
+    """Stop what the hooks started detached: hook daemon, flushers, sync runner."""
+    for workspace in workspaces:
+        hookd = workspace / ".claude" / "hooks" / "mentu_hookd.py"
+        if hookd.exists():
+            subprocess.run([sys.executable, str(hookd), "stop"], cwd=workspace,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return
+    for entry in proc.iterdir():
+        if not entry.name.isdigit() or int(entry.name) == os.getpid():
+            continue
+        try:
+            if os.readlink(entry / "cwd").startswith(str(root)):
+                os.kill(int(entry.name), signal.SIGTERM)
+        except OSError:
+            pass
+
+
+# ─── Running ─────────────────────────────────────────────────────────────────
+
+def run_once(command: list, cwd: Path, env: dict, stdin: bytes, timeout: float) -> dict:
+    """One hook run: wall-clock ms, exit code, peak RSS in bytes, stderr."""
+    with tempfile.TemporaryFile() as err:
+        started = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.PIPE,
+                                stdout=subprocess.DEVNULL, stderr=err)
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            try:
+                proc.stdin.write(stdin)
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            _, status, usage = os.wait4(proc.pid, 0)
+        finally:
+            timer.cancel()
+        ms = (time.perf_counter() - started) * 1000
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        stderr = err.read().decode(errors="replace")
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return {"ms": ms, "code": proc.returncode, "rss": rss, "stderr": stderr}
+
+
+def bench(scenario: Scenario, workspace: Path, env: dict, inputs: list[bytes], active: str,
+          args: argparse.Namespace) -> dict:
+    command = [sys.executable, str(workspace / ".claude" / "hooks" / scenario.script), *scenario.args]
+
+    def one(n: int) -> dict:
+        stdin = inputs[n % len(inputs)]
+        reset(workspace, scenario, active, args.cold, stdin)
+        return run_once(command, workspace, env, stdin, args.timeout)
+
+    for n in range(args.warmup):
+        one(n)
+    (workspace / ".claude" / "mentu_metrics.jsonl").unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        runs = list(pool.map(one, range(args.runs)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [run["ms"] for run in runs]
+    failed = [run for run in runs if run["code"] != 0]
+    result = {
+        "scenario": scenario.name,
+        "runs": len(runs),
+        "errors": len(failed),
+        "throughput": round(len(runs) / elapsed, 2) if elapsed else 0.0,
+        **{f"p{pct}": round(mentu_metrics.percentile(latencies, pct), 2)
+           for pct in mentu_metrics.PERCENTILES},
+        "max": round(max(latencies), 2),
+        "peak_rss_mb": round(max(run["rss"] for run in runs) / (1024 * 1024), 1),
+        "phases": phase_rows(workspace),
+    }
+    if failed:
+        result["error_sample"] = failed[0]["stderr"].strip()[-500:]
+    return result
+
+
+def phase_rows(workspace: Path) -> list[dict]:
+    """The hooks' own phase timings for this scenario (from mentu_metrics)."""
+    runs = []
+    try:
+        lines = (workspace / ".claude" / "mentu_metrics.jsonl").read_text().splitlines()
+    except OSError:
+        return []
+    for line in lines:
+        try:
+            runs.append(json.loads(line))
+        except ValueError:
+            continue
+    return [row for row in mentu_metrics.summarize(runs) if row["phase"] != "total"]
+
+
+def format_results(results: list[dict], phases: bool) -> str:
+    lines = [f"{'SCENARIO':<26} {'RUNS':>5} {'ERR':>4} {'RUNS/S':>8} "
+             f"{'P50 ms':>8} {'P95 ms':>8} {'P99 ms':>8} {'MAX ms':>8} {'RSS MB':>7}"]
+    for r in results:
+        lines.append(f"{r['scenario']:<26} {r['runs']:>5} {r['errors']:>4} {r['throughput']:>8.1f} "
+                     f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f} "
+                     f"{r['peak_rss_mb']:>7.1f}")
+        if phases:
+            for row in r["phases"]:
+                lines.append(f"  {row['hook'] + ':' + row['phase']:<24} {row['count']:>5} {'':>4} {'':>8} "
+                             f"{row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: list | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the Mentu Python hooks.")
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs first")
+    parser.add_argument("--concurrency", type=int, default=1, help="hook processes at once")
+    parser.add_argument("--only", action="append", default=[], metavar="PATTERN",
+                        help="scenarios to run (glob, e.g. 'workspace:*'); repeatable")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    parser.add_argument("--payloads", type=Path, default=HERE / "payloads",
+                        help="directory of recorded hook inputs")
+    parser.add_argument("--ledger-ops", type=int, default=2000, help="operations in the ledger")
+    parser.add_argument("--cold", action="store_true",
+                        help="remove derived caches (ledger index and snapshot, "
+                             "context, file fingerprints) before every run")
+    parser.add_argument("--cli-latency", type=float, default=0.0, help="ms per fake mentu call")
+    parser.add_argument("--cli-fail-rate", type=float, default=0.0, help="fake mentu failure probability")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="ms per mock proxy request")
+    parser.add_argument("--api-fail-rate", type=float, default=0.0, help="mock proxy 503 probability")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra hook environment (e.g. MENTU_COALESCE=0); repeatable")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a run is killed")
+    parser.add_argument("--phases", action="store_true", help="show each hook's phase timings")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--max-p95", type=float, default=None, metavar="MS",
+                        help="exit 1 if any scenario's p95 exceeds MS")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    return parser.parse_args(argv)
+
+
+def main(argv: list | None = None) -> int:
+    args = parse_args(argv)
+    scenarios = [s for s in SCENARIOS
+                 if not args.only or any(fnmatch.fnmatch(s.name, p) for p in args.only)]
+    if args.list:
+        for scenario in SCENARIOS:
+            print(f"{scenario.name:<26} {HOOK_SETS[scenario.hooks].relative_to(ROOT)}/{scenario.script}")
+        return 0
+    payloads = load_payloads(args.payloads)
+
+    root = Path(tempfile.mkdtemp(prefix="mentu-hook-bench-")).resolve()
+    workspaces = []
+    results = []
+    try:
+        bin_dir = install_fake_mentu(root)
+        templates = {hooks: build_template(root, hooks, args.ledger_ops)
+                     for hooks in sorted({s.hooks for s in scenarios})}
+
+        with MockProxy(args.api_latency, args.api_fail_rate) as proxy:
+            env = {k: v for k, v in os.environ.items()
+                   if not k.startswith("MENTU_") and k != "CLAUDE_ENV_FILE"}
+            env.update({
+                "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+                "MENTU_ACTOR": ACTOR,
+                "MENTU_API_URL": proxy.url,
+                "MENTU_PROXY_TOKEN": "bench-token",
+                "MENTU_WORKSPACE_ID": "bench",
+                "MENTU_HOOKD_IDLE": "5",
+                "MENTU_FAKE_LATENCY_MS": str(args.cli_latency),
+                "MENTU_FAKE_FAIL_RATE": str(args.cli_fail_rate),
+            })
+            env.update(item.split("=", 1) for item in args.env if "=" in item)
+
+            for scenario in scenarios:
+                inputs = inputs_for(scenario, payloads)
+                if not inputs:
+                    sys.stderr.write(f"[bench] {scenario.name}: no {scenario.event} payloads, skipped\n")
+                    continue
+                template, commitments = templates[scenario.hooks]
+                workspace = root / "runs" / scenario.name.replace(":", "-")
+                shutil.copytree(template, workspace)
+                workspaces.append(workspace)
+                active = next((c["id"] for c in commitments
+                               if c["state"] == "claimed" and c["owner"] == ACTOR), "")
+
+                requests = proxy.requests
+                result = bench(scenario, workspace, env, inputs, active, args)
+                result["api_requests"] = proxy.requests - requests
+                results.append(result)
+                if not args.json:
+                    sys.stderr.write(f"[bench] {scenario.name}: p50 {result['p50']:.1f} ms\n")
+
+            stop_background(root, workspaces)
+    finally:
+        if args.keep:
+            sys.stderr.write(f"[bench] Scratch directory kept: {root}\n")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    config = {key: value for key, value in vars(args).items() if key not in ("json", "list", "keep")}
+    config["payloads"] = str(config["payloads"])
+    if args.json:
+        print(json.dumps({"python": sys.version.split()[0], "config": config, "results": results}, indent=2))
+    else:
+        print(format_results(results, args.phases))
+
+    if args.max_p95 is not None:
+        slow = [r["scenario"] for r in results if r["p95"] > args.max_p95]
+        if slow:
+            sys.stderr.write(f"[bench] p95 over {args.max_p95:g} ms: {', '.join(slow)}\n")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Mock Mentu proxy - Local stand-in for MENTU_API_URL.
+
+Serves the two endpoints the hooks call, on 127.0.0.1 only:
+
+    POST /ops        one operation  -> the operation, with an ID
+    POST /ops/batch  {"ops": [...]} -> {"ops": [...]}
+
+Every request waits `latency_ms` first and fails with a 503 with
+probability `fail_rate`, so hooks can be measured against a slow or
+flaky proxy without network access.
+
+Usage:
+    python3 mock_proxy.py [--port 8787] [--latency MS] [--fail-rate P]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockProxy:
+    """Mock proxy on a background thread; use as a context manager."""
+
+    def __init__(self, latency_ms: float = 0.0, fail_rate: float = 0.0, port: int = 0):
+        self.latency_ms = latency_ms
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> MockProxy:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real proxy
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    body = {}
+                if proxy.latency_ms:
+                    time.sleep(proxy.latency_ms / 1000)
+                with proxy._lock:
+                    proxy.requests += 1
+                    failed = random.random() < proxy.fail_rate
+                    proxy.failures += failed
+
+                if failed:
+                    self._reply(503, {"error": "unavailable", "message": "injected failure"})
+                elif self.path.endswith("/ops/batch"):
+                    self._reply(200, {"ops": [_created(op) for op in body.get("ops") or []]})
+                elif self.path.endswith("/ops"):
+                    self._reply(200, _created(body))
+                else:
+                    self._reply(404, {"error": "not_found"})
+
+            def _reply(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+def _created(op: dict) -> dict:
+    """The operation as the API returns it once appended."""
+    op = {key: value for key, value in op.items() if key != "workspace_id"}
+    prefix = {"capture": "mem", "commit": "cmt"}.get(op.get("op"), "op")
+    op.setdefault("id", f"{prefix}_{os.urandom(4).hex()}")
+    op.setdefault("ts", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+    return op
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="probability of a 503")
+    args = parser.parse_args()
+
+    with MockProxy(args.latency, args.fail_rate, args.port) as proxy:
+        print(f"Mock Mentu proxy on {proxy.url} (Ctrl-C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()